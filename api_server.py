@@ -0,0 +1,225 @@
+"""Local JSON estimation API for ERP and CAM systems.
+
+    python api_server.py --port 8502 --workers 2
+
+Endpoints (JSON in and out):
+
+* ``POST /estimate``: one job, in the ``estimate_cli.py`` JSONL format, returns
+  one record: ``job_id``, ``job_material`` and the ``JobEstimate`` fields
+  (per-operation ``machining1_times``/``machining2_times``/``extra_times``
+  and the totals).
+* ``POST /estimate/batch``: ``{"jobs": [...]}``, returns ``{"results": [...]}``
+  in the same order. A job that cannot be estimated gets a record with its
+  ``job_id`` and an ``error`` instead of totals.
+* ``GET /health``
+
+Machining entries take the card defaults for inputs they leave out
+(``estimate_cli.complete_job``), so the API and the CLI accept the same jobs.
+
+The server runs on asyncio streams and keeps HTTP/1.1 connections alive.
+A single job takes well under a millisecond with ``batch_estimator.py``, so
+single jobs and batches of up to ``INLINE_JOBS`` are estimated on the event
+loop. Larger batches are split into chunks and run on a process pool with
+``estimate_cli.estimate_chunk``, so the loop keeps answering other clients
+meanwhile. ``--workers 0`` estimates everything inline on one core.
+``benchmarks/bench_api.py`` load-tests the server against ``TARGET_RPS``.
+
+This module does not import Streamlit.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import NamedTuple
+
+from estimate_cli import estimate_chunk
+
+DEFAULT_PORT = 8502
+INLINE_JOBS = 32
+CHUNK_JOBS = 256
+MAX_BODY = 32 * 1024 * 1024
+MAX_BATCH = 100_000
+# POST /estimate requests per second one core should sustain for a job of TARGET_OPS operations
+# (measured by benchmarks/bench_api.py).
+TARGET_OPS = 10
+TARGET_RPS = 1000
+
+
+class HttpError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    keep_alive: bool
+    body: bytes
+
+
+def with_job_id(job, n=None):
+    """``job`` with a ``job_id``: its own, else ``n``."""
+    return {"job_id": n, **job} if isinstance(job, dict) else job
+
+
+async def read_request(reader):
+    """The next request on the connection, or None once the client has closed it."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "malformed request line") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HttpError(400, "bad Content-Length")
+    if length > MAX_BODY:
+        raise HttpError(413)
+    body = await reader.readexactly(length) if length else b""
+    return Request(method.upper(), target.split("?", 1)[0], keep_alive, body)
+
+
+def response(status, payload, keep_alive):
+    body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+class EstimationServer:
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, workers=os.cpu_count() or 1,
+                 inline_jobs=INLINE_JOBS, chunk_jobs=CHUNK_JOBS):
+        self.host, self.port = host, port
+        self.inline_jobs = inline_jobs
+        self.chunk_jobs = chunk_jobs
+        # Forked workers would inherit the open client sockets and hold them open after the server closes them.
+        context = multiprocessing.get_context("spawn")
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=context) if workers > 0 else None
+        self.server = None
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("POST", "/estimate"): self.estimate,
+            ("POST", "/estimate/batch"): self.estimate_batch,
+        }
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"Estimation API on http://{self.host}:{self.port}", flush=True)
+        async with self.server:
+            await self.server.serve_forever()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    status, payload = 200, await self.dispatch(request)
+                    keep_alive = request.keep_alive
+                except HttpError as e:
+                    status, payload, keep_alive = e.status, {"error": str(e)}, False
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    status, payload, keep_alive = 500, {"error": f"{type(e).__name__}: {e}"}, False
+                writer.write(response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def dispatch(self, request):
+        handler = self.routes.get((request.method, request.path))
+        if handler is None:
+            known = any(path == request.path for _, path in self.routes)
+            raise HttpError(405 if known else 404)
+        if request.method != "POST":
+            return await handler()
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            raise HttpError(400, "body is not valid JSON") from None
+        try:
+            return await handler(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            raise HttpError(400, f"cannot estimate: {e}") from None
+
+    async def health(self):
+        return {"status": "ok", "workers": self.pool._max_workers if self.pool else 0}
+
+    async def estimate(self, job):
+        record = estimate_chunk([with_job_id(job)])[0]
+        if "error" in record:
+            raise HttpError(400, f"cannot estimate: {record['error']}")
+        return record
+
+    async def estimate_batch(self, payload):
+        jobs = payload.get("jobs") if isinstance(payload, dict) else None
+        if not isinstance(jobs, list):
+            raise HttpError(400, 'expected {"jobs": [...]}')
+        if len(jobs) > MAX_BATCH:
+            raise HttpError(413, f"at most {MAX_BATCH} jobs per batch")
+        jobs = [with_job_id(job, n) for n, job in enumerate(jobs, start=1)]
+        if self.pool is None or len(jobs) <= self.inline_jobs:
+            return {"results": estimate_chunk(jobs)}
+        loop = asyncio.get_running_loop()
+        chunks = [jobs[i:i + self.chunk_jobs] for i in range(0, len(jobs), self.chunk_jobs)]
+        done = await asyncio.gather(*(loop.run_in_executor(self.pool, estimate_chunk, chunk) for chunk in chunks))
+        return {"results": [record for records in done for record in records]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve machining estimates as JSON over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="processes for large batches; 0 estimates everything on the event loop")
+    args = parser.parse_args(argv)
+
+    server = EstimationServer(args.host, args.port, args.workers)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
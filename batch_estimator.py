@@ -0,0 +1,364 @@
+"""Vectorized estimates for whole route sheets and job portfolios.
+
+Operations are grouped by process type into columnar NumPy arrays and every
+process type is evaluated in a single pass. The formulas are the ones in
+``estimator.py`` written over arrays; rows whose divisors are zero are masked
+to a time of 0, which is what the scalar code returns on ``ZeroDivisionError``.
+
+A job is a mapping named like the Machining page's session state::
+
+    {"job_material": "Steel", "material_cost": 1000.0, "labor_cost_per_hour": 500.0,
+     "machining1_entries": [...], "machining2_entries": [...], "extra_entries": [...]}
+"""
+
+import math
+from collections import defaultdict
+from dataclasses import dataclass, fields
+from functools import cached_property
+from operator import itemgetter
+
+import numpy as np
+
+from estimator import (
+    DRILL_POINT_ANGLE, EXTRA_PROCESS_OVERHEAD_MIN, MACHINES, PROCESSES, ExtraProcess, JobEstimate,
+)
+
+# Row groups: one per machine in MACHINES order, then the extra processes.
+EXTRA_GROUP = len(MACHINES)
+
+_DEG_TO_RAD = math.pi / 180
+_DRILL_TAN = math.tan(math.radians((180 - DRILL_POINT_ANGLE) / 2))
+
+
+def _tan_half_supplement(angle):
+    # math.tan per distinct angle keeps results bit-identical to the scalar code;
+    # routes only ever use a handful of tool angles.
+    unique, inverse = np.unique(angle, return_inverse=True)
+    tans = np.array([math.tan(math.radians((180 - a) / 2)) for a in unique.tolist()])
+    return tans[inverse].reshape(np.shape(angle))
+
+
+def _py_square(x):
+    # Python's ``x ** 2`` goes through libm pow(), which can differ from x*x in
+    # the last bit, so square the (few) taper columns the same way.
+    x = np.asarray(x)
+    return np.fromiter((v ** 2 for v in x.ravel().tolist()), dtype=float, count=x.size).reshape(x.shape)
+
+
+def _setup(c):
+    return c["job_set_time"] + c["tool_set_time"]
+
+
+# Each kernel returns the time array and the divisors that would raise
+# ZeroDivisionError in the scalar formula.
+
+def _boring(c):
+    extra_length = (c["initial_diameter"] / 2) * _tan_half_supplement(c["angle"])
+    doc2 = c["depth_of_cut"] * 2
+    rf = c["rpm"] * c["feed"]
+    fr = c["feed"] * c["rpm"]
+    turn = (c["final_diameter"] - c["initial_diameter"]) / doc2
+    time = (((c["approach"] + c["overrun"] + c["depth"]) / rf * (turn * 2)) + (((10 + extra_length) / fr) * (turn * 2))) + _setup(c)
+    return time, (doc2, rf, fr)
+
+
+def _drilling(c):
+    drill_length = ((c["diameter"] / 2) * _DRILL_TAN) + c["depth"]
+    rf = c["rpm"] * c["feed"]
+    time = ((c["approach"] + c["overrun"] + drill_length) / rf * c["turn"]) + _setup(c)
+    return time, (rf,)
+
+
+def _facing(c):
+    fr = c["feed"] * c["rpm"]
+    turn = c["length"] / c["depth_of_cut"]
+    time = (((c["approach"] + c["overrun"] + (c["diameter"] / 2)) / fr) * turn) + _setup(c)
+    return time, (c["depth_of_cut"], fr)
+
+
+def _grooving(c):
+    fr = c["feed"] * c["rpm"]
+    turn = c["length"] / c["tool_width"]
+    time = (((c["approach"] + c["overrun"] + ((c["final_diameter"] - c["initial_diameter"]) / 2)) / fr) * turn) + _setup(c)
+    return time, (c["tool_width"], fr)
+
+
+def _knurling(c):
+    fr = c["feed"] * c["rpm"]
+    time = (((c["approach"] + c["overrun"] + c["length"]) / fr) * 2) + _setup(c)
+    return time, (fr,)
+
+
+def _reaming(c):
+    fr = c["feed"] * c["rpm"]
+    doc2 = 2 * c["depth_of_cut"]
+    turn = (c["final_diameter"] - c["initial_diameter"]) / doc2
+    time = (((c["approach"] + c["overrun"] + c["length"]) / fr) * turn) + _setup(c)
+    return time, (doc2, fr)
+
+
+def _threading(c):
+    rf = c["rpm"] * c["feed"]
+    turn = (0.6134 * c["pitch"]) / c["depth_of_cut"]
+    time = ((c["approach"] + c["overrun"] + c["length"]) / rf * turn) + _setup(c)
+    return time, (c["depth_of_cut"], rf)
+
+
+def _curved_turning(c):
+    fr = c["feed"] * c["rpm"]
+    doc4 = c["depth_of_cut"] * 4
+    arc_length = c["length"] * (c["angle"] * _DEG_TO_RAD)
+    turn = c["diameter"] / doc4
+    time = (((c["approach"] + c["overrun"] + arc_length) / fr) * turn) + _setup(c)
+    return time, (doc4, fr)
+
+
+def _turning_straight(c):
+    fr = c["feed"] * c["rpm"]
+    doc2 = c["depth_of_cut"] * 2
+    turn = (c["initial_diameter"] - c["final_diameter"]) / doc2
+    time = (((c["approach"] + c["overrun"] + c["length"]) / fr) * turn) + _setup(c)
+    return time, (doc2, fr)
+
+
+def _turning_taper(c):
+    fr = c["feed"] * c["rpm"]
+    doc2 = c["depth_of_cut"] * 2
+    h_length = np.sqrt(_py_square(c["length"]) + _py_square((c["larger_diameter"] - c["smaller_diameter"]) / 2))
+    turn = (c["larger_diameter"] - c["smaller_diameter"]) / doc2
+    time = (((c["approach"] + c["overrun"] + h_length) / fr) * turn) + _setup(c)
+    return time, (doc2, fr)
+
+
+def _table_feed(c):
+    return c["rpm"] * c["feed"] * c["teeth"]
+
+
+def _blanking(c):
+    tf = _table_feed(c)
+    turn = c["thickness"] / c["depth_of_cut"]
+    time = (c["approach"] + c["overrun"] + c["length"]) / tf * (turn * c["repeat"]) + _setup(c)
+    return time, (c["depth_of_cut"], tf)
+
+
+def _face_milling(c):
+    # Plain face milling and pocket cutting share the same formula.
+    tf = _table_feed(c)
+    turn1 = (c["initial_thickness"] - c["final_thickness"]) / c["depth_of_cut"]
+    turn2 = c["width"] / c["cut_dia"]
+    time = (c["approach"] + c["overrun"] + c["length"]) / tf * (turn1 * turn2 * c["repeat"]) + _setup(c)
+    return time, (c["depth_of_cut"], c["cut_dia"], tf)
+
+
+def _face_milling_outer_contour(c):
+    tf = _table_feed(c)
+    turn1 = (c["initial_length"] - c["final_length"]) / c["cut_dia"]
+    turn2 = (c["initial_width"] - c["final_width"]) / c["cut_dia"]
+    turn3 = (c["initial_thickness"] - c["final_thickness"]) / c["depth_of_cut"]
+    ao = c["approach"] + c["overrun"]
+    t1 = (ao + c["initial_length"]) / tf * (turn2 * turn3)
+    t2 = (ao + ((c["initial_width"] + c["final_width"]) / 2)) / tf * (turn1 * turn3)
+    t3 = (ao + ((c["initial_length"] + c["final_length"]) / 2)) / tf * (turn2 * turn3)
+    t4 = (ao + c["final_width"]) / tf * (turn1 * turn3)
+    time = ((t1 + t2 + t3 + t4) * c["repeat"]) + _setup(c)
+    return time, (c["cut_dia"], c["depth_of_cut"], tf)
+
+
+def _side_milling(c):
+    tf = _table_feed(c)
+    turn1 = c["thickness"] / c["depth_of_cut"]
+    turn2 = (c["initial_length"] - c["final_length"]) / c["cut_dia"]
+    time = (c["approach"] + c["overrun"] + c["width"]) / tf * (turn1 * turn2 * c["repeat"]) + _setup(c)
+    return time, (c["depth_of_cut"], c["cut_dia"], tf)
+
+
+KERNELS = {
+    "Boring": _boring,
+    "Drilling - Center": _drilling,
+    "Drilling - Pilot": _drilling,
+    "Drilling - Main": _drilling,
+    "Facing": _facing,
+    "Grooving": _grooving,
+    "Knurling": _knurling,
+    "Reaming": _reaming,
+    "Threading": _threading,
+    "Turning - Concave": _curved_turning,
+    "Turning - Convex": _curved_turning,
+    "Turning - Straight": _turning_straight,
+    "Turning - Taper": _turning_taper,
+    "Blanking": _blanking,
+    "Face Milling - Plain": _face_milling,
+    "Face Milling - Outer Contour": _face_milling_outer_contour,
+    "Side Milling": _side_milling,
+    "Pocket Cutting": _face_milling,
+}
+
+_COLUMNS = {
+    ptype: [f.name for f in fields(cls) if f.name != "tool_cost"]
+    for ptype, cls in PROCESSES.items()
+}
+
+
+def process_columns(ptype, entries):
+    """Columnar float arrays, keyed by field name, for entries of a single process type."""
+    names = _COLUMNS[ptype]
+    getter = itemgetter(*[name.replace("_", " ") for name in names])
+    table = np.array([getter(entry) for entry in entries], dtype=float).reshape(len(entries), len(names))
+    return {name: table[:, j] for j, name in enumerate(names)}
+
+
+def process_times(ptype, columns):
+    """Evaluate one process type over its columns; zero divisors give a time of 0."""
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        time, divisors = KERNELS[ptype](columns)
+    zero = np.zeros(time.shape, dtype=bool)
+    for divisor in divisors:
+        zero |= divisor == 0
+    return np.where(zero, 0.0, time)
+
+
+def operation_times(entries):
+    """Times in minutes for a mixed list of lathe/milling entries, in input order."""
+    times = np.zeros(len(entries))
+    groups = defaultdict(list)
+    for i, entry in enumerate(entries):
+        groups[entry["type"]].append(i)
+    for ptype, idx in groups.items():
+        if ptype not in PROCESSES:
+            raise ValueError(f"Unknown process type: {ptype!r}")
+        rows = [entries[i] for i in idx]
+        if ptype in KERNELS:
+            times[idx] = process_times(ptype, process_columns(ptype, rows))
+        else:
+            # Registered processes without a vectorized kernel fall back to the scalar formula.
+            cls = PROCESSES[ptype]
+            times[idx] = [cls.from_entry(entry).estimate(0.0).time for entry in rows]
+    return times
+
+
+@dataclass
+class BatchResult:
+    """Per-operation rows and per-job totals for a batch of jobs.
+
+    Operation rows are ordered job by job, and within a job lathe, milling
+    then extra processes, exactly like the Result page.
+    """
+
+    job: np.ndarray
+    group: np.ndarray
+    index: np.ndarray
+    label: list
+    time: np.ndarray
+    cost: np.ndarray
+    total_time_min: np.ndarray
+    total_extra_cost: np.ndarray
+    material_cost: np.ndarray
+    tool_cost: np.ndarray
+    labor_cost: np.ndarray
+    total_cost: np.ndarray
+
+    def __len__(self):
+        return len(self.total_cost)
+
+    @cached_property
+    def offsets(self):
+        """Job ``k``'s rows are ``offsets[k]:offsets[k + 1]``; rows are grouped by job."""
+        return np.searchsorted(self.job, np.arange(len(self) + 1)).tolist()
+
+    def job_estimate(self, k):
+        """The ``JobEstimate`` for job ``k``, identical to ``estimator.estimate_job``."""
+        rows = range(self.offsets[k], self.offsets[k + 1])
+        result = JobEstimate(
+            total_time_min=float(self.total_time_min[k]),
+            total_extra_cost=float(self.total_extra_cost[k]),
+            material_cost=float(self.material_cost[k]),
+            tool_cost=float(self.tool_cost[k]),
+            labor_cost=float(self.labor_cost[k]),
+            total_cost=float(self.total_cost[k]),
+        )
+        for r in rows:
+            group = self.group[r]
+            row = {"index": int(self.index[r]), "time": float(self.time[r]), "cost": float(self.cost[r])}
+            if group == EXTRA_GROUP:
+                result.extra_times.append({"ptype": self.label[r], **row})
+            else:
+                getattr(result, MACHINES[group].times_key).append({"process": self.label[r], **row})
+        return result
+
+    def job_estimates(self):
+        return [self.job_estimate(k) for k in range(len(self))]
+
+
+def estimate_jobs(jobs):
+    """Estimate many jobs in one vectorized pass per process type."""
+    jobs = list(jobs)
+    n_jobs = len(jobs)
+    material_cost = np.zeros(n_jobs)
+    labor_rate = np.zeros(n_jobs)
+
+    machining, machining_rows = [], []
+    extra_time_min, extra_tool_cost, extra_rows = [], [], []
+    job_ids, groups, indexes, labels, tool_costs = [], [], [], [], []
+
+    for k, job in enumerate(jobs):
+        material_cost[k] = job.get("material_cost", 0.0)
+        labor_rate[k] = job.get("labor_cost_per_hour", 0.0)
+        for group, machine in enumerate(MACHINES):
+            for i, entry in enumerate(job.get(machine.entries_key, ())):
+                machining_rows.append(len(job_ids))
+                machining.append(entry)
+                job_ids.append(k)
+                groups.append(group)
+                indexes.append(i + 1)
+                labels.append(entry["type"])
+                tool_costs.append(entry.get("tool cost", 0))
+        for i, entry in enumerate(job.get("extra_entries", ())):
+            extra = ExtraProcess.from_entry(entry)
+            extra_rows.append(len(job_ids))
+            extra_time_min.append(extra.time_min)
+            extra_tool_cost.append(extra.extra_tool_cost)
+            job_ids.append(k)
+            groups.append(EXTRA_GROUP)
+            indexes.append(i + 1)
+            labels.append(extra.label(i + 1))
+            tool_costs.append(0)
+
+    job_ids = np.array(job_ids, dtype=np.intp)
+    groups = np.array(groups, dtype=np.int8)
+    is_extra = groups == EXTRA_GROUP
+    time = np.zeros(len(job_ids))
+    cost = np.zeros(len(job_ids))
+
+    machining_rows = np.array(machining_rows, dtype=np.intp)
+    time[machining_rows] = operation_times(machining)
+    cost[machining_rows] = time[machining_rows] * (labor_rate[job_ids[machining_rows]] / 60)
+
+    extra_rows = np.array(extra_rows, dtype=np.intp)
+    time[extra_rows] = np.array(extra_time_min, dtype=float) + EXTRA_PROCESS_OVERHEAD_MIN
+    cost[extra_rows] = np.array(extra_tool_cost, dtype=float)
+
+    # bincount adds in row order, so the sums match the scalar running totals.
+    total_time_min = np.bincount(job_ids, weights=time, minlength=n_jobs)
+    total_extra_cost = np.bincount(job_ids, weights=np.where(is_extra, cost, 0.0), minlength=n_jobs)
+    tool_cost = np.bincount(job_ids, weights=np.array(tool_costs, dtype=float), minlength=n_jobs)
+    labor_cost = (total_time_min / 60) * labor_rate
+    total_cost = material_cost + labor_cost + total_extra_cost + tool_cost
+
+    return BatchResult(
+        job=job_ids, group=groups, index=np.array(indexes, dtype=np.intp), label=labels,
+        time=time, cost=cost,
+        total_time_min=total_time_min, total_extra_cost=total_extra_cost, material_cost=material_cost,
+        tool_cost=tool_cost, labor_cost=labor_cost, total_cost=total_cost,
+    )
+
+
+def estimate_route(lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour):
+    """Vectorized drop-in for ``estimator.estimate_job``."""
+    job = {
+        "material_cost": material_cost,
+        "labor_cost_per_hour": labor_cost_per_hour,
+        "machining1_entries": lathe_entries,
+        "machining2_entries": milling_entries,
+        "extra_entries": extra_entries,
+    }
+    return estimate_jobs([job]).job_estimate(0)
@@ -0,0 +1,122 @@
+"""Requests/sec and latency of the estimation API (api_server.py) on one core.
+
+Starts the server in a subprocess pinned to one CPU where the platform
+allows it, with ``--workers 0`` so every job is estimated on the event
+loop. Keep-alive clients then send ``POST /estimate`` requests (one job
+of ``--ops`` operations each) or ``POST /estimate/batch`` requests of
+``--batch`` jobs for ``--seconds``. The client shares the machine, so on a
+single-core box it competes with the server and the figures are a floor.
+
+    python benchmarks/bench_api.py --ops 10 50 --clients 8 --seconds 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import common
+from api_server import TARGET_OPS, TARGET_RPS
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _job(n_ops):
+    lathe, milling = common.route(n_ops)
+    return {
+        "job_material": "Steel", "material_cost": common.MATERIAL_COST,
+        "labor_cost_per_hour": common.LABOR_COST_PER_HOUR,
+        "machining1_entries": lathe, "machining2_entries": milling, "extra_entries": common.EXTRA_ENTRIES,
+    }
+
+
+def start_server(port):
+    command = [sys.executable, os.path.join(common.REPO, "api_server.py"), "--port", str(port), "--workers", "0"]
+    pin = (lambda: os.sched_setaffinity(0, {0})) if hasattr(os, "sched_setaffinity") else None
+    server = subprocess.Popen(command, cwd=common.REPO, stdout=subprocess.PIPE, text=True, preexec_fn=pin)
+    server.stdout.readline()  # "Estimation API on ..." once it is listening
+    return server
+
+
+async def _client(port, request, deadline, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def load(port, path, payload, clients, seconds):
+    body = json.dumps(payload).encode()
+    request = (
+        f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(port, request, start + seconds, latencies) for _ in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+def measure(port, n_ops, batch, clients, seconds):
+    job = _job(n_ops)
+    path, payload = ("/estimate", job) if batch == 1 else ("/estimate/batch", {"jobs": [job] * batch})
+    latencies, elapsed = asyncio.run(load(port, path, payload, clients, seconds))
+    latencies.sort()
+    return {
+        "bench": "api", "ops": n_ops, "batch": batch, "clients": clients,
+        "requests_per_sec": len(latencies) / elapsed,
+        "jobs_per_sec": len(latencies) * batch / elapsed,
+        "median_ms": statistics.median(latencies) * 1e3,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3,
+    }
+
+
+def collect(ops=(10, 50), batches=(1, 100), clients=8, seconds=5.0):
+    port = _free_port()
+    server = start_server(port)
+    try:
+        return [measure(port, n_ops, batch, clients, seconds) for n_ops in ops for batch in batches]
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 100], help="jobs per request; 1 uses /estimate")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    print(f"{'ops':>5} {'batch':>6} {'req/sec':>9} {'jobs/sec':>10} {'median (ms)':>12} {'p99 (ms)':>9}")
+    for r in collect(args.ops, args.batch, args.clients, args.seconds):
+        below = (r["ops"], r["batch"]) == (TARGET_OPS, 1) and r["requests_per_sec"] < TARGET_RPS
+        flag = f"  below the target of {TARGET_RPS}" if below else ""
+        print(
+            f"{r['ops']:>5} {r['batch']:>6} {r['requests_per_sec']:>9.0f} {r['jobs_per_sec']:>10.0f}"
+            f" {r['median_ms']:>12.2f} {r['p99_ms']:>9.2f}{flag}"
+        )
+
+
+if __name__ == "__main__":
+    main()
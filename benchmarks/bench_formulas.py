@@ -0,0 +1,67 @@
+"""Per-operation cost of every process formula used by "✅ Submit All".
+
+Each registered process is timed through ``estimator.estimate_operation`` on
+an entry with the card's default values, the same path ``estimate_job`` takes
+for every operation, together with the extra processes and ``estimate_job``
+on a whole route. If NumPy is available the vectorized kernels of
+``batch_estimator`` are timed per operation as well.
+
+    python benchmarks/bench_formulas.py
+"""
+
+import argparse
+import timeit
+
+import common
+from estimator import EXTRA_PROCESS_TYPES, PROCESSES, ExtraProcess, estimate_job, estimate_operation
+
+
+def _per_call(fn, repeat):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def collect(repeat=5, route_ops=100, batch_rows=10_000):
+    records = []
+    for ptype in PROCESSES:
+        entry = common.default_entry(ptype)
+        seconds = _per_call(lambda: estimate_operation(entry, common.LABOR_COST_PER_HOUR), repeat)
+        records.append({"bench": "formula", "name": ptype, "us_per_op": seconds * 1e6})
+
+    for ptype, spec in EXTRA_PROCESS_TYPES.items():
+        entry = {"type": ptype, "time_min": spec.default_time, "extra_tool_cost": spec.default_cost}
+        seconds = _per_call(lambda: ExtraProcess.from_entry(entry).estimate(), repeat)
+        records.append({"bench": "formula", "name": f"Other: {ptype}", "us_per_op": seconds * 1e6})
+
+    lathe, milling = common.route(route_ops)
+    extra = common.EXTRA_ENTRIES
+    seconds = _per_call(
+        lambda: estimate_job(lathe, milling, extra, common.MATERIAL_COST, common.LABOR_COST_PER_HOUR), repeat,
+    )
+    records.append({"bench": "estimate_job", "ops": route_ops, "us_per_op": seconds * 1e6 / (route_ops + len(extra))})
+
+    try:
+        from batch_estimator import KERNELS, process_columns, process_times
+    except ImportError:
+        return records
+    for ptype in KERNELS:
+        entries = [common.default_entry(ptype)] * batch_rows
+        seconds = _per_call(lambda: process_times(ptype, process_columns(ptype, entries)), repeat)
+        records.append({"bench": "kernel", "name": ptype, "us_per_op": seconds * 1e6 / batch_rows})
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'bench':<13} {'name':<32} {'us/op':>9}")
+    for record in collect(args.repeat):
+        name = record.get("name") or f"{record['ops']} ops"
+        print(f"{record['bench']:<13} {name:<32} {record['us_per_op']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Session memory per operation: entry dicts against the typed records kept alongside them.
+
+For a synthetic route of ``--ops`` operations, reports the bytes per
+operation (``profiling.deep_sizeof``) of the entry dicts the cards edit,
+the slotted operation records ``live_totals.py`` keeps, the ``*_times``
+rows as dicts (the PDF and quote form) and as the ``OperationTime``
+records held in the session, the running totals, and a whole submitted
+session.
+
+    python benchmarks/bench_memory.py --ops 10 100 1000
+"""
+
+import argparse
+
+import common
+from estimator import MACHINES, expand_times, operation_from_entry
+from live_totals import EXTRA_LIST, LiveTotals
+from profiling import deep_sizeof
+
+
+def _times(state):
+    return [t for key in (*(machine.times_key for machine in MACHINES), "extra_times") for t in state[key]]
+
+
+def measure(n_ops):
+    state = common.submitted_state(n_ops)
+    entries = state["machining1_entries"] + state["machining2_entries"]
+    totals = LiveTotals()
+    for machine in MACHINES:
+        for i, entry in enumerate(state[machine.entries_key]):
+            totals.set_operation(machine.entries_key, i, entry)
+    for i, entry in enumerate(state[EXTRA_LIST]):
+        totals.set_operation(EXTRA_LIST, i, entry)
+    n = len(entries) + len(state[EXTRA_LIST])
+    # store -> (bytes, operations held)
+    return {
+        "entry dicts": (deep_sizeof(entries), len(entries)),
+        "operation records": (deep_sizeof([operation_from_entry(entry) for entry in entries]), len(entries)),
+        "time dicts": (deep_sizeof(_times(expand_times(state))), n),
+        "time records": (deep_sizeof(_times(state)), n),
+        "live totals": (deep_sizeof(totals), n),
+        "session": (deep_sizeof({**state, "live_totals": totals}), n),
+    }
+
+
+def collect(ops=(10, 100, 1000)):
+    records = []
+    for n_ops in ops:
+        records.extend(
+            {"bench": "memory", "ops": n_ops, "store": store, "bytes_per_op": size / n, "bytes": size}
+            for store, (size, n) in measure(n_ops).items()
+        )
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args(argv)
+
+    print(f"{'ops':>6} {'store':<18} {'bytes/op':>9} {'KiB':>9}")
+    for r in collect(args.ops):
+        print(f"{r['ops']:>6} {r['store']:<18} {r['bytes_per_op']:>9.0f} {r['bytes'] / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
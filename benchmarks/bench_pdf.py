@@ -0,0 +1,55 @@
+"""PDF export throughput and peak memory against the length of the route.
+
+Builds the full-detail route sheet (summary, time tables and one parameter
+table per process) for synthetic routes and reports pages/sec and the peak
+Python heap seen while building, as measured by ``tracemalloc``.
+
+    python benchmarks/bench_pdf.py --ops 100 500 2000
+"""
+
+import argparse
+import re
+import time
+import tracemalloc
+
+import common
+from report import build_pdf, result_state
+
+PAGE = re.compile(rb"/Type\s*/Page\b(?!s)")
+
+
+def measure(n_ops, detail):
+    state = result_state(common.submitted_state(n_ops))
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = build_pdf(state, detail)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(PAGE.findall(data)), len(data), elapsed, peak
+
+
+def collect(ops=(100, 500, 2000), detail=True):
+    records = []
+    for n_ops in ops:
+        pages, size, elapsed, peak = measure(n_ops, detail)
+        records.append({
+            "bench": "pdf", "ops": n_ops, "detail": detail, "pages": pages, "bytes": size,
+            "seconds": elapsed, "pages_per_sec": pages / elapsed, "peak_mib": peak / 2**20,
+        })
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--summary-only", action="store_true", help="leave out the parameter tables")
+    args = parser.parse_args(argv)
+
+    print(f"{'ops':>6} {'pages':>6} {'time (s)':>9} {'pages/sec':>10} {'peak (MiB)':>11}")
+    for r in collect(args.ops, not args.summary_only):
+        print(f"{r['ops']:>6} {r['pages']:>6} {r['seconds']:>9.2f} {r['pages_per_sec']:>10.1f} {r['peak_mib']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Rerun latency of the Machining and Result pages against the number of operations.
+
+Before operation cards became fragments, every edit reran the whole script,
+so the "full rerun" column is what one keystroke used to cost. Now an edit
+only reruns the card it belongs to ("card rerun"), which does not depend on
+the length of the route. Adding or removing an operation still costs a full
+rerun. "result rerun" is a full rerun of the Result page after
+"✅ Submit All".
+
+    python benchmarks/bench_rerun.py --ops 1 10 100 1000
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+import common
+
+APP = os.path.join(common.REPO, "streamlit_app.py")
+
+
+def _timed_runs(at, repeat):
+    at.run()  # first run creates the widgets
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def full_rerun(n_ops, repeat):
+    lathe, milling = common.route(n_ops)
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.session_state["page"] = "Machining"
+    at.session_state["machining1_entries"] = lathe
+    at.session_state["machining2_entries"] = milling
+    at.session_state["extra_entries"] = []
+    return _timed_runs(at, repeat)
+
+
+def result_rerun(n_ops, repeat):
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.session_state["page"] = "Result"
+    at.session_state["result_ready"] = True
+    for key, value in common.submitted_state(n_ops).items():
+        at.session_state[key] = value
+    return _timed_runs(at, repeat)
+
+
+def _single_card(repo, n_ops):
+    import sys
+
+    sys.path.insert(0, repo)
+    import streamlit as st
+    from live_totals import LiveTotals
+    from operation_cards import operation_card
+
+    if "machining1_entries" not in st.session_state:
+        st.session_state.machining1_entries = [{"id": str(i), "type": "Turning - Straight"} for i in range(n_ops)]
+        st.session_state.live_totals = LiveTotals()
+    operation_card("machining1_entries", 0, st.session_state.machining1_entries[0])
+
+
+def card_rerun(n_ops, repeat):
+    at = AppTest.from_function(_single_card, args=(common.REPO, n_ops), default_timeout=600)
+    return _timed_runs(at, repeat)
+
+
+def collect(ops=(1, 10, 100, 1000), repeat=5):
+    records = []
+    for n_ops in ops:
+        for page, measure in (("Machining", full_rerun), ("Machining card", card_rerun), ("Result", result_rerun)):
+            records.append({"bench": "rerun", "page": page, "ops": n_ops, "median_ms": measure(n_ops, repeat) * 1000})
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rows = {}
+    for record in collect(args.ops, args.repeat):
+        rows.setdefault(record["ops"], {})[record["page"]] = record["median_ms"]
+    print(f"{'ops':>6} {'full rerun (ms)':>16} {'card rerun (ms)':>16} {'result rerun (ms)':>18}")
+    for n_ops, row in rows.items():
+        print(f"{n_ops:>6} {row['Machining']:>16.1f} {row['Machining card']:>16.1f} {row['Result']:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
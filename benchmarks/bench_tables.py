@@ -0,0 +1,49 @@
+"""Columnar table export time and size against the length of the route.
+
+Builds the per-process tables of a synthetic submitted route
+(``result_tables.result_tables``) and writes them as a ZIP in each format.
+
+    python benchmarks/bench_tables.py --ops 100 2000 10000
+"""
+
+import argparse
+import time
+
+import common
+from result_tables import FORMATS, export_zip, result_tables
+
+
+def measure(n_ops, fmt):
+    state = common.submitted_state(n_ops)
+    start = time.perf_counter()
+    tables = result_tables(state)
+    built = time.perf_counter()
+    data = export_zip(tables, fmt)
+    return built - start, time.perf_counter() - built, len(data)
+
+
+def collect(ops=(100, 2000, 10000), formats=tuple(FORMATS)):
+    records = []
+    for n_ops in ops:
+        for fmt in formats:
+            build, write, size = measure(n_ops, fmt)
+            records.append({
+                "bench": "tables", "ops": n_ops, "format": fmt, "median_ms": build * 1e3,
+                "seconds": write, "bytes": size,
+            })
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, nargs="+", default=[100, 2000, 10000])
+    parser.add_argument("--format", nargs="+", choices=list(FORMATS), default=list(FORMATS))
+    args = parser.parse_args(argv)
+
+    print(f"{'ops':>6} {'format':<8} {'build (ms)':>11} {'write (s)':>10} {'KiB':>9}")
+    for r in collect(args.ops, args.format):
+        print(f"{r['ops']:>6} {r['format']:<8} {r['median_ms']:>11.1f} {r['seconds']:>10.3f} {r['bytes'] / 1024:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Helpers shared by the benchmark scripts: repo path, synthetic routes, run metadata."""
+
+import os
+import platform
+import subprocess
+import sys
+from dataclasses import asdict
+from importlib import metadata
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO not in sys.path:
+    sys.path.insert(0, REPO)
+
+from estimator import LATHE, MILLING, PROCESSES, compact_times, estimate_job, processes_for  # noqa: E402
+from report import SUBMITTED_ENTRIES, submitted_entries  # noqa: E402
+
+LATHE_TYPES = list(processes_for(LATHE))
+MILLING_TYPES = list(processes_for(MILLING))
+EXTRA_ENTRIES = [{"type": "Chamfering", "time_min": 5.0, "extra_tool_cost": 10.0}]
+MATERIAL_COST = 1000.0
+LABOR_COST_PER_HOUR = 500.0
+
+
+def default_entry(ptype):
+    """An entry of ``ptype`` filled with the card's default values."""
+    return {"type": ptype, **{field.key: field.default for field in PROCESSES[ptype].inputs}}
+
+
+def route(n_ops):
+    """``n_ops`` operations, half on the lathe and half on the milling machine, cycling through the processes."""
+    lathe = [default_entry(LATHE_TYPES[i % len(LATHE_TYPES)]) for i in range(n_ops - n_ops // 2)]
+    milling = [default_entry(MILLING_TYPES[i % len(MILLING_TYPES)]) for i in range(n_ops // 2)]
+    return lathe, milling
+
+
+def submitted_state(n_ops):
+    """Session state after "✅ Submit All" on a synthetic route of ``n_ops`` operations."""
+    lathe, milling = route(n_ops)
+    extra = [dict(entry) for entry in EXTRA_ENTRIES]
+    result = estimate_job(lathe, milling, extra, MATERIAL_COST, LABOR_COST_PER_HOUR)
+    entries = {"machining1_entries": lathe, "machining2_entries": milling, "extra_entries": extra}
+    return {
+        **compact_times(asdict(result)), "job_material": "Steel", "labor_cost_per_hour": LABOR_COST_PER_HOUR,
+        **entries, SUBMITTED_ENTRIES: submitted_entries(entries),
+    }
+
+
+def _version(package):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def environment():
+    """What a result was measured on, so runs from different machines are not compared blindly."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "packages": {name: _version(name) for name in ("streamlit", "fpdf", "numpy")},
+    }
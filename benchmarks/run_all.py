@@ -0,0 +1,104 @@
+"""Run the benchmark suite and store the results as JSON.
+
+    python benchmarks/run_all.py                        # all suites
+    python benchmarks/run_all.py formulas pdf --quick
+    python benchmarks/run_all.py --compare benchmarks/results/<earlier run>.json
+
+Suites are ``formulas`` (bench_formulas.py), ``rerun`` (bench_rerun.py),
+``pdf`` (bench_pdf.py), ``tables`` (bench_tables.py), ``api``
+(bench_api.py) and ``memory`` (bench_memory.py). Each run is written to ``benchmarks/results`` as one
+JSON document holding the environment (commit, Python, package versions)
+and a flat list of records. ``--compare`` prints every metric next to the
+same record of an earlier run.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import time
+
+import common
+
+SUITES = {
+    "formulas": ("bench_formulas", {}, {}),
+    "rerun": ("bench_rerun", {}, {"ops": (1, 10, 100), "repeat": 3}),
+    "pdf": ("bench_pdf", {}, {"ops": (100, 500)}),
+    "tables": ("bench_tables", {}, {"ops": (100, 2000)}),
+    "api": ("bench_api", {}, {"ops": (10,), "batches": (1,), "seconds": 1.0}),
+    "memory": ("bench_memory", {}, {"ops": (10, 100)}),
+}
+METRICS = (
+    "us_per_op", "median_ms", "p99_ms", "seconds", "pages_per_sec", "requests_per_sec", "jobs_per_sec",
+    "peak_mib", "bytes_per_op", "bytes", "pages",
+)
+# For these a larger value is an improvement.
+HIGHER_IS_BETTER = {"pages_per_sec", "requests_per_sec", "jobs_per_sec"}
+RESULTS_DIR = os.path.join(common.REPO, "benchmarks", "results")
+
+
+def run(suites, quick=False):
+    records = []
+    for name in suites:
+        module, options, quick_options = SUITES[name]
+        start = time.perf_counter()
+        suite = importlib.import_module(module).collect(**(quick_options if quick else options))
+        print(f"{name}: {len(suite)} records in {time.perf_counter() - start:.1f} s")
+        records.extend({"suite": name, **record} for record in suite)
+    return records
+
+
+def record_key(record):
+    return tuple(sorted((k, v) for k, v in record.items() if k not in METRICS))
+
+
+def compare(records, baseline):
+    earlier = {record_key(record): record for record in baseline["records"]}
+    print(f"{'record':<60} {'metric':<14} {'before':>11} {'after':>11} {'change':>8}")
+    for record in records:
+        before = earlier.get(record_key(record))
+        if before is None:
+            continue
+        label = " ".join(str(v) for k, v in record.items() if k not in METRICS and k != "suite")
+        for metric in METRICS:
+            if metric not in record or not before.get(metric):
+                continue
+            change = record[metric] / before[metric] - 1
+            worse = change > 0.1 if metric not in HIGHER_IS_BETTER else change < -0.1
+            flag = " !" if worse and metric not in ("bytes", "pages") else ""
+            print(f"{label:<60} {metric:<14} {before[metric]:>11.3f} {record[metric]:>11.3f} {change:>+8.1%}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("suites", nargs="*", help=f"any of {', '.join(SUITES)} (default: all)")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes for a fast check")
+    parser.add_argument("-o", "--output", help="result file (default: a new file in benchmarks/results)")
+    parser.add_argument("--compare", metavar="JSON", help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    env = common.environment()
+    records = run(args.suites or list(SUITES), args.quick)
+    document = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "quick": args.quick,
+        "environment": env, "records": records,
+    }
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{env['commit'] or 'unknown'}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    print(f"results written to {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(records, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
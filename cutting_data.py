@@ -0,0 +1,208 @@
+"""Recommended cutting parameters by material, process and diameter band.
+
+Rows live in a SQLite table whose primary key is (material, process,
+dia_min), so a lookup is a single B-tree search. A row covers diameters from
+``dia_min`` (inclusive) to ``dia_max`` (exclusive) and gives the feed,
+cutting speed (m/min), depth of cut and tool cost. The spindle speed for an
+operation follows from the cutting speed and the diameter named by the
+process's ``diameter_input``. Processes without one, such as Knurling, use a
+single band and keep their RPM.
+
+A second table holds the extended Taylor tool-life constants per material,
+``V * T**n * f**a = C`` with V in m/min, T in minutes and f in mm (per rev,
+or per tooth for milling), plus the time to change a worn tool. The
+optimizer (``optimizer.py``) uses them.
+
+By default the database is built in memory from ``data/cutting_data.csv``
+and ``data/tool_life.csv``.
+Set ``MACHINING_CUTTING_DB`` to a SQLite file to use a larger catalog, which
+can be loaded from CSV with::
+
+    python cutting_data.py catalog.csv --tool-life tool_life.csv --db cutting_data.sqlite
+
+This module does not import Streamlit.
+"""
+
+import argparse
+import csv
+import math
+import os
+import sqlite3
+import threading
+from typing import NamedTuple
+
+from estimator import PROCESSES
+
+DB_ENV = "MACHINING_CUTTING_DB"
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+SEED_CSV = os.path.join(DATA_DIR, "cutting_data.csv")
+TOOL_LIFE_CSV = os.path.join(DATA_DIR, "tool_life.csv")
+COLUMNS = ("material", "process", "dia_min", "dia_max", "feed", "cutting_speed", "depth_of_cut", "tool_cost")
+# Entry fields filled straight from a row (the rest follow from the cutting speed).
+ROW_INPUTS = ("feed", "depth_of_cut", "tool_cost")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cutting_data (
+    material TEXT NOT NULL,
+    process TEXT NOT NULL,
+    dia_min REAL NOT NULL,
+    dia_max REAL NOT NULL,
+    feed REAL,
+    cutting_speed REAL,
+    depth_of_cut REAL,
+    tool_cost REAL,
+    PRIMARY KEY (material, process, dia_min)
+) WITHOUT ROWID
+"""
+TOOL_LIFE_COLUMNS = ("material", "taylor_n", "taylor_c", "feed_exponent", "tool_change_min")
+TOOL_LIFE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tool_life (
+    material TEXT PRIMARY KEY,
+    taylor_n REAL NOT NULL,
+    taylor_c REAL NOT NULL,
+    feed_exponent REAL NOT NULL,
+    tool_change_min REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+class CuttingData(NamedTuple):
+    dia_min: float
+    dia_max: float
+    feed: float | None
+    cutting_speed: float | None
+    depth_of_cut: float | None
+    tool_cost: float | None
+
+
+class ToolLife(NamedTuple):
+    taylor_n: float
+    taylor_c: float
+    feed_exponent: float
+    tool_change_min: float
+
+    def minutes(self, cutting_speed, feed):
+        """Tool life in minutes at ``cutting_speed`` (m/min) and ``feed`` (mm); works on arrays."""
+        return (self.taylor_c / (cutting_speed * feed ** self.feed_exponent)) ** (1 / self.taylor_n)
+
+
+def spindle_rpm(cutting_speed, diameter):
+    """RPM giving ``cutting_speed`` (m/min) at ``diameter`` (mm)."""
+    return 1000 * cutting_speed / (math.pi * diameter)
+
+
+class CuttingDataDB:
+    """Read-mostly cutting data table; safe to share between sessions."""
+
+    def __init__(self, path=":memory:", seed=SEED_CSV, tool_life_seed=TOOL_LIFE_CSV):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.conn:
+            self.conn.execute(SCHEMA)
+            self.conn.execute(TOOL_LIFE_SCHEMA)
+        if seed and self.count() == 0 and os.path.exists(seed):
+            self.import_csv(seed)
+        if tool_life_seed and not self.tool_life_materials() and os.path.exists(tool_life_seed):
+            self.import_tool_life_csv(tool_life_seed)
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get(DB_ENV, ":memory:"))
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM cutting_data").fetchone()[0]
+
+    def import_csv(self, path):
+        """Insert or replace the rows of a CSV file with ``COLUMNS`` as its header; returns the row count."""
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [
+                (row["material"], row["process"], *(float(row[c]) if row.get(c, "") != "" else None for c in COLUMNS[2:]))
+                for row in csv.DictReader(f)
+            ]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO cutting_data ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows,
+            )
+        return len(rows)
+
+    def import_tool_life_csv(self, path):
+        """Insert or replace tool-life constants from a CSV file with ``TOOL_LIFE_COLUMNS`` as its header."""
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = [(row["material"], *(float(row[c]) for c in TOOL_LIFE_COLUMNS[1:])) for row in csv.DictReader(f)]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO tool_life ({', '.join(TOOL_LIFE_COLUMNS)})"
+                f" VALUES ({', '.join('?' * len(TOOL_LIFE_COLUMNS))})",
+                rows,
+            )
+        return len(rows)
+
+    def tool_life_materials(self):
+        with self._lock:
+            return [m for (m,) in self.conn.execute("SELECT material FROM tool_life ORDER BY material")]
+
+    def tool_life(self, material):
+        """The Taylor constants of ``material``, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(TOOL_LIFE_COLUMNS[1:])} FROM tool_life WHERE material = ?", (material,),
+            ).fetchone()
+        return None if row is None else ToolLife(*row)
+
+    def materials(self):
+        with self._lock:
+            return [m for (m,) in self.conn.execute("SELECT DISTINCT material FROM cutting_data ORDER BY material")]
+
+    def lookup(self, material, process, diameter=0.0):
+        """The band of ``material`` × ``process`` containing ``diameter``, or None."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT dia_min, dia_max, feed, cutting_speed, depth_of_cut, tool_cost FROM cutting_data"
+                " WHERE material = ? AND process = ? AND dia_min <= ? ORDER BY dia_min DESC LIMIT 1",
+                (material, process, diameter),
+            ).fetchone()
+        if row is None or diameter >= row[1]:
+            return None
+        return CuttingData(*row)
+
+    def prefill(self, material, process, values=None):
+        """Recommended input values for an operation, keyed by input name.
+
+        ``values`` holds the operation's current inputs by name (defaults are
+        used for missing ones); only the diameter is read from it. Returns an
+        empty dict when there is no cutting data for the combination.
+        """
+        cls = PROCESSES[process]
+        values = values or {}
+        inputs = {field.name: field for field in cls.inputs}
+        diameter = values.get(cls.diameter_input, inputs[cls.diameter_input].default) if cls.diameter_input else 0.0
+        data = self.lookup(material, process, diameter)
+        if data is None:
+            return {}
+
+        found = {name: getattr(data, name) for name in ROW_INPUTS}
+        if cls.diameter_input and data.cutting_speed and diameter > 0:
+            found["rpm"] = spindle_rpm(data.cutting_speed, diameter)
+        return {name: inputs[name].coerce(value) for name, value in found.items() if name in inputs and value is not None}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load cutting data from CSV into a SQLite file.")
+    parser.add_argument("csv", nargs="*", help=f"CSV files with the columns {', '.join(COLUMNS)}")
+    parser.add_argument("--tool-life", action="append", default=[], metavar="CSV",
+                        help=f"CSV file with the columns {', '.join(TOOL_LIFE_COLUMNS)}")
+    parser.add_argument("--db", default=os.environ.get(DB_ENV, "cutting_data.sqlite"))
+    args = parser.parse_args(argv)
+
+    db = CuttingDataDB(args.db, seed=None, tool_life_seed=None)
+    for path in args.csv:
+        print(f"{path}: {db.import_csv(path)} rows")
+    for path in args.tool_life:
+        print(f"{path}: {db.import_tool_life_csv(path)} materials")
+    print(f"{args.db}: {db.count()} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Server-wide cache of route estimates, shared by every session.
+
+Estimators often price the same route more than once (same part, another
+customer), and each session used to recompute it from scratch. Results are
+now cached under ``route_key``, a hash of everything the estimate depends
+on: the lathe, milling and extra entries (their widget ``"id"`` left out),
+the material cost, the labor rate and the uncertainty spreads.
+
+Values are stored pickled. The cache's size is then the number of bytes
+it actually holds, and every hit returns a fresh copy, so no session can
+change another session's result. Entries are evicted least recently used
+first once they take more than ``max_bytes``. The default is
+``MACHINING_ESTIMATE_CACHE_MB`` MiB, or 64 if that variable is unset.
+Hits, misses and evictions are counted for the profiling panel.
+
+This module does not import Streamlit.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+MAX_MB_ENV = "MACHINING_ESTIMATE_CACHE_MB"
+DEFAULT_MAX_MB = 64
+
+
+def _route_entries(entries):
+    return [{key: value for key, value in entry.items() if key != "id"} for entry in entries]
+
+
+def route_key(lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour, spreads=None):
+    """Stable hash of the inputs of an estimate; sessions with the same route get the same key."""
+    payload = json.dumps(
+        [
+            _route_entries(lathe_entries), _route_entries(milling_entries), _route_entries(extra_entries),
+            float(material_cost), float(labor_cost_per_hour),
+            None if spreads is None else sorted((name, list(spread)) for name, spread in spreads.items()),
+        ],
+        sort_keys=True, default=str, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EstimateCache:
+    """Thread-safe LRU of estimate results keyed by ``route_key``, capped at ``max_bytes``."""
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get(MAX_MB_ENV, DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def get(self, key):
+        """The cached value for ``key`` (a fresh copy), or None; counts a hit or a miss."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return pickle.loads(data)
+
+    def put(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """The cached value for ``key``, else ``compute()``, which is then cached."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries), "size_mib": round(self._size / 2**20, 3),
+                "max_mib": round(self.max_bytes / 2**20, 3), "hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None, "evictions": self.evictions,
+            }
@@ -0,0 +1,264 @@
+"""Headless batch estimator: price many jobs from CSV or JSONL files.
+
+    python estimate_cli.py jobs.jsonl -o quotes.csv --workers 8
+
+JSONL input holds one job per line, named like the Machining page's session
+state (entries use the same keys as the input cards)::
+
+    {"job_id": "A-17", "job_material": "Steel", "material_cost": 1000, "labor_cost_per_hour": 500,
+     "machining1_entries": [{"type": "Facing", "diameter": 50, "length": 10, ...}],
+     "machining2_entries": [], "extra_entries": [{"type": "Chamfering", "time_min": 5, "extra_tool_cost": 10}]}
+
+CSV input holds one operation per row; consecutive rows sharing a ``job_id``
+form one job. Columns are ``job_id``, ``job_material``, ``material_cost``,
+``labor_cost_per_hour``, ``machine`` (lathe, milling or other), ``type`` and
+then any entry keys (``depth of cut``, ``time_min``, ...); empty cells are
+ignored and a row with an empty ``machine`` only carries job fields.
+Machining entries take the card defaults for inputs they leave out, as in
+``api_server.py``. A job that cannot be estimated (an unknown process type,
+a value that is not a number, ...) gets an output record with its
+``job_id`` and an ``error`` instead of totals; the other jobs are unaffected.
+That includes jobs that cannot be read: a JSONL line that is not a JSON
+object, or a CSV job with a non-numeric cell or an unknown machine. The
+readers yield those as ``JobError`` and ``complete_job`` rejects them.
+
+Jobs are estimated in chunks across a process pool and results are written
+as soon as each chunk finishes, so output order may differ from input order.
+Only a fixed number of chunks is in flight at once, which keeps memory bounded
+regardless of the input size.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict
+from typing import NamedTuple
+
+from estimator import MACHINES, PROCESSES
+
+JOB_FIELDS = ["job_id", "job_material", "material_cost", "labor_cost_per_hour"]
+MACHINE_KEYS = {"lathe": "machining1_entries", "milling": "machining2_entries", "other": "extra_entries"}
+TEXT_KEYS = {"type", "custom_name"}
+SUMMARY_FIELDS = JOB_FIELDS[:2] + [
+    "total_time_min", "labor_cost", "material_cost", "tool_cost", "total_extra_cost", "total_cost", "error",
+]
+# Raised by the estimators for entries they cannot price.
+ESTIMATE_ERRORS = (ValueError, KeyError, TypeError)
+
+
+class JobError(NamedTuple):
+    """A job that could not be read, in place of its job dict."""
+
+    job_id: object
+    error: str
+
+
+def _file_format(path, given):
+    if given:
+        return given
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_jsonl_jobs(f):
+    for n, line in enumerate(f, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except ValueError as e:
+            yield JobError(n, f"line {n}: not valid JSON ({e})")
+            continue
+        if not isinstance(job, dict):
+            yield JobError(n, f"line {n}: a job must be a JSON object")
+            continue
+        job.setdefault("job_id", n)
+        yield job
+
+
+def _csv_value(key, value):
+    if key in TEXT_KEYS:
+        return value
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{key}: {value!r} is not a number") from None
+
+
+def _csv_job(job_id, rows, reader):
+    job = {"job_id": job_id, **{key: [] for key in MACHINE_KEYS.values()}}
+    for row in rows:
+        try:
+            for key in JOB_FIELDS[1:]:
+                if key not in job and row.get(key, ""):
+                    job[key] = row[key] if key == "job_material" else _csv_value(key, row[key])
+            machine = (row.get("machine") or "").strip().lower()
+            if not machine:
+                continue
+            if machine not in MACHINE_KEYS:
+                raise ValueError(f"unknown machine {row['machine']!r}")
+            entry = {
+                key: _csv_value(key, value) for key, value in row.items()
+                if key not in JOB_FIELDS and key != "machine" and value not in ("", None)
+            }
+        except ValueError as e:
+            # The rest of the job's rows are skipped with it.
+            return JobError(job_id, f"line {reader.line_num}: {e}")
+        job[MACHINE_KEYS[machine]].append(entry)
+    return job
+
+
+def read_csv_jobs(f):
+    reader = csv.DictReader(f)
+    for job_id, rows in itertools.groupby(reader, key=lambda row: row["job_id"]):
+        yield _csv_job(job_id, rows, reader)
+
+
+def complete_job(job):
+    """A copy of ``job`` whose machining entries hold every input of their process; raises ValueError."""
+    if isinstance(job, JobError):
+        raise ValueError(job.error)
+    if not isinstance(job, dict):
+        raise ValueError("a job must be a JSON object")
+    job = dict(job)
+    for machine in MACHINES:
+        entries = []
+        for entry in job.get(machine.entries_key) or []:
+            cls = PROCESSES.get(entry.get("type")) if isinstance(entry, dict) else None
+            if cls is None or cls.machine != machine.name:
+                raise ValueError(f"{machine.entries_key}: unknown {machine.name.lower()} process {entry!r}")
+            entries.append({**{field.key: field.default for field in cls.inputs}, **entry})
+        job[machine.entries_key] = entries
+    job["extra_entries"] = job.get("extra_entries") or []
+    return job
+
+
+def _error_record(job, error):
+    job = job._asdict() if isinstance(job, JobError) else job if isinstance(job, dict) else {}
+    return {"job_id": job.get("job_id"), "job_material": job.get("job_material"), "error": str(error)}
+
+
+def estimate_chunk(jobs):
+    """Worker entry point: estimate a list of jobs and return one output record per job.
+
+    A job that cannot be estimated gets an error record; the rest of the chunk is still estimated.
+    """
+    from batch_estimator import estimate_jobs
+
+    records = [None] * len(jobs)
+    valid = []
+    for k, job in enumerate(jobs):
+        try:
+            valid.append((k, complete_job(job)))
+        except ValueError as e:
+            records[k] = _error_record(job, e)
+    try:
+        estimates = estimate_jobs([job for _, job in valid]).job_estimates()
+    except ESTIMATE_ERRORS:
+        # Estimate the jobs one at a time to find the ones that fail.
+        estimates = []
+        for _, job in valid:
+            try:
+                estimates.append(estimate_jobs([job]).job_estimate(0))
+            except ESTIMATE_ERRORS as e:
+                estimates.append(e)
+    for (k, job), estimate in zip(valid, estimates):
+        if isinstance(estimate, Exception):
+            records[k] = _error_record(job, estimate)
+        else:
+            records[k] = {"job_id": job.get("job_id"), "job_material": job.get("job_material"), **asdict(estimate)}
+    return records
+
+
+class JsonlWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, record):
+        self.f.write(json.dumps(record) + "\n")
+
+
+class CsvWriter:
+    def __init__(self, f):
+        self.writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
+def run(jobs, writer, workers, chunk_size, max_in_flight=None):
+    """Estimate ``jobs`` on a process pool, writing each record as soon as it is ready.
+
+    Returns the number of jobs written and how many of them are error records.
+    """
+    max_in_flight = max_in_flight or workers * 2
+    chunks = _chunks(jobs, chunk_size)
+    counts = [0, 0]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(estimate_chunk, chunk))
+            if len(pending) >= max_in_flight:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                _drain(finished, writer, counts)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            _drain(finished, writer, counts)
+    return tuple(counts)
+
+
+def _drain(futures, writer, counts):
+    for future in futures:
+        for record in future.result():
+            writer.write(record)
+            counts[0] += 1
+            counts[1] += "error" in record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate machining time and cost for many jobs.")
+    parser.add_argument("input", help="CSV or JSONL job file, '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="CSV or JSONL result file (default: stdout as JSONL)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--output-format", choices=["csv", "jsonl"])
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=256, help="jobs per worker task")
+    args = parser.parse_args(argv)
+
+    in_format = _file_format(args.input, args.input_format)
+    out_format = _file_format(args.output, args.output_format)
+
+    fin = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        jobs = read_csv_jobs(fin) if in_format == "csv" else read_jsonl_jobs(fin)
+        writer = CsvWriter(fout) if out_format == "csv" else JsonlWriter(fout)
+        start = time.perf_counter()
+        n, failed = run(jobs, writer, args.workers, args.chunk_size)
+        elapsed = time.perf_counter() - start
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+
+    rate = n / elapsed if elapsed else float("inf")
+    print(f"{n} jobs in {elapsed:.2f} s ({rate:.1f} jobs/sec)", file=sys.stderr)
+    if failed:
+        print(f"{failed} jobs could not be estimated; see their error field", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,849 @@
+"""Machining time & cost formulas, independent of the Streamlit UI.
+
+This is the process registry. Each process is a small frozen dataclass whose
+fields mirror the keys of an entry (``"depth of cut"`` becomes
+``depth_of_cut`` and so on). Its ``inputs`` declare the label, unit and
+default of every field in card order, ``split`` is the number of inputs shown
+in the card's first column, and ``time()`` returns minutes including job and
+tool setting time. ``@register`` adds the class to ``PROCESSES``; the input
+cards, the calculators, the Result page and the PDF export are all driven from
+there, so adding a process means adding one class here. The classes are
+slotted, so an operation kept as a record (e.g. by ``live_totals.py``) takes
+a fraction of the memory of its entry dict.
+
+This module only depends on the standard library so scripts and workers can
+import it without loading Streamlit or fpdf.
+"""
+
+import math
+from dataclasses import dataclass, field, fields
+from time import perf_counter
+from typing import ClassVar, NamedTuple
+
+LATHE = "Lathe"
+MILLING = "Milling"
+
+DRILL_POINT_ANGLE = 118
+EXTRA_PROCESS_OVERHEAD_MIN = 5
+
+
+class Estimate(NamedTuple):
+    time: float
+    cost: float
+
+
+class Input(NamedTuple):
+    name: str
+    label: str
+    unit: str | None
+    default: float
+
+    @property
+    def key(self):
+        """The key under which the value is stored in an entry."""
+        return self.name.replace("_", " ")
+
+    @property
+    def widget_label(self):
+        return f"{self.label} ({self.unit})" if self.unit else self.label
+
+    def coerce(self, value):
+        """``value`` as the type of the default, so integer inputs stay integers."""
+        return round(value) if isinstance(self.default, int) else float(value)
+
+
+class Machine(NamedTuple):
+    name: str
+    entries_key: str
+    times_key: str
+
+
+MACHINES = (
+    Machine(LATHE, "machining1_entries", "machining1_times"),
+    Machine(MILLING, "machining2_entries", "machining2_times"),
+)
+
+PROCESSES = {}
+
+
+def register(cls):
+    """Add a process class to ``PROCESSES`` after checking its inputs cover its fields."""
+    names = [i.name for i in cls.inputs]
+    if sorted(names) != sorted(f.name for f in fields(cls)):
+        raise TypeError(f"{cls.__name__}.inputs does not match its fields")
+    if cls.diameter_input is not None and cls.diameter_input not in names:
+        raise TypeError(f"{cls.__name__}.diameter_input is not one of its inputs")
+    if cls.process in PROCESSES:
+        raise ValueError(f"Process {cls.process!r} is already registered")
+    PROCESSES[cls.process] = cls
+    return cls
+
+
+def processes_for(machine):
+    """Registered process classes for a machine name, in registration order."""
+    return {name: cls for name, cls in PROCESSES.items() if cls.machine == machine}
+
+
+def labor_cost(minutes, labor_cost_per_hour):
+    return minutes * (labor_cost_per_hour / 60)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Operation:
+    process: ClassVar[str]
+    machine: ClassVar[str]
+    inputs: ClassVar[tuple]
+    split: ClassVar[int]
+    # Work or tool diameter the spindle speed follows from, for cutting data lookups.
+    diameter_input: ClassVar[str | None] = None
+
+    feed: float
+    rpm: float
+    approach: float
+    overrun: float
+    job_set_time: float
+    tool_set_time: float
+    tool_cost: float = 0.0
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Build the operation from a UI entry dict such as ``{"type": "Boring", "feed": 0.16, ...}``."""
+        values = {}
+        for f in fields(cls):
+            key = f.name.replace("_", " ")
+            if key in entry:
+                values[f.name] = entry[key]
+        return cls(**values)
+
+    def to_entry(self):
+        entry = {"type": self.process}
+        for f in fields(self):
+            entry[f.name.replace("_", " ")] = getattr(self, f.name)
+        return entry
+
+    def setup_time(self):
+        return self.job_set_time + self.tool_set_time
+
+    def time(self):
+        raise NotImplementedError
+
+    def estimate(self, labor_cost_per_hour):
+        try:
+            minutes = self.time()
+        except ZeroDivisionError:
+            minutes = 0
+        return Estimate(minutes, labor_cost(minutes, labor_cost_per_hour))
+
+
+# --- Lathe processes ---
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Boring(Operation):
+    process = "Boring"
+    diameter_input = "final_diameter"
+    inputs = (
+        Input("initial_diameter", "Initial Diameter", "mm", 25.00),
+        Input("final_diameter", "Final Diameter", "mm", 28.00),
+        Input("depth", "Boring Length", "mm", 12.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("angle", "Drill Angle", "degree", 118.00),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 0.10),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 6
+    machine = LATHE
+
+    initial_diameter: float
+    final_diameter: float
+    depth: float
+    angle: float
+    depth_of_cut: float
+
+    def time(self):
+        a = math.radians((180 - self.angle) / 2)
+        extra_length = (self.initial_diameter / 2) * (math.tan(a))
+        turn = (self.final_diameter - self.initial_diameter) / ((self.depth_of_cut) * 2)
+        return (((self.approach + self.overrun + (self.depth)) / (self.rpm * self.feed) * (turn * 2)) + (((10 + extra_length) / (self.feed * self.rpm)) * (turn * 2))) + self.setup_time()
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Drilling(Operation):
+    process = "Drilling"
+    diameter_input = "diameter"
+    machine = LATHE
+
+    depth: float
+    diameter: float
+    turn: float
+
+    def time(self):
+        drill_length = ((self.diameter / 2) * (math.tan(math.radians((180 - DRILL_POINT_ANGLE) / 2)))) + self.depth
+        return ((self.approach + self.overrun + drill_length) / (self.rpm * self.feed) * (self.turn)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class DrillingCenter(Drilling):
+    process = "Drilling - Center"
+    inputs = (
+        Input("depth", "Drilling Depth", "mm", 5.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("turn", "Num of times drilled", None, 4),
+        Input("diameter", "Drill Diameter", None, 6.00),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 5
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class DrillingPilot(Drilling):
+    process = "Drilling - Pilot"
+    inputs = (
+        Input("depth", "Drilling Depth", "mm", 12.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("turn", "Num of times drilled", None, 5),
+        Input("diameter", "Drill Diameter", None, 15.00),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 5
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class DrillingMain(Drilling):
+    process = "Drilling - Main"
+    inputs = (
+        Input("depth", "Drilling Depth", "mm", 12.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("turn", "Num of times drilled", None, 7),
+        Input("diameter", "Drill Diameter", None, 25.00),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 5
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Facing(Operation):
+    process = "Facing"
+    diameter_input = "diameter"
+    inputs = (
+        Input("diameter", "Facing Diameter", "mm", 50.00),
+        Input("length", "Facing Lenght", "mm", 10.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 2.00),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 10.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 5
+    machine = LATHE
+
+    diameter: float
+    length: float
+    depth_of_cut: float
+
+    def time(self):
+        turn = (self.length / self.depth_of_cut)
+        return ((((self.approach + self.overrun + (self.diameter / 2)) / (self.feed * self.rpm)) * turn)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Grooving(Operation):
+    process = "Grooving"
+    diameter_input = "initial_diameter"
+    inputs = (
+        Input("initial_diameter", "Initial Diameter", "mm", 28.00),
+        Input("final_diameter", "Final Diameter", "mm", 28.50),
+        Input("length", "Groove Length", None, 2.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("tool_width", "Tool Width", "mm", 2.00),
+        Input("depth_of_cut", "Depth of Cut", "mm/pass", 0.10),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 6
+    machine = LATHE
+
+    initial_diameter: float
+    final_diameter: float
+    length: float
+    tool_width: float
+    depth_of_cut: float
+
+    def time(self):
+        turn = (self.length) / (self.tool_width)
+        return ((((self.approach + self.overrun + ((self.final_diameter - self.initial_diameter) / 2)) / (self.feed * self.rpm)) * turn)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Knurling(Operation):
+    process = "Knurling"
+    inputs = (
+        Input("length", "Knurling Lenght", "mm", 18.00),
+        Input("feed", "Feed", "mm/rev", 0.20),
+        Input("rpm", "RPM", None, 60),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 0.10),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 5
+    machine = LATHE
+
+    length: float
+    depth_of_cut: float
+
+    def time(self):
+        return ((((self.approach + self.overrun + (self.length)) / (self.feed * self.rpm)) * 2)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Reaming(Operation):
+    process = "Reaming"
+    diameter_input = "final_diameter"
+    inputs = (
+        Input("length", "Reaming Lenght", "mm", 20.00),
+        Input("initial_diameter", "Initial Diameter", "mm", 28.00),
+        Input("final_diameter", "Final Diameter", "mm", 30.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 0.10),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 6
+    machine = LATHE
+
+    length: float
+    initial_diameter: float
+    final_diameter: float
+    depth_of_cut: float
+
+    def time(self):
+        turn = (self.final_diameter - self.initial_diameter) / (2 * self.depth_of_cut)
+        return ((((self.approach + self.overrun + (self.length)) / (self.feed * self.rpm)) * turn)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Threading(Operation):
+    process = "Threading"
+    inputs = (
+        Input("pitch", "Thread Pitch", "TPI", 2.00),
+        Input("length", "Thread Lenght", "mm", 12.00),
+        Input("feed", "Feed", "mm/rev", 0.20),
+        Input("rpm", "RPM", None, 60),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 0.10),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 5
+    machine = LATHE
+
+    pitch: float
+    length: float
+    depth_of_cut: float
+
+    def time(self):
+        turn = (0.6134 * self.pitch) / (self.depth_of_cut)
+        return (((self.approach + self.overrun + (self.length)) / (self.rpm * self.feed) * (turn))) + self.setup_time()
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class CurvedTurning(Operation):
+    process = "Turning - Curved"
+    diameter_input = "diameter"
+    machine = LATHE
+
+    diameter: float
+    angle: float
+    length: float
+    depth_of_cut: float
+
+    def time(self):
+        arc_length = self.length * (math.radians(self.angle))
+        turn = (self.diameter) / (self.depth_of_cut * 4)
+        return ((((self.approach + self.overrun + arc_length) / (self.feed * self.rpm)) * turn)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TurningConcave(CurvedTurning):
+    process = "Turning - Concave"
+    inputs = (
+        Input("diameter", "Diameter", "mm", 50.00),
+        Input("angle", "Conacve Angle", "Degree", 20.00),
+        Input("length", "Turning Lenght", "mm", 25.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 1.00),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 10.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 6
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TurningConvex(CurvedTurning):
+    process = "Turning - Convex"
+    inputs = (
+        Input("diameter", "Diameter", "mm", 50.00),
+        Input("angle", "Convex Angle", "Degree", 20.00),
+        Input("length", "Turning Lenght", "mm", 25.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 1.00),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 10.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 6
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TurningStraight(Operation):
+    process = "Turning - Straight"
+    diameter_input = "initial_diameter"
+    inputs = (
+        Input("initial_diameter", "Initial Diameter", "mm", 50.00),
+        Input("final_diameter", "Final Diameter", "mm", 38.00),
+        Input("length", "Turning Lenght", "mm", 25.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 1.00),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 6
+    machine = LATHE
+
+    initial_diameter: float
+    final_diameter: float
+    length: float
+    depth_of_cut: float
+
+    def time(self):
+        turn = ((self.initial_diameter) - (self.final_diameter)) / ((self.depth_of_cut) * 2)
+        return ((((self.approach + self.overrun + (self.length)) / (self.feed * self.rpm)) * turn)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class TurningTaper(Operation):
+    process = "Turning - Taper"
+    diameter_input = "larger_diameter"
+    inputs = (
+        Input("larger_diameter", "Larger Diameter", "mm", 50.00),
+        Input("smaller_diameter", "Smaller Diameter", "mm", 38.00),
+        Input("length", "Turning Lenght", "mm", 25.00),
+        Input("feed", "Feed", "mm/rev", 0.16),
+        Input("rpm", "RPM", None, 170),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 1.00),
+        Input("job_set_time", "Job Setting Time", "min", 0.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 6
+    machine = LATHE
+
+    larger_diameter: float
+    smaller_diameter: float
+    length: float
+    depth_of_cut: float
+
+    def time(self):
+        h_length = math.sqrt(((self.length) ** 2) + (((self.larger_diameter - self.smaller_diameter) / 2) ** 2))
+        turn = (((self.larger_diameter) - (self.smaller_diameter)) / ((self.depth_of_cut) * 2))
+        return ((((self.approach + self.overrun + h_length) / (self.feed * self.rpm)) * turn)) + self.setup_time()
+
+
+# --- Milling processes ---
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class MillingOperation(Operation):
+    machine = MILLING
+
+    teeth: float
+    repeat: float
+    depth_of_cut: float
+
+    def table_feed(self):
+        return self.rpm * self.feed * self.teeth
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class FaceMillingPlain(MillingOperation):
+    process = "Face Milling - Plain"
+    diameter_input = "cut_dia"
+    inputs = (
+        Input("length", "Length", "mm", 296.00),
+        Input("width", "Width", "mm", 150.00),
+        Input("initial_thickness", "Initial Thickness", "mm", 10.00),
+        Input("final_thickness", "Final Thickness", "mm", 8.00),
+        Input("feed", "Feed", "mm/teeth", 0.25),
+        Input("rpm", "RPM", None, 740),
+        Input("teeth", "No. of teeth of cutter", None, 4),
+        Input("cut_dia", "Cutter Diameter", "mm", 12.50),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 0.20),
+        Input("repeat", "No. of repetition of operation", None, 1.00),
+        Input("job_set_time", "Job Setting Time", "min", 5.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 10.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 8
+
+    length: float
+    width: float
+    initial_thickness: float
+    final_thickness: float
+    cut_dia: float
+
+    def time(self):
+        turn1 = ((self.initial_thickness) - (self.final_thickness)) / (self.depth_of_cut)
+        turn2 = (self.width) / (self.cut_dia)
+        return (self.approach + self.overrun + (self.length)) / self.table_feed() * (turn1 * turn2 * (self.repeat)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class FaceMillingOuterContour(MillingOperation):
+    process = "Face Milling - Outer Contour"
+    diameter_input = "cut_dia"
+    inputs = (
+        Input("initial_length", "Length", "mm", 280.00),
+        Input("final_length", "Final Length", "mm", 173.00),
+        Input("initial_width", "Initial Width", "mm", 230.00),
+        Input("final_width", "Final Width", "mm", 153.00),
+        Input("initial_thickness", "Initial Thickness", "mm", 20.00),
+        Input("final_thickness", "Final Thickness", "mm", 5.00),
+        Input("feed", "Feed", "mm/teeth", 0.25),
+        Input("rpm", "RPM", None, 740),
+        Input("cut_dia", "Cutter Diameter", "mm", 12.50),
+        Input("teeth", "No. of teeth of cutter", None, 4),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 0.20),
+        Input("repeat", "No. of repetition of operation", None, 1.00),
+        Input("job_set_time", "Job Setting Time", "min", 5.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 10.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 9
+
+    initial_length: float
+    final_length: float
+    initial_width: float
+    final_width: float
+    initial_thickness: float
+    final_thickness: float
+    cut_dia: float
+
+    def time(self):
+        turn1 = ((self.initial_length) - (self.final_length)) / (self.cut_dia)
+        turn2 = ((self.initial_width) - (self.final_width)) / (self.cut_dia)
+        turn3 = ((self.initial_thickness) - (self.final_thickness)) / (self.depth_of_cut)
+
+        table_feed = self.table_feed()
+        t1 = (self.approach + self.overrun + (self.initial_length)) / table_feed * (turn2 * turn3)
+        t2 = (self.approach + self.overrun + ((self.initial_width + self.final_width) / 2)) / table_feed * (turn1 * turn3)
+        t3 = (self.approach + self.overrun + ((self.initial_length + self.final_length) / 2)) / table_feed * (turn2 * turn3)
+        t4 = (self.approach + self.overrun + (self.final_width)) / table_feed * (turn1 * turn3)
+
+        return ((t1 + t2 + t3 + t4) * (self.repeat)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class SideMilling(MillingOperation):
+    process = "Side Milling"
+    diameter_input = "cut_dia"
+    inputs = (
+        Input("initial_length", "Initial Length", "mm", 306.00),
+        Input("final_length", "Final Length", "mm", 296.00),
+        Input("width", "Width", "mm", 160.00),
+        Input("thickness", "Thickness", "mm", 10.00),
+        Input("feed", "Feed", "mm/teeth", 0.25),
+        Input("rpm", "RPM", None, 740),
+        Input("teeth", "No. of teeth of cutter", None, 4),
+        Input("cut_dia", "Cutter Diameter", "mm", 5.00),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 0.20),
+        Input("repeat", "No. of repetition of operation", None, 1.00),
+        Input("job_set_time", "Job Setting Time", "min", 5.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 10.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 8
+
+    initial_length: float
+    final_length: float
+    width: float
+    thickness: float
+    cut_dia: float
+
+    def time(self):
+        turn1 = (self.thickness) / (self.depth_of_cut)
+        turn2 = ((self.initial_length) - (self.final_length)) / (self.cut_dia)
+        return (self.approach + self.overrun + (self.width)) / self.table_feed() * (turn1 * turn2 * (self.repeat)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class PocketCutting(MillingOperation):
+    process = "Pocket Cutting"
+    diameter_input = "cut_dia"
+    inputs = (
+        Input("length", "Length", "mm", 40.00),
+        Input("width", "Width", "mm", 40.00),
+        Input("initial_thickness", "Initial Thickness", "mm", 8.00),
+        Input("final_thickness", "Finalal Thickness", "mm", 0.00),
+        Input("feed", "Feed", "mm/teeth", 0.25),
+        Input("rpm", "RPM", None, 740),
+        Input("teeth", "No. of teeth of cutter", None, 4),
+        Input("cut_dia", "Cutter Diameter", "mm", 12.50),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 0.20),
+        Input("repeat", "No. of repetition of operation", None, 1.00),
+        Input("job_set_time", "Job Setting Time", "min", 5.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 0.00),
+        Input("overrun", "Overrun", "mm", 0.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 8
+
+    length: float
+    width: float
+    initial_thickness: float
+    final_thickness: float
+    cut_dia: float
+
+    def time(self):
+        turn1 = ((self.initial_thickness) - (self.final_thickness)) / (self.depth_of_cut)
+        turn2 = (self.width) / (self.cut_dia)
+        return (self.approach + self.overrun + (self.length)) / self.table_feed() * (turn1 * turn2 * (self.repeat)) + self.setup_time()
+
+
+@register
+@dataclass(frozen=True, kw_only=True, slots=True)
+class Blanking(MillingOperation):
+    process = "Blanking"
+    inputs = (
+        Input("length", "Length", "mm", 296.00),
+        Input("thickness", "Thickness", "mm", 8.00),
+        Input("feed", "Feed", "mm/teeth", 0.25),
+        Input("rpm", "RPM", None, 740),
+        Input("teeth", "No. of teeth of cutter", None, 4),
+        Input("repeat", "No. of repetition of operation", None, 1.00),
+        Input("depth_of_cut", "Depth of cut", "mm/pass", 0.20),
+        Input("job_set_time", "Job Setting Time", "min", 5.00),
+        Input("tool_set_time", "Tool Setting Time", "min", 5.00),
+        Input("approach", "Approach", "mm", 10.00),
+        Input("overrun", "Overrun", "mm", 10.00),
+        Input("tool_cost", "Tool Cost", "Rs", 10.00),
+    )
+    split = 6
+
+    length: float
+    thickness: float
+
+    def time(self):
+        turn = (self.thickness) / (self.depth_of_cut)
+        return (self.approach + self.overrun + (self.length)) / self.table_feed() * (turn * (self.repeat)) + self.setup_time()
+
+
+# --- Other processes ---
+
+class ExtraProcessType(NamedTuple):
+    name: str
+    default_time: float
+    default_cost: float
+
+
+EXTRA_PROCESS_TYPES = {t.name: t for t in (
+    ExtraProcessType("Custom", 5.00, 100.00),
+    ExtraProcessType("Blanking", 15.00, 50.00),
+    ExtraProcessType("Chamfering", 5.00, 10.00),
+    ExtraProcessType("Parting", 20.00, 50.00),
+    ExtraProcessType("Resharpening", 35.00, 50.00),
+    ExtraProcessType("Tool Change", 35.00, 50.00),
+)}
+
+
+@dataclass(frozen=True, slots=True)
+class ExtraProcess:
+    """A process with a fixed, user supplied time (plus a flat overhead) and tool cost."""
+
+    type: str
+    time_min: float = 0.0
+    extra_tool_cost: float = 0.0
+    custom_name: str | None = None
+
+    @classmethod
+    def from_entry(cls, entry):
+        return cls(**{f.name: entry[f.name] for f in fields(cls) if f.name in entry})
+
+    def label(self, index):
+        if self.type == "Custom":
+            return f"Custom #{index}" if self.custom_name is None else self.custom_name
+        return self.type
+
+    def estimate(self):
+        return Estimate(self.time_min + EXTRA_PROCESS_OVERHEAD_MIN, self.extra_tool_cost)
+
+
+def operation_from_entry(entry):
+    try:
+        cls = PROCESSES[entry["type"]]
+    except KeyError:
+        raise ValueError(f"Unknown process type: {entry['type']!r}") from None
+    return cls.from_entry(entry)
+
+
+def estimate_operation(entry, labor_cost_per_hour):
+    return operation_from_entry(entry).estimate(labor_cost_per_hour)
+
+
+class OperationTime(NamedTuple):
+    """One row of a ``*_times`` list as kept in the session; a tuple is far smaller than the row dict."""
+
+    label: str
+    index: int
+    time: float
+    cost: float
+
+
+# The key naming the process in the row dicts of each ``*_times`` list.
+TIME_LABEL_KEYS = {**{machine.times_key: "process" for machine in MACHINES}, "extra_times": "ptype"}
+
+
+def compact_times(state):
+    """Copy of ``state`` (e.g. ``asdict(JobEstimate)``) with its ``*_times`` rows as ``OperationTime`` records."""
+    state = dict(state)
+    for key, label in TIME_LABEL_KEYS.items():
+        if key in state:
+            state[key] = [
+                t if isinstance(t, OperationTime) else OperationTime(t[label], t["index"], t["time"], t["cost"])
+                for t in state[key]
+            ]
+    return state
+
+
+def expand_times(state):
+    """The inverse of ``compact_times``: ``*_times`` rows back as dicts, for JSON and the PDF."""
+    state = dict(state)
+    for key, label in TIME_LABEL_KEYS.items():
+        if key in state:
+            state[key] = [
+                {label: t.label, "index": t.index, "time": t.time, "cost": t.cost} if isinstance(t, OperationTime) else t
+                for t in state[key]
+            ]
+    return state
+
+
+@dataclass
+class JobEstimate:
+    """Totals and per-operation breakdown, named like the Result page's session state."""
+
+    total_time_min: float = 0.0
+    total_extra_cost: float = 0.0
+    material_cost: float = 0.0
+    tool_cost: float = 0.0
+    labor_cost: float = 0.0
+    total_cost: float = 0.0
+    machining1_times: list = field(default_factory=list)
+    machining2_times: list = field(default_factory=list)
+    extra_times: list = field(default_factory=list)
+
+
+def estimate_job(lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour, timings=None):
+    """Price a whole route.
+
+    If ``timings`` is a dict, the seconds spent on each process type are added to it.
+    """
+    result = JobEstimate(material_cost=material_cost)
+    total_time_min = 0.0
+    total_extra_cost = 0.0
+    total_tool_cost = 0.0
+
+    for machine, entries in zip(MACHINES, (lathe_entries, milling_entries)):
+        times = getattr(result, machine.times_key)
+        for i, entry in enumerate(entries):
+            if timings is not None:
+                start = perf_counter()
+            time, cost = estimate_operation(entry, labor_cost_per_hour)
+            if timings is not None:
+                timings[entry["type"]] = timings.get(entry["type"], 0.0) + perf_counter() - start
+            total_time_min += time
+            total_tool_cost += entry.get("tool cost", 0)
+            times.append({"process": entry["type"], "index": i + 1, "time": time, "cost": cost})
+
+    for i, entry in enumerate(extra_entries):
+        extra = ExtraProcess.from_entry(entry)
+        time, cost = extra.estimate()
+        total_time_min += time
+        total_extra_cost += cost
+        result.extra_times.append({"ptype": extra.label(i + 1), "index": i + 1, "time": time, "cost": cost})
+
+    result.total_time_min = total_time_min
+    result.total_extra_cost = total_extra_cost
+    result.tool_cost = total_tool_cost
+    result.labor_cost = (total_time_min / 60) * labor_cost_per_hour
+    result.total_cost = material_cost + result.labor_cost + total_extra_cost + total_tool_cost
+    return result
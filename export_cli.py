@@ -0,0 +1,162 @@
+"""Bulk route sheet export: one PDF per job, as a ZIP or one combined PDF.
+
+    python export_cli.py quotes.jsonl -o route_sheets.zip --workers 8
+    python export_cli.py quotes.csv -o month_end.pdf --detail
+
+Jobs are read the same way as by ``estimate_cli.py`` (CSV or JSONL). Each job
+is estimated and rendered with ``report.build_pdf`` in a worker process, with
+only a fixed number of jobs in flight at once.
+
+For a ``.zip`` output every route sheet is added to the archive as soon as
+it is ready. For a ``.pdf`` output the route sheets are spooled to a
+temporary directory and then merged in input order. The merged file starts
+with a table of contents and has a bookmark per job. Merging needs ``pypdf``.
+
+Machining entries take the card defaults for inputs they leave out
+(``estimate_cli.complete_job``). A job that cannot be read or estimated is
+left out of the export and reported on stderr; the other jobs are exported.
+"""
+
+import argparse
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict
+
+from estimate_cli import ESTIMATE_ERRORS, JobError, _file_format, complete_job, read_csv_jobs, read_jsonl_jobs
+from estimator import MACHINES, estimate_job
+from report import SUBMITTED_ENTRIES, build_pdf, build_toc, result_state, submitted_entries
+
+
+def job_state(job):
+    """``report.result_state`` snapshot for a job dict, as if it had been submitted on the Machining page."""
+    job = complete_job(job)
+    result = estimate_job(
+        *(job.get(machine.entries_key, []) for machine in MACHINES), job.get("extra_entries", []),
+        job.get("material_cost", 0.0), job.get("labor_cost_per_hour", 0.0),
+    )
+    return result_state({"job_material": "", **job, **asdict(result), SUBMITTED_ENTRIES: submitted_entries(job)})
+
+
+def render_job(n, job, detail):
+    """Worker entry point: ``(n, job_id, pdf_bytes, error)`` for the ``n``-th job; the bytes are None on error."""
+    job_id = job.job_id if isinstance(job, JobError) else job.get("job_id")
+    try:
+        return n, job_id, build_pdf(job_state(job), detail), None
+    except ESTIMATE_ERRORS as e:
+        return n, job_id, None, str(e)
+
+
+def pdf_name(n, job_id):
+    safe = re.sub(r"[^\w.-]+", "_", str(job_id)).strip("_") or "job"
+    return f"{n + 1:04d}_{safe}.pdf"
+
+
+def render_all(jobs, workers, detail=False, max_in_flight=None, failed=None):
+    """Yield ``(n, job_id, pdf_bytes)`` for every job as soon as it is rendered.
+
+    Jobs that cannot be rendered are skipped; ``(n, job_id, error)`` is appended to ``failed`` if given.
+    """
+    max_in_flight = max_in_flight or workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for n, job in enumerate(jobs):
+            pending.add(pool.submit(render_job, n, job, detail))
+            if len(pending) >= max_in_flight:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from _rendered(finished, failed)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from _rendered(finished, failed)
+
+
+def _rendered(futures, failed):
+    for future in futures:
+        n, job_id, data, error = future.result()
+        if error is None:
+            yield n, job_id, data
+        elif failed is not None:
+            failed.append((n, job_id, error))
+
+
+def write_zip(path, rendered):
+    n = 0
+    # fpdf already compresses the page streams.
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for index, job_id, data in rendered:
+            archive.writestr(pdf_name(index, job_id), data)
+            n += 1
+    return n
+
+
+def write_combined(path, rendered):
+    from pypdf import PdfReader, PdfWriter
+
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path))) as spool:
+        parts = {}
+        for index, job_id, data in rendered:
+            part = os.path.join(spool, pdf_name(index, job_id))
+            with open(part, "wb") as f:
+                f.write(data)
+            parts[index] = (job_id, part)
+
+        ordered = [parts[index] for index in sorted(parts)]
+        page_counts = [len(PdfReader(part).pages) for _, part in ordered]
+        entries = [(f"Job {job_id}", pages) for (job_id, _), pages in zip(ordered, page_counts)]
+
+        # The contents pages shift every job's first page, so repeat until their count settles.
+        toc_pages = 1
+        while True:
+            toc, pages = build_toc(entries, first_page=toc_pages + 1)
+            if pages == toc_pages:
+                break
+            toc_pages = pages
+
+        writer = PdfWriter()
+        writer.append(PdfReader(io.BytesIO(toc)))
+        for (title, _), (_, part) in zip(entries, ordered):
+            writer.append(part, outline_item=title)
+        with open(path, "wb") as f:
+            writer.write(f)
+    return len(ordered)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render route sheet PDFs for many jobs.")
+    parser.add_argument("input", help="CSV or JSONL job file, '-' for stdin")
+    parser.add_argument("-o", "--output", required=True, help="a .zip of route sheets or one combined .pdf")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--output-format", choices=["zip", "pdf"])
+    parser.add_argument("--detail", action="store_true", help="include every operation's parameters")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    in_format = _file_format(args.input, args.input_format)
+    out_format = args.output_format or ("pdf" if args.output.lower().endswith(".pdf") else "zip")
+
+    fin = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    try:
+        jobs = read_csv_jobs(fin) if in_format == "csv" else read_jsonl_jobs(fin)
+        failed = []
+        rendered = render_all(jobs, args.workers, args.detail, failed=failed)
+        start = time.perf_counter()
+        write = write_combined if out_format == "pdf" else write_zip
+        n = write(args.output, rendered)
+        elapsed = time.perf_counter() - start
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+
+    rate = n / elapsed if elapsed else float("inf")
+    print(f"{n} route sheets in {elapsed:.2f} s ({rate:.1f} jobs/sec)", file=sys.stderr)
+    for index, job_id, error in sorted(failed):
+        print(f"skipped job {job_id} (#{index + 1}): {error}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Running route totals, updated one operation at a time.
+
+Each operation is held as its typed record (the slotted process dataclass,
+or ``ExtraProcess``), which doubles as the key its time is memoized under.
+The route totals are adjusted by the difference (subtract old, add new)
+whenever a single card changes, so showing live totals does not recompute
+the route.
+Labor cost is derived from the total time on read, which means a change to
+the hourly rate needs no recomputation either. "✅ Submit All" still prices
+the whole route with ``estimator.estimate_job``.
+"""
+
+from functools import lru_cache
+
+from estimator import MACHINES, ExtraProcess, operation_from_entry
+
+MACHINING_LISTS = tuple(machine.entries_key for machine in MACHINES)
+EXTRA_LIST = "extra_entries"
+
+
+def operation_record(list_name, entry):
+    """The typed, hashable record of an entry; the operation id is not part of it."""
+    if list_name == EXTRA_LIST:
+        return ExtraProcess.from_entry(entry)
+    return operation_from_entry(entry)
+
+
+@lru_cache(maxsize=4096)
+def operation_time(record):
+    """Minutes for a machining operation record."""
+    return record.estimate(0.0).time
+
+
+class LiveTotals:
+    def __init__(self):
+        # Per list, one (record, time, tool cost, extra cost) contribution per operation id.
+        self.contributions = {name: {} for name in (*MACHINING_LISTS, EXTRA_LIST)}
+        self.total_time_min = 0.0
+        self.tool_cost = 0.0
+        self.total_extra_cost = 0.0
+        self.material_cost = 0.0
+        self.labor_cost_per_hour = 0.0
+
+    @property
+    def labor_cost(self):
+        return (self.total_time_min / 60) * self.labor_cost_per_hour
+
+    @property
+    def total_cost(self):
+        return self.material_cost + self.labor_cost + self.total_extra_cost + self.tool_cost
+
+    def _apply(self, contribution, sign):
+        _, time, tool_cost, extra_cost = contribution
+        self.total_time_min += sign * time
+        self.tool_cost += sign * tool_cost
+        self.total_extra_cost += sign * extra_cost
+
+    def _contribution(self, list_name, record):
+        if list_name == EXTRA_LIST:
+            time, extra_cost = record.estimate()
+            return record, time, 0, extra_cost
+        return record, operation_time(record), record.tool_cost, 0
+
+    def set_operation(self, list_name, op_id, entry):
+        """Record the current values of an operation; a no-op if they did not change."""
+        record = operation_record(list_name, entry)
+        slots = self.contributions[list_name]
+        old = slots.get(op_id)
+        if old is not None:
+            if old[0] == record:
+                return
+            self._apply(old, -1)
+        slots[op_id] = self._contribution(list_name, record)
+        self._apply(slots[op_id], +1)
+
+    def remove_operation(self, list_name, op_id):
+        old = self.contributions[list_name].pop(op_id, None)
+        if old is not None:
+            self._apply(old, -1)
+        if not any(self.contributions.values()):
+            # Drop any rounding residue left by the running sums.
+            self.total_time_min = self.tool_cost = self.total_extra_cost = 0.0
@@ -0,0 +1,51 @@
+"""Quantity price breaks and the per-part cost curve on the Result page.
+
+The quantities typed here are kept in ``st.session_state.lot_quantities``,
+which is part of the ``report.result_state`` snapshot, so the PDF shows the
+same price breaks.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from lotsize import PRICE_BREAKS, cost_curve, lot_split, parse_quantities, price_breaks
+from report import result_state
+
+LOT_SIZES_WIDGET = "lot_quantities_input"
+
+
+def lot_size_panel(split=None):
+    """Price breaks of ``split`` (the submitted result's lot split when None)."""
+    st.subheader("📦 Quantity Price Breaks")
+    if not st.session_state.get("lot_quantities"):
+        st.session_state.lot_quantities = list(PRICE_BREAKS)
+    if LOT_SIZES_WIDGET not in st.session_state:
+        st.session_state[LOT_SIZES_WIDGET] = ", ".join(f"{q}" for q in st.session_state.lot_quantities)
+    text = st.text_input("Lot sizes", key=LOT_SIZES_WIDGET)
+    try:
+        st.session_state.lot_quantities = parse_quantities(text)
+    except ValueError:
+        st.error("Enter lot sizes as whole numbers of at least 1, separated by commas.")
+
+    if split is None:
+        split = lot_split(result_state(st.session_state))
+    st.caption(f"Setup {split.setup_min:.2f} min per lot · cycle {split.cycle_min:.2f} min per part")
+    st.dataframe(price_breaks(split, st.session_state.lot_quantities), hide_index=True, column_config={
+        "Time / Part (min)": st.column_config.NumberColumn(format="%.2f"),
+        "Cost / Part (Rs.)": st.column_config.NumberColumn(format="%.2f"),
+        "Lot Time (hr)": st.column_config.NumberColumn(format="%.2f"),
+        "Lot Cost (Rs.)": st.column_config.NumberColumn(format="%.2f"),
+    })
+
+    quantities, costs = cost_curve(split, st.session_state.lot_quantities[-1])
+    st.vega_lite_chart(
+        pd.DataFrame({"Lot Size": quantities, "Cost / Part (Rs.)": costs}),
+        {
+            "mark": {"type": "line", "point": False},
+            "encoding": {
+                "x": {"field": "Lot Size", "type": "quantitative", "scale": {"type": "log"}},
+                "y": {"field": "Cost / Part (Rs.)", "type": "quantitative", "scale": {"zero": False}},
+                "tooltip": [{"field": "Lot Size"}, {"field": "Cost / Part (Rs.)", "format": ".2f"}],
+            },
+        },
+    )
@@ -0,0 +1,85 @@
+"""Lot-size costing: setup spread over the batch, and quantity price breaks.
+
+Every machining operation's time includes its ``job set time`` and ``tool
+set time``. For a lot, those are spent once and the rest of the time (the
+cycle time) once per part. Extra processes, material, tool and extra process
+costs stay per part. So for a lot of ``q`` parts::
+
+    time per part = cycle + setup / q
+    cost per part = part cost + time per part * labor_cost_per_hour / 60
+
+The split is derived from a ``report.result_state`` snapshot, so the Result
+page and the PDF work from the same values. Price breaks and cost curves are
+evaluated over an array of quantities in one pass.
+
+This module does not import Streamlit.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from estimator import MACHINES
+
+PRICE_BREAKS = (1, 10, 100, 1_000, 10_000)
+CURVE_POINTS = 200
+
+
+class LotSplit(NamedTuple):
+    setup_min: float
+    cycle_min: float
+    # Material, tool and extra process cost of one part.
+    part_cost: float
+    labor_cost_per_hour: float
+
+    def per_part(self, quantities):
+        """Time (min) and cost (Rs.) per part for each lot size in ``quantities``."""
+        quantities = np.asarray(quantities, dtype=float)
+        time = self.cycle_min + self.setup_min / quantities
+        return time, self.part_cost + time * (self.labor_cost_per_hour / 60)
+
+
+def lot_split(state):
+    """Setup and cycle time of a submitted estimate (``report.result_state`` snapshot)."""
+    setup = 0.0
+    for machine in MACHINES:
+        for entry, t in zip(state[machine.entries_key], state[machine.times_key]):
+            # Operations that failed to estimate have a time of 0, setup included.
+            if t["time"] > 0:
+                setup += entry.get("job set time", 0.0) + entry.get("tool set time", 0.0)
+    return LotSplit(
+        setup_min=setup,
+        cycle_min=state["total_time_min"] - setup,
+        part_cost=state["total_cost"] - state["labor_cost"],
+        labor_cost_per_hour=state.get("labor_cost_per_hour") or 0.0,
+    )
+
+
+def parse_quantities(text):
+    """Lot sizes from text like ``"1, 10, 100"``, sorted and de-duplicated; raises ValueError."""
+    quantities = sorted({int(part.replace("_", "")) for part in text.replace(",", " ").split()})
+    if not quantities or quantities[0] < 1:
+        raise ValueError("Quantities must be whole numbers of at least 1")
+    return quantities
+
+
+def price_breaks(split, quantities=PRICE_BREAKS):
+    """One row per lot size: time and cost per part, and for the whole lot."""
+    quantities = np.asarray(quantities, dtype=float)
+    time, cost = split.per_part(quantities)
+    return [
+        {
+            "Quantity": int(q),
+            "Time / Part (min)": t,
+            "Cost / Part (Rs.)": c,
+            "Lot Time (hr)": q * t / 60,
+            "Lot Cost (Rs.)": q * c,
+        }
+        for q, t, c in zip(quantities.tolist(), time.tolist(), cost.tolist())
+    ]
+
+
+def cost_curve(split, max_quantity, points=CURVE_POINTS):
+    """Lot sizes from 1 to ``max_quantity`` (log spaced) and the cost per part at each."""
+    quantities = np.unique(np.geomspace(1, max(max_quantity, 1), points).round())
+    return quantities, split.per_part(quantities)[1]
@@ -0,0 +1,129 @@
+"""Monte Carlo bands on a route's total time and cost.
+
+Entered values are nominal. On the shop floor, setting times run over,
+spindles run under their nominal speed, and the overhead of an extra
+process is rarely exactly ``EXTRA_PROCESS_OVERHEAD_MIN``. Each varied input
+has a ``Spread``, a distribution of the factor applied to its entered value.
+Every operation draws its own factors.
+
+The route is evaluated with the ``batch_estimator.py`` kernels, with samples
+along a second axis. A column is ``(n_ops, block)`` when it is varied and
+``(n_ops, 1)`` otherwise. Samples are drawn in blocks of ``BLOCK`` so memory
+stays bounded however many are requested. A fixed seed makes the bands of a
+quote reproducible.
+
+This module does not import Streamlit.
+"""
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+from batch_estimator import KERNELS, estimate_route, process_columns, process_times
+from estimator import EXTRA_PROCESS_OVERHEAD_MIN, PROCESSES, ExtraProcess
+
+SAMPLES = 100_000
+BLOCK = 25_000
+SEED = 0
+PERCENTILES = (50, 90)
+EXTRA_OVERHEAD = "extra_overhead"
+
+
+class Spread(NamedTuple):
+    """Distribution of the factor on an entered value.
+
+    ``triangular`` and ``uniform`` range from ``low`` to ``high`` (the
+    triangle peaks at 1, or at the nearer end when 1 is outside the range).
+    ``normal`` is centred between them, with ``low`` and ``high`` two
+    standard deviations out, and is clipped at 0. With ``low == high`` every
+    kind is the constant factor ``low``.
+    """
+
+    kind: str
+    low: float
+    high: float
+
+    def sample(self, rng, shape):
+        if self.kind not in SPREAD_KINDS:
+            raise ValueError(f"Unknown distribution: {self.kind!r}")
+        if self.low == self.high:
+            return np.full(shape, float(self.low))
+        if self.kind == "triangular":
+            return rng.triangular(self.low, min(max(1.0, self.low), self.high), self.high, shape)
+        if self.kind == "uniform":
+            return rng.uniform(self.low, self.high, shape)
+        mean, sd = (self.low + self.high) / 2, (self.high - self.low) / 4
+        return np.maximum(rng.normal(mean, sd, shape), 0.0)
+
+
+SPREAD_KINDS = ("triangular", "uniform", "normal")
+SPREAD_LABELS = {
+    "job_set_time": "Job Setting Time",
+    "tool_set_time": "Tool Setting Time",
+    "rpm": "Actual RPM",
+    EXTRA_OVERHEAD: "Extra Process Overhead",
+}
+DEFAULT_SPREADS = {
+    "job_set_time": Spread("triangular", 0.8, 1.5),
+    "tool_set_time": Spread("triangular", 0.8, 1.5),
+    "rpm": Spread("normal", 0.9, 1.02),
+    EXTRA_OVERHEAD: Spread("triangular", 0.8, 2.0),
+}
+
+
+@dataclass
+class RouteBands:
+    """Sampled route totals (minutes and Rs.), one value per sample."""
+
+    time: np.ndarray
+    cost: np.ndarray
+
+    def summary(self, percentiles=PERCENTILES):
+        """Plain dict with the sample count and ``time_p50``, ``cost_p90``, ... for the Result page and PDF."""
+        out = {"samples": len(self.time)}
+        for name, values in (("time", self.time), ("cost", self.cost)):
+            for p, v in zip(percentiles, np.percentile(values, percentiles)):
+                out[f"{name}_p{p}"] = float(v)
+        return out
+
+
+def simulate_route(lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour,
+                   spreads=None, samples=SAMPLES, seed=SEED, block=BLOCK):
+    """Sample the route's total time and cost ``samples`` times.
+
+    ``spreads`` maps input names (and ``EXTRA_OVERHEAD``) to a ``Spread``;
+    inputs without one keep their entered value. Entries must hold every
+    input of their process.
+    """
+    spreads = DEFAULT_SPREADS if spreads is None else spreads
+    rng = np.random.default_rng(seed)
+    base = estimate_route(lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour)
+    fixed_cost = material_cost + base.tool_cost + base.total_extra_cost
+
+    groups, fixed_time = {}, 0.0
+    for entry in (*lathe_entries, *milling_entries):
+        if entry["type"] in KERNELS:
+            groups.setdefault(entry["type"], []).append(entry)
+        else:
+            fixed_time += PROCESSES[entry["type"]].from_entry(entry).estimate(0.0).time
+    columns = {ptype: process_columns(ptype, rows) for ptype, rows in groups.items()}
+    extra_time = np.array([ExtraProcess.from_entry(entry).time_min for entry in extra_entries], dtype=float)
+    overhead = spreads.get(EXTRA_OVERHEAD)
+
+    time = np.empty(samples)
+    for start in range(0, samples, block):
+        size = min(block, samples - start)
+        total = np.full(size, fixed_time)
+        for ptype, cols in columns.items():
+            n = len(groups[ptype])
+            drawn = {}
+            for name, col in cols.items():
+                col = col.reshape(n, 1)
+                drawn[name] = col * spreads[name].sample(rng, (n, size)) if name in spreads else col
+            total += process_times(ptype, drawn).sum(axis=0)
+        if len(extra_time):
+            factors = overhead.sample(rng, (len(extra_time), size)) if overhead else 1.0
+            total += (extra_time[:, None] + EXTRA_PROCESS_OVERHEAD_MIN * factors).sum(axis=0)
+        time[start:start + size] = total
+    return RouteBands(time, fixed_cost + (time / 60) * labor_cost_per_hour)
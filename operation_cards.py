@@ -0,0 +1,211 @@
+"""Input cards for the Machining page.
+
+Each operation card runs as its own ``st.fragment``, so editing a value only
+reruns that card instead of the whole script. Adding or removing an operation
+changes the page layout, so those buttons still trigger a full ``st.rerun()``.
+
+Every entry gets a persistent ``"id"`` when it is created and all widget keys
+are built from it, so removing an operation leaves the widget state of the
+other operations untouched.
+
+The cards are rendered from the process registry in ``estimator.py``. New
+machining operations start from the cutting data for the selected job
+material (see ``cutting_data.py``), and each card can reapply it after its
+diameter changes.
+
+Whole route sheets can also be imported from CSV or Excel
+(``route_import.py``). All rows are added in one callback, so the page
+reruns once.
+"""
+
+import uuid
+
+import streamlit as st
+
+import profiling
+from cutting_data import CuttingDataDB
+from estimator import EXTRA_PROCESS_TYPES, MACHINES, PROCESSES, processes_for
+from route_import import import_route
+
+EXTRA_ENTRIES = "extra_entries"
+
+
+def new_operation_id():
+    return uuid.uuid4().hex[:12]
+
+
+@st.cache_resource
+def cutting_data():
+    # One database per server, shared by all sessions.
+    return CuttingDataDB.from_env()
+
+
+def _widget_key(field, op_id):
+    return f"{field.name}_{op_id}"
+
+
+def _apply_cutting_data(entry):
+    """Button callback: overwrite a card's inputs with the cutting data for its current diameter."""
+    op_id = entry["id"]
+    cls = PROCESSES[entry["type"]]
+    current = {field.name: st.session_state.get(_widget_key(field, op_id), field.default) for field in cls.inputs}
+    found = cutting_data().prefill(st.session_state.get("job_material"), entry["type"], current)
+    if not found:
+        st.toast(f"No cutting data for {entry['type']} in {st.session_state.get('job_material')}")
+    for name, value in found.items():
+        st.session_state[f"{name}_{op_id}"] = value
+
+
+def _import_route_sheet():
+    """Button callback: add every valid row of the uploaded route sheet in one go."""
+    upload = st.session_state.get("route_import_file")
+    if upload is None:
+        return
+    upload.seek(0)
+    result = import_route(upload, upload.name)
+    totals = st.session_state.live_totals
+    # Replace starts the whole route over, unless no row of the sheet was valid.
+    if st.session_state.route_import_mode == "Replace" and result.operations:
+        for list_name in result.entries:
+            for entry in st.session_state[list_name]:
+                totals.remove_operation(list_name, entry.get("id"))
+            st.session_state[list_name] = []
+    for list_name, entries in result.entries.items():
+        for entry in entries:
+            entry["id"] = new_operation_id()
+            totals.set_operation(list_name, entry["id"], entry)
+        st.session_state[list_name].extend(entries)
+    st.session_state.route_import_report = result
+
+
+def import_route_controls():
+    with st.expander("📥 Import Route Sheet (CSV / Excel)"):
+        st.caption(
+            "One operation per row: a `machine` column (lathe, milling or other), a `type` column "
+            "and the card inputs by name or label. Empty cells take the card default."
+        )
+        upload = st.file_uploader("Route sheet", type=["csv", "xlsx"], key="route_import_file")
+        st.radio(
+            "Imported operations", ["Append", "Replace"], horizontal=True, key="route_import_mode",
+            help="Replace removes every lathe, milling and other operation before adding the sheet's rows.",
+        )
+        st.button("Import", on_click=_import_route_sheet, disabled=upload is None)
+
+        report = st.session_state.get("route_import_report")
+        if report is not None:
+            st.success(f"Imported {report.operations} of {report.rows} rows")
+            if report.errors:
+                st.error(f"{len(report.errors)} problems; those rows were skipped")
+                st.dataframe([error._asdict() for error in report.errors], hide_index=True)
+
+
+def remove_operation(list_name, op_id):
+    entries = st.session_state[list_name]
+    for k, entry in enumerate(entries):
+        if entry["id"] == op_id:
+            del entries[k]
+            break
+    st.session_state.live_totals.remove_operation(list_name, op_id)
+
+
+def _add_control(title, options, list_name, select_label, button_label):
+    st.subheader(title)
+    selected = st.selectbox(select_label, options, key=f"{list_name}_select")
+    if st.button(button_label):
+        entry = {"id": new_operation_id(), "type": selected}
+        if list_name != EXTRA_ENTRIES:
+            found = cutting_data().prefill(st.session_state.get("job_material"), selected)
+            entry.update({name.replace("_", " "): value for name, value in found.items()})
+        st.session_state[list_name].append(entry)
+        st.rerun()
+
+
+@st.fragment
+def add_operation_controls():
+    # Step 1: Process selection + Add button
+    for machine, col in zip(MACHINES, st.columns(len(MACHINES))):
+        with col:
+            _add_control(
+                f"⚙️ {machine.name} Machine", list(processes_for(machine.name)), machine.entries_key,
+                "Select a Process", f"Add {machine.name.lower()} operation",
+            )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        _add_control(
+            "➕ Other Processes", list(EXTRA_PROCESS_TYPES), EXTRA_ENTRIES,
+            "Select Other Process", "Add Other operation",
+        )
+
+
+@st.fragment
+def operation_card(list_name, i, entry):
+    with profiling.phase("card", process=entry["type"]):
+        _operation_card(list_name, i, entry)
+
+
+def _operation_card(list_name, i, entry):
+    op_id = entry.setdefault("id", new_operation_id())
+    ptype = entry["type"]
+    cls = PROCESSES[ptype]
+    st.markdown(f"### 🔧 {ptype} #{i+1}")
+
+    col1, col2 = st.columns(2)
+    values = {}
+    for k, field in enumerate(cls.inputs):
+        key = _widget_key(field, op_id)
+        if key not in st.session_state:
+            # Seed the widget from the entry (prefilled or restored values) instead of passing value=.
+            st.session_state[key] = field.coerce(entry.get(field.key, field.default))
+        with col1 if k < cls.split else col2:
+            values[field.key] = st.number_input(field.widget_label, key=key, step=1 if isinstance(field.default, int) else 0.01)
+    entry.update(values)
+
+    st.session_state.live_totals.set_operation(list_name, op_id, entry)
+
+    st.button("📚 Use cutting data", key=f"cutting_data_{op_id}", on_click=_apply_cutting_data, args=(entry,))
+    if st.button(f"❌ Remove", key=f"remove_{op_id}"):
+        remove_operation(list_name, op_id)
+        st.rerun()  # Refresh the UI immediately
+
+
+@st.fragment
+def extra_card(i, entry):
+    with profiling.phase("card", process=entry["type"]):
+        _extra_card(i, entry)
+
+
+def _extra_card(i, entry):
+    op_id = entry.setdefault("id", new_operation_id())
+    ptype = entry["type"]
+    spec = EXTRA_PROCESS_TYPES[ptype]
+    st.markdown(f"### {ptype} #{i+1}")
+
+    # Seed the widgets from the entry (imported or restored values) instead of passing value=.
+    seeds = {
+        f"custom_name_{op_id}": entry.get("custom_name") or f"Custom #{i+1}",
+        f"time_min_{op_id}": float(entry.get("time_min", spec.default_time)),
+        f"extra_tool_cost_{op_id}": float(entry.get("extra_tool_cost", spec.default_cost)),
+    }
+    for key, value in seeds.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
+    col1, col2 = st.columns(2)
+    if ptype == "Custom":
+        with col1:
+            entry["custom_name"] = st.text_input(f"Enter Custom Process Name", key=f"custom_name_{op_id}")
+        time_col = cost_col = col2
+    else:
+        time_col, cost_col = col1, col2
+    with time_col:
+        time = st.number_input(f"Time Taken (min)", key=f"time_min_{op_id}")
+    with cost_col:
+        cost_hr = st.number_input(f"Extra Tool Cost (Rs.)", key=f"extra_tool_cost_{op_id}")
+    entry.update({"time_min": time, "extra_tool_cost": cost_hr})
+
+    st.session_state.live_totals.set_operation(EXTRA_ENTRIES, op_id, entry)
+
+    if st.button(f"❌ Remove!", key=f"remove_{op_id}"):
+        remove_operation(EXTRA_ENTRIES, op_id)
+        st.rerun()
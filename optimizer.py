@@ -0,0 +1,205 @@
+"""Feed and RPM that minimize the cost of every operation of a route.
+
+An operation's cost is its time at the labor rate plus tool wear. The cutting
+time (the estimate less job and tool setting time) comes from the kernels in
+``batch_estimator.py``. Tool life comes from the extended Taylor equation of
+the job material (``cutting_data.ToolLife``) at the cutting speed
+``pi * D * rpm / 1000``, D being the process's ``diameter_input``. Cutting
+for ``cut`` minutes wears out ``cut / life`` tools, each costing the entry's
+``tool cost`` and ``tool_change_min`` of labor::
+
+    time = setting + cut + (cut / life) * tool_change_min
+    cost = time * labor_cost_per_hour / 60 + (cut / life) * tool cost
+
+Feed and RPM are searched on a log grid for all operations of a process
+type at once, then on finer grids around each best point. The search stays
+within the machine limits, and the feed stays below ``max_feed_factor`` times
+the entry's own feed, since surface finish and chip load are not modelled.
+Processes without a diameter (Knurling, Threading, Blanking) keep their
+values; for threading the feed is the pitch.
+
+The original route is costed with the same model, so the savings compare
+like with like. The Result page's flat tool cost is not used here.
+
+This module does not import Streamlit.
+"""
+
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+import numpy as np
+
+from batch_estimator import KERNELS, estimate_route, process_columns, process_times
+from estimator import LATHE, MACHINES, MILLING, PROCESSES
+
+MAX_FEED_FACTOR = 1.5
+GRID = 48
+ROUNDS = 3
+FEED_DECIMALS = 3
+
+
+class MachineLimits(NamedTuple):
+    rpm_min: float
+    rpm_max: float
+    # mm/rev on the lathe, mm/tooth on the milling machine.
+    feed_min: float
+    feed_max: float
+
+
+MACHINE_LIMITS = {
+    LATHE: MachineLimits(50, 2500, 0.02, 0.5),
+    MILLING: MachineLimits(50, 4000, 0.01, 0.3),
+}
+
+
+class Economics(NamedTuple):
+    feed: float
+    rpm: float
+    time: float
+    cost: float
+    # Tools worn out by the operation (cutting time / tool life).
+    tools: float
+
+
+class OperationPlan(NamedTuple):
+    machine: str
+    index: int
+    process: str
+    before: Economics
+    after: Economics
+
+    @property
+    def optimized(self):
+        return (self.before.feed, self.before.rpm) != (self.after.feed, self.after.rpm)
+
+
+@dataclass
+class RouteOptimization:
+    """Operation plans in Result page order, the optimized entries and route totals before and after."""
+
+    operations: list = field(default_factory=list)
+    # Machine entries_key -> entries with the optimized feed and RPM.
+    entries: dict = field(default_factory=dict)
+    fixed_time: float = 0.0
+    fixed_cost: float = 0.0
+    labor_cost_per_hour: float = 0.0
+
+    def _total(self, side):
+        time = self.fixed_time + sum(getattr(op, side).time for op in self.operations)
+        cost = self.fixed_cost + self.fixed_time * self.labor_cost_per_hour / 60
+        return time, cost + sum(getattr(op, side).cost for op in self.operations)
+
+    @property
+    def before(self):
+        """Route (time, cost) with the original feeds and speeds."""
+        return self._total("before")
+
+    @property
+    def after(self):
+        return self._total("after")
+
+    @property
+    def savings(self):
+        return self.before[1] - self.after[1]
+
+
+def optimizable(ptype):
+    return ptype in KERNELS and PROCESSES[ptype].diameter_input is not None
+
+
+def operation_economics(ptype, columns, tool_cost, life, labor_cost_per_hour):
+    """Time, cost and tools worn for columns of one process type; the columns may broadcast."""
+    time = process_times(ptype, columns)
+    setting = columns["job_set_time"] + columns["tool_set_time"]
+    cut = np.maximum(time - setting, 0.0)
+    speed = np.pi * columns[PROCESSES[ptype].diameter_input] * columns["rpm"] / 1000
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        tools = np.where(cut > 0, cut / life.minutes(speed, columns["feed"]), 0.0)
+    time = time + tools * life.tool_change_min
+    return time, time * (labor_cost_per_hour / 60) + tools * tool_cost, tools
+
+
+def _search(ptype, columns, tool_cost, life, labor_cost_per_hour, limits, max_feed_factor, grid, rounds):
+    """Grid-searched (feed, rpm) per row, refining around the best cell each round."""
+    n = len(tool_cost)
+    base = {name: col.reshape(n, 1, 1) for name, col in columns.items()}
+    tool_cost = tool_cost.reshape(n, 1, 1)
+    feed_hi = np.full(n, limits.feed_max, float)
+    if max_feed_factor is not None:
+        feed_hi = np.clip(columns["feed"] * max_feed_factor, limits.feed_min, feed_hi)
+    feed_lo = np.full(n, limits.feed_min, float)
+    rpm_lo, rpm_hi = np.full(n, limits.rpm_min, float), np.full(n, limits.rpm_max, float)
+    rows = np.arange(n)
+    for _ in range(rounds):
+        feeds = np.geomspace(feed_lo, feed_hi, grid, axis=1)
+        rpms = np.geomspace(rpm_lo, rpm_hi, grid, axis=1)
+        trial = {**base, "feed": feeds[:, :, None], "rpm": rpms[:, None, :]}
+        _, cost, _ = operation_economics(ptype, trial, tool_cost, life, labor_cost_per_hour)
+        i, j = np.unravel_index(cost.reshape(n, -1).argmin(axis=1), (grid, grid))
+        feed_lo, feed_hi = feeds[rows, np.maximum(i - 1, 0)], feeds[rows, np.minimum(i + 1, grid - 1)]
+        rpm_lo, rpm_hi = rpms[rows, np.maximum(j - 1, 0)], rpms[rows, np.minimum(j + 1, grid - 1)]
+    return feeds[rows, i], rpms[rows, j]
+
+
+def _within(limits, feed, rpm):
+    return (limits.feed_min <= feed) & (feed <= limits.feed_max) & (limits.rpm_min <= rpm) & (rpm <= limits.rpm_max)
+
+
+def optimize_route(lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour, life,
+                   limits=MACHINE_LIMITS, max_feed_factor=MAX_FEED_FACTOR, grid=GRID, rounds=ROUNDS):
+    """Optimize feed and RPM of every machining operation for tool life constants ``life``.
+
+    Entries must hold every input of their process. ``max_feed_factor=None``
+    lets the feed go up to the machine limit. An original feed and RPM within
+    the machine limits is kept when it is already at least as cheap as the
+    search result, so no operation gets more expensive.
+    """
+    base = estimate_route(lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour)
+    result = RouteOptimization(
+        fixed_time=sum(t["time"] for t in base.extra_times),
+        fixed_cost=material_cost + base.total_extra_cost,
+        labor_cost_per_hour=labor_cost_per_hour,
+    )
+    for machine, entries in zip(MACHINES, (lathe_entries, milling_entries)):
+        plans = [None] * len(entries)
+        optimized = [dict(entry) for entry in entries]
+        groups = {}
+        for i, entry in enumerate(entries):
+            groups.setdefault(entry["type"], []).append(i)
+        for ptype, idx in groups.items():
+            cls = PROCESSES[ptype]
+            rows = [entries[i] for i in idx]
+            tool_cost = np.array([entry.get("tool cost", 0.0) for entry in rows], dtype=float)
+            if not optimizable(ptype):
+                # Unchanged, with the estimator's flat tool cost.
+                for k, i in enumerate(idx):
+                    time = cls.from_entry(entries[i]).estimate(0.0).time
+                    cost = time * labor_cost_per_hour / 60 + float(tool_cost[k])
+                    same = Economics(entries[i].get("feed", 0.0), entries[i].get("rpm", 0.0), time, cost, 0.0)
+                    plans[i] = OperationPlan(machine.name, i + 1, ptype, same, same)
+                continue
+
+            columns = process_columns(ptype, rows)
+            time0, cost0, tools0 = operation_economics(ptype, columns, tool_cost, life, labor_cost_per_hour)
+            feed, rpm = _search(
+                ptype, columns, tool_cost, life, labor_cost_per_hour, limits[cls.machine], max_feed_factor, grid, rounds,
+            )
+            # Values a card can hold: whole RPM, feed to FEED_DECIMALS.
+            feed = np.round(feed, FEED_DECIMALS)
+            rpm = np.round(rpm)
+            time1, cost1, tools1 = operation_economics(
+                ptype, {**columns, "feed": feed, "rpm": rpm}, tool_cost, life, labor_cost_per_hour,
+            )
+            keep = _within(limits[cls.machine], columns["feed"], columns["rpm"]) & (cost0 <= cost1)
+            for k, i in enumerate(idx):
+                before = Economics(float(columns["feed"][k]), float(columns["rpm"][k]), float(time0[k]), float(cost0[k]), float(tools0[k]))
+                if keep[k]:
+                    after = before
+                else:
+                    after = Economics(float(feed[k]), float(rpm[k]), float(time1[k]), float(cost1[k]), float(tools1[k]))
+                    inputs = {f.name: f for f in cls.inputs}
+                    optimized[i].update(feed=inputs["feed"].coerce(after.feed), rpm=inputs["rpm"].coerce(after.rpm))
+                plans[i] = OperationPlan(machine.name, i + 1, ptype, before, after)
+        result.operations += plans
+        result.entries[machine.entries_key] = optimized
+    return result
@@ -0,0 +1,91 @@
+"""Optimize page: cost-minimizing feed and RPM for the current route.
+
+Runs ``optimizer.optimize_route`` with the tool-life constants of the job
+material and shows the optimized route sheet next to the original. "Apply to
+route" writes the optimized feeds and speeds into the Machining page's cards.
+"""
+
+import streamlit as st
+
+from estimator import LATHE, MACHINES
+from operation_cards import cutting_data
+from optimizer import MACHINE_LIMITS, MAX_FEED_FACTOR, MachineLimits, optimize_route
+from sensitivity_page import session_route
+
+
+def _limits():
+    limits = {}
+    with st.expander("⚙️ Machine limits"):
+        for machine, col in zip(MACHINES, st.columns(len(MACHINES))):
+            default = MACHINE_LIMITS[machine.name]
+            unit = "mm/rev" if machine.name == LATHE else "mm/tooth"
+            with col:
+                st.markdown(f"**{machine.name}**")
+                rpm_max = st.number_input("Max RPM", value=float(default.rpm_max), step=50.0, key=f"limit_rpm_{machine.name}")
+                feed_min = st.number_input(f"Min Feed ({unit})", value=default.feed_min, step=0.01, key=f"limit_feed_min_{machine.name}")
+                feed_max = st.number_input(f"Max Feed ({unit})", value=default.feed_max, step=0.01, key=f"limit_feed_max_{machine.name}")
+            limits[machine.name] = MachineLimits(default.rpm_min, rpm_max, feed_min, feed_max)
+        factor = st.number_input(
+            "Max feed (× current feed)", value=MAX_FEED_FACTOR, min_value=1.0, step=0.1, key="limit_feed_factor",
+        )
+    return limits, factor
+
+
+def _apply(result):
+    """Button callback: copy the optimized feed and RPM into the route and its card widgets."""
+    totals = st.session_state.live_totals
+    for machine in MACHINES:
+        for entry, optimized in zip(st.session_state[machine.entries_key], result.entries[machine.entries_key]):
+            for name in ("feed", "rpm"):
+                if name in optimized:
+                    entry[name] = optimized[name]
+                    st.session_state[f"{name}_{entry['id']}"] = optimized[name]
+            totals.set_operation(machine.entries_key, entry["id"], entry)
+
+
+def optimizer_page():
+    st.header("🎯 Optimize Feeds & Speeds")
+    (lathe, milling), labels = session_route()
+    if not lathe and not milling:
+        st.info("Add machining operations on the **Machining** page first.")
+        return
+    job_inputs = st.session_state.get("job_inputs", {})
+    material = job_inputs.get("job_material")
+    life = cutting_data().tool_life(material)
+    if life is None:
+        st.warning(f"No tool-life data for job material **{material}**. Select a material on the Machining page.")
+        return
+    st.caption(
+        f"{material}: V·T^{life.taylor_n:g}·f^{life.feed_exponent:g} = {life.taylor_c:g}, "
+        f"{life.tool_change_min:g} min per tool change"
+    )
+
+    limits, factor = _limits()
+    rate = job_inputs.get("labor_cost_per_hour", 0.0)
+    result = optimize_route(
+        lathe, milling, st.session_state.get("extra_entries", []), job_inputs.get("material_cost", 0.0), rate, life,
+        limits=limits, max_feed_factor=factor,
+    )
+
+    (time0, cost0), (time1, cost1) = result.before, result.after
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Original Cost (Rs.)", f"{cost0:.2f}")
+    col2.metric("Optimized Cost (Rs.)", f"{cost1:.2f}", f"{cost1 - cost0:.2f}", delta_color="inverse")
+    col3.metric("Optimized Time (min)", f"{time1:.2f}", f"{time1 - time0:.2f}", delta_color="inverse")
+
+    st.dataframe([
+        {
+            "Operation": label,
+            "Feed": op.before.feed, "Feed*": op.after.feed,
+            "RPM": op.before.rpm, "RPM*": op.after.rpm,
+            "Time (min)": round(op.before.time, 2), "Time* (min)": round(op.after.time, 2),
+            "Cost (Rs.)": round(op.before.cost, 2), "Cost* (Rs.)": round(op.after.cost, 2),
+            "Tools worn*": round(op.after.tools, 4),
+        }
+        for label, op in zip(labels, result.operations)
+    ], hide_index=True)
+    st.caption("* optimized. Costs include tool wear from the tool-life model, so they differ from the Result page.")
+
+    if result.savings > 0:
+        st.success(f"💰 Saves Rs. {result.savings:.2f} per part ({result.savings / cost0:.1%})")
+    st.button("✅ Apply to route", on_click=_apply, args=(result,), key="apply_optimized", disabled=result.savings <= 0)
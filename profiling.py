@@ -0,0 +1,210 @@
+"""Opt-in timing of the phases of a rerun, for diagnosing slow sessions.
+
+Instrumentation is off unless the ``MACHINING_PROFILE=1`` environment variable
+is set or the page is opened with ``?profile=1``. When on, every ``phase()``
+adds one record (phase name, milliseconds and a few fields) to the session,
+shown by ``profiling_panel()``, and appends it as a JSON line to the log file
+named by ``MACHINING_PROFILE_LOG`` (default ``timings.jsonl``).
+
+``?cprofile=1`` runs cProfile over the next rerun of the page only. The
+parameter is removed once the rerun is captured.
+``MACHINING_CPROFILE=1`` profiles every rerun. Each capture is written as a
+``.prof`` file next to the log, and its top functions are shown in the panel.
+
+The panel also reports the session's memory: bytes per session-state key, as
+measured by ``deep_sizeof``, and per operation on the route.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import sys
+import time
+import types
+import uuid
+from collections import deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+ENABLED_ENV = "MACHINING_PROFILE"
+CPROFILE_ENV = "MACHINING_CPROFILE"
+LOG_ENV = "MACHINING_PROFILE_LOG"
+ACTIVE_KEY = "_profiling"
+RECORDS_KEY = "_profile_records"
+RUN_KEY = "_profile_run"
+STATS_KEY = "_profile_stats"
+MAX_RECORDS = 500
+
+_log = logging.getLogger("machining.timings")
+
+
+def _logger():
+    if not _log.handlers:
+        handler = logging.FileHandler(os.environ.get(LOG_ENV, "timings.jsonl"), encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _log.addHandler(handler)
+        _log.setLevel(logging.INFO)
+        _log.propagate = False
+    return _log
+
+
+def active():
+    return st.session_state.get(ACTIVE_KEY, False)
+
+
+def record(phase, seconds, **fields):
+    """Keep one timing record in the session and write it to the log."""
+    entry = {
+        "ts": time.time(), "session": st.session_state[RUN_KEY][0], "run": st.session_state[RUN_KEY][1],
+        "phase": phase, "ms": round(seconds * 1000, 3), **fields,
+    }
+    st.session_state[RECORDS_KEY].append(entry)
+    _logger().info(json.dumps(entry, default=str))
+
+
+@contextmanager
+def phase(name, **fields):
+    """Time the body as phase ``name``; does nothing unless instrumentation is on."""
+    if not active():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, **fields)
+
+
+def _cprofile_requested():
+    if os.environ.get(CPROFILE_ENV) == "1":
+        return True
+    if st.query_params.get("cprofile") == "1":
+        del st.query_params["cprofile"]
+        return True
+    return False
+
+
+def _save_profile(profiler):
+    stats = pstats.Stats(profiler)
+    log_dir = os.path.dirname(os.path.abspath(os.environ.get(LOG_ENV, "timings.jsonl")))
+    path = os.path.join(log_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}.prof")
+    stats.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+    st.session_state[STATS_KEY] = (path, out.getvalue())
+    return path
+
+
+@contextmanager
+def rerun(page):
+    """Wrap a full rerun of ``page``, timed as phase "page".
+
+    Turns instrumentation on or off for the session and runs cProfile if asked.
+    """
+    st.session_state[ACTIVE_KEY] = os.environ.get(ENABLED_ENV) == "1" or st.query_params.get("profile") == "1"
+    if not active():
+        yield
+        return
+    if RECORDS_KEY not in st.session_state:
+        st.session_state[RECORDS_KEY] = deque(maxlen=MAX_RECORDS)
+        st.session_state[RUN_KEY] = (uuid.uuid4().hex[:8], 0)
+    session_id, run = st.session_state[RUN_KEY]
+    st.session_state[RUN_KEY] = (session_id, run + 1)
+
+    profiler = cProfile.Profile() if _cprofile_requested() else None
+    if profiler is not None:
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another session is being profiled; only one profiler can run at a time.
+            profiler = None
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        record("page", time.perf_counter() - start, page=page)
+        if profiler is not None:
+            _save_profile(profiler)
+
+
+def deep_sizeof(obj, seen=None):
+    """Bytes taken by ``obj`` and every object it references, each counted once.
+
+    Objects whose ids are in ``seen`` are skipped and new ones are added, so
+    one ``seen`` set can be shared across calls. Classes, functions and
+    modules are not followed.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, (type, types.ModuleType, types.FunctionType, types.MethodType)):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o, 0)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset, deque)):
+            stack.extend(o)
+        else:
+            if hasattr(o, "__dict__"):
+                stack.append(o.__dict__)
+            for cls in type(o).__mro__:
+                slots = getattr(cls, "__slots__", ())
+                slots = (slots,) if isinstance(slots, str) else slots
+                stack.extend(getattr(o, name) for name in slots if hasattr(o, name))
+    return total
+
+
+def session_memory(state, operation_lists=()):
+    """``(rows, total, operations)``: bytes per key of ``state``, largest first, and the route's length."""
+    seen = set()
+    rows = [{"key": key, "bytes": deep_sizeof(value, seen)} for key, value in state.items()]
+    rows.sort(key=lambda row: row["bytes"], reverse=True)
+    operations = sum(len(state.get(name) or ()) for name in operation_lists)
+    return rows, sum(row["bytes"] for row in rows), operations
+
+
+def profiling_panel(caches=None, operation_lists=()):
+    """Sidebar summary of the latest full rerun, recent fragment reruns and the last cProfile capture.
+
+    ``caches`` maps a cache's name to its counters (e.g. ``EstimateCache.stats()``).
+    ``operation_lists`` name the session-state lists holding the route's
+    operations, for the memory per operation.
+    """
+    if not active():
+        return
+    records = list(st.session_state.get(RECORDS_KEY, ()))
+    if not records:
+        return
+    st.markdown("### 🐢 Profiling")
+    run = records[-1]["run"]
+    latest = [r for r in records if r["run"] == run]
+    totals = {}
+    for r in latest:
+        key = r["phase"] if "process" not in r else f"{r['phase']}: {r['process']}"
+        totals[key] = totals.get(key, 0.0) + r["ms"]
+    st.caption(f"Rerun #{run}")
+    st.dataframe([{"phase": k, "ms": round(v, 2)} for k, v in totals.items()], hide_index=True)
+    with st.expander("Recent records"):
+        st.dataframe(records[-50:][::-1], hide_index=True)
+    if caches:
+        st.caption("Shared caches")
+        st.dataframe([{"cache": name, **stats} for name, stats in caches.items()], hide_index=True)
+    rows, total, operations = session_memory(st.session_state.to_dict(), operation_lists)
+    per_operation = f", {total / operations / 1024:.1f} KiB per operation" if operations else ""
+    with st.expander(f"Session memory: {total / 1024:.0f} KiB{per_operation}"):
+        st.dataframe(rows[:25], hide_index=True)
+    if STATS_KEY in st.session_state:
+        path, text = st.session_state[STATS_KEY]
+        with st.expander("cProfile (last capture)"):
+            st.caption(path)
+            st.code(text)
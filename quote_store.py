@@ -0,0 +1,180 @@
+"""Saved quotes in a local SQLite database.
+
+A quote is the submitted state of the Machining and Result pages (inputs,
+``*_times`` and totals) stored as JSON, plus the customer, part number and a
+few searchable columns. Every searchable column is indexed. ``search()``
+pages by keyset on (created, id) rather than OFFSET, so any page of the
+history costs the same however many quotes are saved.
+
+The database file is ``quotes.sqlite`` unless ``MACHINING_QUOTES_DB`` says
+otherwise. Connections are opened once and reused from a small pool. The
+database runs in WAL mode so readers do not block a writer.
+
+This module does not import Streamlit.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import NamedTuple
+
+DB_ENV = "MACHINING_QUOTES_DB"
+DEFAULT_PATH = "quotes.sqlite"
+PAGE_SIZE = 50
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS quotes (
+        id INTEGER PRIMARY KEY,
+        created TEXT NOT NULL,
+        customer TEXT NOT NULL COLLATE NOCASE,
+        part_number TEXT NOT NULL COLLATE NOCASE,
+        material TEXT,
+        total_time_min REAL,
+        total_cost REAL,
+        payload TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS quotes_created ON quotes (created)",
+    "CREATE INDEX IF NOT EXISTS quotes_customer ON quotes (customer, created)",
+    "CREATE INDEX IF NOT EXISTS quotes_part_number ON quotes (part_number, created)",
+    "CREATE INDEX IF NOT EXISTS quotes_material ON quotes (material, created)",
+    "CREATE INDEX IF NOT EXISTS quotes_total_cost ON quotes (total_cost)",
+)
+SUMMARY_COLUMNS = ("id", "created", "customer", "part_number", "material", "total_time_min", "total_cost")
+
+
+class QuoteSummary(NamedTuple):
+    id: int
+    created: str
+    customer: str
+    part_number: str
+    material: str | None
+    total_time_min: float
+    total_cost: float
+
+
+class Quote(NamedTuple):
+    summary: QuoteSummary
+    payload: dict
+
+
+class ConnectionPool:
+    """A fixed set of connections to one database file, handed out one at a time."""
+
+    def __init__(self, path, size=4):
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+
+def _prefix_range(column, prefix):
+    # A range instead of LIKE so the (NOCASE) index on the column is used.
+    return f"{column} >= ? AND {column} < ?", [prefix, prefix + "\U0010ffff"]
+
+
+class QuoteStore:
+    def __init__(self, path=DEFAULT_PATH, pool_size=4):
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn, conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get(DB_ENV, DEFAULT_PATH))
+
+    def save(self, customer, part_number, payload, created=None):
+        """Store a quote and return its id.
+
+        ``payload`` is the submitted state, as built by ``report.result_state``
+        plus ``labor_cost_per_hour``; it must be JSON serializable.
+        """
+        created = created or datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        row = (
+            created, customer.strip(), part_number.strip(), payload.get("job_material"),
+            payload.get("total_time_min", 0.0), payload.get("total_cost", 0.0), json.dumps(payload),
+        )
+        with self.pool.connection() as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO quotes (created, customer, part_number, material, total_time_min, total_cost, payload)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            return cursor.lastrowid
+
+    def get(self, quote_id):
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(SUMMARY_COLUMNS)}, payload FROM quotes WHERE id = ?", (quote_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return Quote(QuoteSummary(*row[:-1]), json.loads(row[-1]))
+
+    def delete(self, quote_id):
+        with self.pool.connection() as conn, conn:
+            conn.execute("DELETE FROM quotes WHERE id = ?", (quote_id,))
+
+    def materials(self):
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT DISTINCT material FROM quotes WHERE material IS NOT NULL ORDER BY material")
+            return [m for (m,) in rows]
+
+    def search(self, customer="", part_number="", material=None, date_from=None, date_to=None,
+               min_cost=None, max_cost=None, limit=PAGE_SIZE, after=None):
+        """One page of quotes, newest first, and the cursor of the next page (None on the last page).
+
+        ``customer`` and ``part_number`` match by case-insensitive prefix;
+        ``date_from``/``date_to`` are inclusive ``YYYY-MM-DD`` dates. Pass
+        the returned cursor as ``after`` to get the following page.
+        """
+        where, params = [], []
+        for column, prefix in (("customer", customer), ("part_number", part_number)):
+            if prefix:
+                clause, values = _prefix_range(column, prefix.strip())
+                where.append(clause)
+                params += values
+        if material:
+            where.append("material = ?")
+            params.append(material)
+        if date_from:
+            where.append("created >= ?")
+            params.append(str(date_from))
+        if date_to:
+            where.append("created < date(?, '+1 day')")
+            params.append(str(date_to))
+        if min_cost is not None:
+            where.append("total_cost >= ?")
+            params.append(min_cost)
+        if max_cost is not None:
+            where.append("total_cost <= ?")
+            params.append(max_cost)
+        if after is not None:
+            where.append("(created, id) < (?, ?)")
+            params += list(after)
+
+        sql = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM quotes"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created DESC, id DESC LIMIT ?"
+        with self.pool.connection() as conn:
+            rows = [QuoteSummary(*row) for row in conn.execute(sql, (*params, limit + 1))]
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, (rows[-1].created, rows[-1].id)
+        return rows, None
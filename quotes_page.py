@@ -0,0 +1,122 @@
+"""Saving quotes from the Result page and the saved quotes (history) page.
+
+Loading a quote restores the whole submitted state in one step (entries,
+job inputs, ``*_times`` and totals), so the Machining page shows the route
+again and the Result page shows its route sheet.
+"""
+
+import streamlit as st
+
+from estimator import MACHINES, compact_times
+from live_totals import EXTRA_LIST, LiveTotals
+from lot_size_panel import LOT_SIZES_WIDGET
+from operation_cards import new_operation_id
+from quote_store import QuoteStore
+from report import RESULT_KEYS, SUBMITTED_ENTRIES, result_state, submitted_entries
+
+ENTRY_LISTS = tuple(machine.entries_key for machine in MACHINES) + (EXTRA_LIST,)
+# Widgets of the Machining page's job inputs; dropped on load so they pick up the loaded values.
+JOB_INPUT_WIDGETS = ("job_material_input", "material_cost_input", "labor_cost_per_hour_input")
+
+
+@st.cache_resource
+def quote_store():
+    # One connection pool per server, shared by all sessions.
+    return QuoteStore.from_env()
+
+
+def save_quote_form():
+    with st.form("save_quote", clear_on_submit=True):
+        st.subheader("💾 Save Quote")
+        col1, col2 = st.columns(2)
+        customer = col1.text_input("Customer")
+        part_number = col2.text_input("Part Number")
+        if st.form_submit_button("Save"):
+            payload = {**result_state(st.session_state), "labor_cost_per_hour": st.session_state.get("labor_cost_per_hour", 0.0)}
+            quote_id = quote_store().save(customer, part_number, payload)
+            st.success(f"Saved as quote #{quote_id}")
+
+
+def load_quote(quote_id):
+    payload = compact_times(quote_store().get(quote_id).payload)
+    for key in RESULT_KEYS:
+        if key in payload:
+            st.session_state[key] = payload[key]
+        else:
+            # e.g. the uncertainty bands of quotes saved without them.
+            st.session_state.pop(key, None)
+
+    st.session_state[SUBMITTED_ENTRIES] = submitted_entries(payload)
+
+    # Fresh operation ids, so no widget state of the current route is reused.
+    totals = LiveTotals()
+    totals.material_cost = payload.get("material_cost", 0.0)
+    totals.labor_cost_per_hour = payload.get("labor_cost_per_hour", 0.0)
+    for list_name in ENTRY_LISTS:
+        entries = [{**entry, "id": new_operation_id()} for entry in payload.get(list_name, [])]
+        for entry in entries:
+            totals.set_operation(list_name, entry["id"], entry)
+        st.session_state[list_name] = entries
+    st.session_state.live_totals = totals
+
+    st.session_state.labor_cost_per_hour = totals.labor_cost_per_hour
+    st.session_state.job_inputs = {
+        "job_material": payload.get("job_material") or "Select",
+        "material_cost": totals.material_cost,
+        "labor_cost_per_hour": totals.labor_cost_per_hour,
+    }
+    for key in (*JOB_INPUT_WIDGETS, LOT_SIZES_WIDGET):
+        st.session_state.pop(key, None)
+    st.session_state.result_ready = True
+    st.session_state.page = "Result"
+
+
+def _filters(store):
+    col1, col2, col3 = st.columns(3)
+    customer = col1.text_input("Customer starts with")
+    part_number = col2.text_input("Part number starts with")
+    material = col3.selectbox("Material", ["Any", *store.materials()])
+    col1, col2, col3, col4 = st.columns(4)
+    date_from = col1.date_input("From", value=None)
+    date_to = col2.date_input("To", value=None)
+    min_cost = col3.number_input("Min Cost (Rs.)", value=None, min_value=0.0)
+    max_cost = col4.number_input("Max Cost (Rs.)", value=None, min_value=0.0)
+    return {
+        "customer": customer, "part_number": part_number, "material": None if material == "Any" else material,
+        "date_from": date_from, "date_to": date_to, "min_cost": min_cost, "max_cost": max_cost,
+    }
+
+
+def quotes_page():
+    st.header("🗂️ Saved Quotes")
+    store = quote_store()
+    filters = _filters(store)
+
+    # Keyset paging: one cursor per page visited, reset whenever the filters change.
+    if st.session_state.get("quote_filters") != filters:
+        st.session_state.quote_filters = filters
+        st.session_state.quote_cursors = [None]
+    cursors = st.session_state.quote_cursors
+    rows, next_cursor = store.search(**filters, after=cursors[-1])
+
+    if not rows:
+        st.info("No saved quotes match.")
+        return
+    st.dataframe([row._asdict() for row in rows], hide_index=True)
+
+    col1, col2, col3 = st.columns([1, 1, 4])
+    if col1.button("◀ Newer", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if col2.button("Older ▶", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
+    col3.caption(f"Page {len(cursors)}")
+
+    selected = st.selectbox(
+        "Quote", rows,
+        format_func=lambda r: f"#{r.id} · {r.customer} · {r.part_number} · {r.material} · Rs. {r.total_cost:.2f}",
+    )
+    if st.button("📂 Load Quote"):
+        load_quote(selected.id)
+        st.rerun()
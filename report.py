@@ -0,0 +1,447 @@
+"""PDF route sheet, built from a snapshot of the Result page's state.
+
+The summary, quantity price breaks with the per-part cost curve, and
+per-operation time tables are always included; the
+full-detail export adds one parameter table per process, written from the
+entries in chunks of ``DETAIL_CHUNK_ROWS`` rows.
+
+The chunks spare building every row of a table up front, but they do not
+bound memory: fpdf 1.7 keeps the whole document in memory until
+``output()``. The peak grows with the route. ``benchmarks/bench_pdf.py``
+measured it at about 3 MiB for 2,000 operations and 12 MiB for 8,000
+(full detail, 790 pages), roughly eight times the finished PDF.
+
+The entries in a snapshot are the ones "✅ Submit All" priced, kept under
+``SUBMITTED_ENTRIES``, not the live card lists, which may have changed since.
+The PDF only depends on the values in ``RESULT_KEYS``, so the generated bytes
+are cached under a hash of those values. ``PdfCache`` is shared by every
+session on the server: exporting an estimate that was already exported is
+instant, and identical exports clicked at the same time are built once.
+Documents are built on a small thread pool. The Result page does not wait
+for them: a fragment polls the build's progress and the page offers the
+download once it is done.
+"""
+
+import hashlib
+import itertools
+import json
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from fpdf import FPDF
+
+from estimator import MACHINES, PROCESSES, ExtraProcess, expand_times
+from lotsize import PRICE_BREAKS, cost_curve, lot_split, price_breaks
+
+SUMMARY_KEYS = (
+    "total_time_min", "labor_cost", "job_material", "material_cost",
+    "tool_cost", "total_extra_cost", "total_cost", "labor_cost_per_hour",
+)
+ENTRY_KEYS = tuple(machine.entries_key for machine in MACHINES) + ("extra_entries",)
+RESULT_KEYS = (
+    SUMMARY_KEYS + ("uncertainty", "lot_quantities")
+    + tuple(machine.times_key for machine in MACHINES) + ("extra_times",)
+    + ENTRY_KEYS
+)
+# Session key of the entries the current result was priced from (entries key -> entries).
+SUBMITTED_ENTRIES = "submitted_entries"
+MAX_COLUMNS = 6  # table columns per page
+DETAIL_CHUNK_ROWS = 200
+
+
+def submitted_entries(state):
+    """Copies of the entry lists in ``state``, without widget ids, to keep under ``SUBMITTED_ENTRIES``."""
+    return {
+        key: [{name: value for name, value in entry.items() if name != "id"} for entry in state.get(key, [])]
+        for key in ENTRY_KEYS
+    }
+
+
+def result_state(session_state):
+    """Plain copy of the values the PDF is built from, with the ``*_times`` rows as dicts.
+
+    The entries are the submitted ones, so they line up with the ``*_times`` rows.
+    """
+    submitted = session_state.get(SUBMITTED_ENTRIES) or {}
+    return expand_times({
+        key: submitted.get(key, []) if key in ENTRY_KEYS else session_state.get(key, []) for key in RESULT_KEYS
+    })
+
+
+def state_key(state, *options):
+    """Stable hash of a ``result_state`` snapshot and the export options."""
+    payload = json.dumps([state, options], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PDF(FPDF):
+    def header(self):
+        self.set_font('Helvetica', 'B', 14)
+        self.cell(0, 10, 'Machining Time & Cost Estimate', ln=True, align='C')
+        self.ln(5)
+
+    def footer(self):
+        self.set_y(-15)
+        self.set_font("Helvetica", "I", 8)
+        self.cell(0, 10, f'Page {self.page_no()}', align='C')
+
+    def _wrap(self, text, width):
+        """Split ``text`` into lines that fit in a cell ``width`` wide."""
+        width -= 2 * self.c_margin
+        if self.get_string_width(text) <= width:
+            return [text]
+        lines, line, line_w = [], "", 0.0
+        for ch in text:
+            ch_w = self.get_string_width(ch)
+            if line and line_w + ch_w > width:
+                lines.append(line)
+                line, line_w = "", 0.0
+            line += ch
+            line_w += ch_w
+        lines.append(line)
+        return lines
+
+    def _row(self, widths, lines, line_h):
+        """Draw one table row; every cell is as tall as the tallest one."""
+        h = line_h * max(len(cell) for cell in lines)
+        x, y = self.l_margin, self.get_y()
+        for w, cell in zip(widths, lines):
+            self.rect(x, y, w, h)
+            for j, text in enumerate(cell):
+                self.set_xy(x, y + j * line_h)
+                self.cell(w, line_h, text)
+            x += w
+        self.set_xy(self.l_margin, y + h)
+
+    def curve(self, xs, ys, marks=(), h=60):
+        """Line chart of ``ys`` over ``xs`` on a log x axis; ``marks`` are points to dot and label."""
+        if self.get_y() + h + 12 > self.page_break_trigger:
+            self.add_page()
+        x0, y0 = self.l_margin + 18, self.get_y()
+        w = self.w - self.l_margin - x0
+        lx = [math.log10(x) for x in xs]
+        x_span = (lx[-1] - lx[0]) or 1.0
+        y_min, y_max = min(ys), max(ys)
+        y_span = (y_max - y_min) or 1.0
+
+        def point(x, y):
+            return x0 + (math.log10(x) - lx[0]) / x_span * w, y0 + h - (y - y_min) / y_span * h
+
+        self.set_font("Helvetica", '', 7)
+        self.rect(x0, y0, w, h)
+        for value, y in ((y_max, y0), (y_min, y0 + h)):
+            self.text(self.l_margin, y + 1, f"{value:.2f}")
+        for decade in range(math.ceil(lx[0]), math.floor(lx[-1]) + 1):
+            x, _ = point(10 ** decade, y_min)
+            self.text(x - 2, y0 + h + 4, f"{10 ** decade:,}")
+        previous = None
+        for x, y in zip(xs, ys):
+            current = point(x, y)
+            if previous:
+                self.line(*previous, *current)
+            previous = current
+        for x, y in marks:
+            px, py = point(x, y)
+            self.rect(px - 0.8, py - 0.8, 1.6, 1.6, 'F')
+            self.text(px + 1.5, py - 1.5, f"{y:.2f}")
+        self.set_xy(self.l_margin, y0 + h + 8)
+
+    def table(self, title, columns, rows, line_h=6, on_rows=None):
+        """Write a table, splitting its columns over as many pages as needed.
+
+        ``rows`` is called once per group of columns and must return a fresh
+        iterable of row chunks (lists of value sequences aligned with
+        ``columns``), so the rows are produced as they are written. The
+        written pages still stay in memory until ``output()``.
+        Long values wrap inside their cell instead of being cut off.
+        ``on_rows``, if given, is called with the size of every chunk written.
+        """
+        epw = self.w - 2 * self.l_margin
+        columns_per_page = max(1, min(len(columns), MAX_COLUMNS, int(epw // 30)))
+        col_width = epw / columns_per_page  # reasonable width per column
+        total_pages = math.ceil(len(columns) / columns_per_page)
+
+        for page in range(total_pages):
+            start_col = page * columns_per_page
+            end_col = start_col + columns_per_page
+            widths = [col_width] * len(columns[start_col:end_col])
+
+            self.add_page()
+            self.set_font("Helvetica", 'B', 12)
+            self.cell(0, 10, title if page == 0 else f"{title} (continued)", ln=True)
+            self.ln(2)
+
+            # Table header
+            self.set_font("Helvetica", 'B', 9)
+            header = [self._wrap(str(k), col_width) for k in columns[start_col:end_col]]
+            self._row(widths, header, line_h)
+
+            # Table rows
+            self.set_font("Helvetica", '', 9)
+            for chunk in rows():
+                for row in chunk:
+                    lines = [self._wrap("" if v is None else str(v), col_width) for v in row[start_col:end_col]]
+                    # Page break if needed, reprinting the header on the new page
+                    if self.get_y() + line_h * max(len(cell) for cell in lines) > self.page_break_trigger:
+                        self.add_page()
+                        self.set_font("Helvetica", 'B', 9)
+                        self._row(widths, header, line_h)
+                        self.set_font("Helvetica", '', 9)
+                    self._row(widths, lines, line_h)
+                if on_rows is not None:
+                    on_rows(len(chunk))
+
+
+def _time_tables(state):
+    tables = [(f"{machine.name} Machining Time", state[machine.times_key], "process") for machine in MACHINES]
+    tables.append(("Extra Processes", state["extra_times"], "ptype"))
+    return tables
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
+def detail_tables(state):
+    """``(title, columns, rows, n_rows)`` for every parameter table of the full-detail export.
+
+    Machining entries get one table per process, in route order of first use,
+    since each process has its own inputs. ``rows`` builds the table's rows
+    from the entries on demand, ``DETAIL_CHUNK_ROWS`` at a time.
+    """
+    tables = []
+    for machine in MACHINES:
+        entries = state[machine.entries_key]
+        positions = {}
+        for i, entry in enumerate(entries):
+            positions.setdefault(entry["type"], []).append(i)
+        for ptype, idx in positions.items():
+            inputs = PROCESSES[ptype].inputs
+
+            def rows(entries=entries, idx=idx, inputs=inputs):
+                return _chunks(([i + 1] + [entries[i].get(f.key) for f in inputs] for i in idx), DETAIL_CHUNK_ROWS)
+
+            columns = ["#"] + [f.widget_label for f in inputs]
+            tables.append((f"{machine.name} Entries: {ptype}", columns, rows, len(idx)))
+
+    extras = state["extra_entries"]
+    if extras:
+        def rows():
+            return _chunks((
+                [i + 1, ExtraProcess.from_entry(e).label(i + 1), e.get("time_min"), e.get("extra_tool_cost")]
+                for i, e in enumerate(extras)
+            ), DETAIL_CHUNK_ROWS)
+
+        columns = ["#", "Process", "Time Taken (min)", "Extra Tool Cost (Rs.)"]
+        tables.append(("Extra Process Entries", columns, rows, len(extras)))
+    return tables
+
+
+def build_pdf(state, detail=False, progress=None):
+    """Render a ``result_state`` snapshot to PDF bytes.
+
+    With ``detail`` the parameters of every operation are included as well.
+    ``progress``, if given, is called with the fraction of rows written so far.
+    """
+    time_tables = _time_tables(state)
+    details = detail_tables(state) if detail else []
+    total_rows = sum(len(times) for _, times, _ in time_tables)
+    total_rows += sum(n * math.ceil(len(columns) / MAX_COLUMNS) for _, columns, _, n in details)
+    total_rows = total_rows or 1
+    rows_done = 0
+
+    def on_rows(n):
+        nonlocal rows_done
+        rows_done += n
+        if progress is not None:
+            progress(min(rows_done / total_rows, 1.0))
+
+    pdf = PDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=10)
+
+    # --- Summary Table ---
+    pdf.set_font("Helvetica", 'B', 12)
+    pdf.cell(0, 10, 'Summary', ln=True)
+    pdf.set_font("Helvetica", '', 10)
+
+    total_time_min = state["total_time_min"]
+    summary_data = [
+        ["Total Time (hr:min)", f"{int(total_time_min//60)}:{int(total_time_min%60)}"],
+        ["Labor Cost (Rs.)", f"{state['labor_cost']:.2f}"],
+        ["Job Material", f"{state['job_material']}"],
+        ["Material Cost (Rs.)", f"{state['material_cost']:.2f}"],
+        ["Tool Cost (Rs.)", f"{state['tool_cost']:.2f}"],
+        ["Extra Process Cost (Rs.)", f"{state['total_extra_cost']:.2f}"],
+        ["Total Estimated Cost (Rs.)", f"{state['total_cost']:.2f}"]
+    ]
+    # Monte Carlo bands (see montecarlo.py), when they were computed.
+    bands = state.get("uncertainty")
+    if bands:
+        summary_data += [
+            ["Time P50 / P90 (min)", f"{bands['time_p50']:.2f} / {bands['time_p90']:.2f}"],
+            ["Cost P50 / P90 (Rs.)", f"{bands['cost_p50']:.2f} / {bands['cost_p90']:.2f}"],
+            ["Uncertainty Samples", f"{bands['samples']:,}"],
+        ]
+    for row in summary_data:
+        pdf.cell(60, 8, row[0], border=1)
+        pdf.cell(80, 8, row[1], border=1)
+        pdf.ln()
+
+    pdf.ln(5)
+
+    # --- Quantity Price Breaks ---
+    split = lot_split(state)
+    breaks = price_breaks(split, state.get("lot_quantities") or PRICE_BREAKS)
+    pdf.set_font("Helvetica", 'B', 12)
+    pdf.cell(0, 10, 'Quantity Price Breaks', ln=True)
+    pdf.set_font("Helvetica", '', 9)
+    pdf.cell(0, 6, f"Setup {split.setup_min:.2f} min per lot, cycle {split.cycle_min:.2f} min per part", ln=True)
+    pdf.set_font("Helvetica", 'B', 9)
+    for column in breaks[0]:
+        pdf.cell(34, 8, column, border=1)
+    pdf.ln()
+    pdf.set_font("Helvetica", '', 10)
+    for row in breaks:
+        pdf.cell(34, 8, f"{row['Quantity']:,}", border=1)
+        for value in list(row.values())[1:]:
+            pdf.cell(34, 8, f"{value:,.2f}", border=1)
+        pdf.ln()
+    pdf.ln(3)
+    pdf.set_font("Helvetica", 'B', 10)
+    pdf.cell(0, 8, 'Cost per Part (Rs.) by Lot Size', ln=True)
+    quantities, costs = cost_curve(split, breaks[-1]["Quantity"])
+    pdf.curve(quantities.tolist(), costs.tolist(), [(row["Quantity"], row["Cost / Part (Rs.)"]) for row in breaks])
+    pdf.ln(5)
+
+    # --- Process Time Tables ---
+    for title, times, label_key in time_tables:
+        if not times:
+            continue
+        pdf.set_font("Helvetica", 'B', 12)
+        pdf.cell(0, 10, title, ln=True)
+        pdf.set_font("Helvetica", 'B', 10)
+        pdf.cell(50, 8, "Process", border=1)
+        pdf.cell(40, 8, "Time (min)", border=1)
+        pdf.cell(40, 8, "Cost (Rs.)", border=1)
+        pdf.ln()
+        pdf.set_font("Helvetica", '', 10)
+        for t in times:
+            pdf.cell(50, 8, f"{t[label_key]} #{t['index']}", border=1)
+            pdf.cell(40, 8, f"{t['time']:.2f}", border=1)
+            pdf.cell(40, 8, f"{t['cost']:.2f}", border=1)
+            pdf.ln()
+        on_rows(len(times))
+        pdf.ln(5)
+
+    # --- Full DataFrames ---
+    for title, columns, rows, _ in details:
+        pdf.table(title, columns, rows, on_rows=on_rows)
+
+    # Generate PDF content as string, then encode to bytes
+    pdf_data = pdf.output(dest='S').encode('latin-1')
+    if progress is not None:
+        progress(1.0)
+    return pdf_data
+
+
+def build_toc(entries, first_page=1):
+    """Table of contents for a combined export: ``entries`` are ``(title, pages)`` in order.
+
+    The listed page numbers count from the start of the combined document,
+    with the contents themselves taking ``first_page - 1`` pages.
+    Returns the PDF bytes and how many pages they take.
+    """
+    pdf = PDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    pdf.set_font("Helvetica", 'B', 12)
+    pdf.cell(0, 10, 'Contents', ln=True)
+    pdf.set_font("Helvetica", '', 10)
+    page = first_page
+    for title, pages in entries:
+        pdf.cell(150, 8, str(title), border=1)
+        pdf.cell(30, 8, str(page), border=1, align='R')
+        pdf.ln()
+        page += pages
+    return pdf.output(dest='S').encode('latin-1'), pdf.page_no()
+
+
+class PdfJob:
+    """A PDF being built (or already built): its future and how far along it is."""
+
+    def __init__(self, key):
+        self.key = key
+        self.future = Future()
+        self.progress = 0.0
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()
+
+
+class PdfCache:
+    """Thread-safe LRU of PDF bytes keyed by ``state_key``.
+
+    Finished documents are evicted least recently used first once there are
+    more than ``max_entries`` of them or they take more than ``max_bytes``.
+    """
+
+    def __init__(self, max_entries=32, max_bytes=64 * 1024 * 1024, workers=2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._done = OrderedDict()
+        self._building = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf")
+
+    def __len__(self):
+        return len(self._done)
+
+    @property
+    def size_bytes(self):
+        return self._size
+
+    def submit(self, state, detail=False, build=build_pdf):
+        """Return a ``PdfJob`` for ``state``, starting a build only if it is neither cached nor in progress."""
+        key = state_key(state, detail)
+        with self._lock:
+            if key in self._done:
+                self._done.move_to_end(key)
+                job = PdfJob(key)
+                job.progress = 1.0
+                job.future.set_result(self._done[key])
+                return job
+            job = self._building.get(key)
+            if job is None:
+                job = self._building[key] = PdfJob(key)
+                self._pool.submit(self._build, job, state, detail, build)
+            return job
+
+    def _build(self, job, state, detail, build):
+        try:
+            data = build(state, detail, progress=lambda fraction: setattr(job, "progress", fraction))
+        except BaseException as exc:
+            with self._lock:
+                del self._building[job.key]
+            job.future.set_exception(exc)
+            return
+        with self._lock:
+            del self._building[job.key]
+            self._store(job.key, data)
+        job.future.set_result(data)
+
+    def _store(self, key, data):
+        self._done[key] = data
+        self._size += len(data)
+        while self._done and (len(self._done) > self.max_entries or self._size > self.max_bytes):
+            _, evicted = self._done.popitem(last=False)
+            self._size -= len(evicted)
@@ -0,0 +1,331 @@
+"""Columnar result tables: one table per process type, for export and the Result page.
+
+A submitted estimate (a ``report.result_state`` snapshot, or ``asdict`` of a
+``JobEstimate`` plus its entries) becomes a ``ResultTables``. Each table is
+a dict of equal-length numpy columns; ``frame()`` turns one into a
+DataFrame only where one is needed (the page, a file):
+
+* ``summary``: one row of job inputs and totals, plus the P50/P90 bands
+  when the estimate has them.
+* ``route``: the route sheet, one row per operation in route order (lathe,
+  milling, then extra processes): ``step``, ``machine``, ``process``,
+  ``index``, ``time_min``, ``cost`` and ``cumulative_time_min``.
+* one table per process type, named like ``facing`` or ``drilling_center``,
+  with a fixed schema from the process registry: ``machine``, ``index``
+  (the operation's number on its machine), every input by name, then
+  ``time_min`` and ``cost``. Every input is a float column.
+* ``extra_processes``: ``index``, ``type``, ``label``, ``time_min`` and ``cost``.
+
+Tables are written as CSV, JSONL or Parquet, one file per table. Every
+table is written ``EXPORT_CHUNK_ROWS`` rows at a time (one Parquet row
+group per chunk), so a long route is never serialized in one piece.
+Parquet uses ``pyarrow``, which Streamlit already depends on. For many
+jobs, ``TableWriter`` appends each job's tables to per-table files with a
+``job_id`` column::
+
+    python result_tables.py jobs.jsonl -o tables/ --format parquet
+
+Jobs are completed with the card defaults (``estimate_cli.complete_job``);
+a job that cannot be read or estimated is reported on stderr and the other
+jobs' tables are still written.
+
+This module does not import Streamlit.
+"""
+
+import argparse
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from estimate_cli import ESTIMATE_ERRORS, JobError, _file_format, complete_job, read_csv_jobs, read_jsonl_jobs
+from estimator import MACHINES, PROCESSES, TIME_LABEL_KEYS, estimate_job, expand_times
+
+FORMATS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+EXPORT_CHUNK_ROWS = 10_000
+SUMMARY_COLUMNS = (
+    "job_material", "material_cost", "labor_cost_per_hour", "total_time_min",
+    "labor_cost", "tool_cost", "total_extra_cost", "total_cost",
+)
+# The state the tables are built from.
+TABLE_KEYS = (
+    SUMMARY_COLUMNS + ("uncertainty",)
+    + tuple(key for machine in MACHINES for key in (machine.entries_key, machine.times_key))
+    + ("extra_entries", "extra_times")
+)
+ROUTE_TABLE = "route"
+EXTRA_TABLE = "extra_processes"
+EXTRA_COLUMNS = ("index", "type", "label", "time_min", "cost")
+EXTRA_MACHINE = "Other"
+
+
+def table_name(ptype):
+    """File-safe table name of a process type: ``"Drilling - Center"`` -> ``"drilling_center"``."""
+    return re.sub(r"\W+", "_", ptype.lower()).strip("_")
+
+
+def process_schema(ptype):
+    """Column name -> dtype of a process type's table."""
+    inputs = PROCESSES[ptype].inputs
+    return {
+        "machine": object, "index": np.int64,
+        # Floats even for integer inputs (rpm, teeth): the value the estimate used, which may be fractional.
+        **{i.name: np.float64 for i in inputs},
+        "time_min": np.float64, "cost": np.float64,
+    }
+
+
+@dataclass
+class ResultTables:
+    summary: dict
+    route: dict = field(default_factory=dict)
+    # table name -> columns, in registry order; only process types on the route.
+    processes: dict = field(default_factory=dict)
+    extra: dict = field(default_factory=dict)
+
+    def tables(self):
+        """``(name, columns)`` for every table, summary and route first."""
+        yield "summary", self.summary
+        yield ROUTE_TABLE, self.route
+        yield from self.processes.items()
+        yield EXTRA_TABLE, self.extra
+
+
+def frame(columns):
+    return pd.DataFrame(columns, copy=False)
+
+
+def _process_columns(ptype, rows):
+    """Columns of one process type from ``(machine, index, entry, time row)`` tuples."""
+    cls = PROCESSES[ptype]
+    schema = process_schema(ptype)
+    columns = {"machine": [row[0] for row in rows], "index": [row[1] for row in rows]}
+    for i in cls.inputs:
+        columns[i.name] = [row[2].get(i.key, i.default) for row in rows]
+    columns["time_min"] = [row[3]["time"] for row in rows]
+    columns["cost"] = [row[3]["cost"] for row in rows]
+    return {name: np.asarray(values, dtype=schema[name]) for name, values in columns.items()}
+
+
+def _route_columns(state):
+    machines = {**{machine.times_key: machine.name for machine in MACHINES}, "extra_times": EXTRA_MACHINE}
+    rows = [
+        (machines[key], t[label], t["index"], t["time"], t["cost"])
+        for key, label in TIME_LABEL_KEYS.items()
+        for t in state.get(key, [])
+    ]
+    time_min = np.array([row[3] for row in rows], dtype=float)
+    return {
+        "step": np.arange(1, len(rows) + 1, dtype=np.int64),
+        "machine": np.array([row[0] for row in rows], dtype=object),
+        "process": np.array([row[1] for row in rows], dtype=object),
+        "index": np.array([row[2] for row in rows], dtype=np.int64),
+        "time_min": time_min,
+        "cost": np.array([row[4] for row in rows], dtype=float),
+        "cumulative_time_min": np.cumsum(time_min),
+    }
+
+
+def pareto(route, by="time_min"):
+    """Route time and cost per process, largest ``by`` first, with each process's cumulative share of ``by``."""
+    processes, inverse = np.unique(route["process"].astype(str), return_inverse=True)
+    totals = {
+        "operations": np.bincount(inverse, minlength=len(processes)),
+        "time_min": np.bincount(inverse, weights=route["time_min"], minlength=len(processes)),
+        "cost": np.bincount(inverse, weights=route["cost"], minlength=len(processes)),
+    }
+    order = np.argsort(-totals[by], kind="stable")
+    values = totals[by][order]
+    total = values.sum() or 1.0
+    return {
+        "process": processes[order], **{name: column[order] for name, column in totals.items()},
+        "share": values / total, "cumulative_share": np.cumsum(values) / total,
+    }
+
+
+def result_tables(state):
+    """``ResultTables`` of a submitted estimate."""
+    state = expand_times(state)
+    summary = {"job_material": np.array([state.get("job_material") or ""], dtype=object)}
+    for name in SUMMARY_COLUMNS[1:]:
+        summary[name] = np.array([state.get(name) or 0.0], dtype=float)
+    for name, value in (state.get("uncertainty") or {}).items():
+        summary[name] = np.array([value])
+
+    groups = {}
+    for machine in MACHINES:
+        for entry, t in zip(state.get(machine.entries_key, []), state.get(machine.times_key, [])):
+            groups.setdefault(entry["type"], []).append((machine.name, t["index"], entry, t))
+    processes = {
+        table_name(ptype): _process_columns(ptype, groups[ptype]) for ptype in PROCESSES if ptype in groups
+    }
+
+    extra_times = state.get("extra_times", [])
+    extra = {
+        "index": np.array([t["index"] for t in extra_times], dtype=np.int64),
+        "type": np.array([entry["type"] for entry in state.get("extra_entries", [])][:len(extra_times)], dtype=object),
+        "label": np.array([t["ptype"] for t in extra_times], dtype=object),
+        "time_min": np.array([t["time"] for t in extra_times], dtype=float),
+        "cost": np.array([t["cost"] for t in extra_times], dtype=float),
+    }
+    return ResultTables(summary, _route_columns(state), processes, extra)
+
+
+def _chunks(frame, rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, max(len(frame), 1), rows):
+        yield frame.iloc[start:start + rows]
+
+
+def _parquet():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from None
+    return pa, pq
+
+
+def write_table(f, frame, fmt, header=True):
+    """Write ``frame`` to the binary file object ``f`` in chunks; ``header`` only applies to CSV."""
+    if fmt == "parquet":
+        pa, pq = _parquet()
+        schema = pa.Schema.from_pandas(frame, preserve_index=False)
+        with pq.ParquetWriter(f, schema) as writer:
+            for chunk in _chunks(frame):
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        return
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="", write_through=True)
+    for chunk in _chunks(frame):
+        if fmt == "csv":
+            chunk.to_csv(text, header=header, index=False)
+            header = False
+        elif len(chunk):
+            lines = chunk.to_json(orient="records", lines=True)
+            text.write(lines if lines.endswith("\n") else lines + "\n")
+    text.detach()
+
+
+def export_zip(tables, fmt):
+    """ZIP bytes holding every table of ``tables`` as one ``fmt`` file."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, columns in tables.tables():
+            with archive.open(name + FORMATS[fmt], "w") as f:
+                write_table(f, frame(columns), fmt)
+    return buffer.getvalue()
+
+
+class TableWriter:
+    """Appends the tables of many jobs to one file per table in ``directory``, each row tagged with ``job_id``.
+
+    Rows are buffered per table and flushed every ``chunk_rows`` rows; a
+    Parquet file gets one row group per flush.
+    """
+
+    def __init__(self, directory, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory, self.fmt, self.chunk_rows = directory, fmt, chunk_rows
+        self._pending = {}
+        self._pending_rows = {}
+        self._files = {}
+        self._parquet = {}
+
+    def write(self, job_id, tables):
+        for name, columns in tables.tables():
+            rows = len(next(iter(columns.values())))
+            if rows:
+                pending = self._pending.setdefault(name, [])
+                pending.append({"job_id": np.full(rows, str(job_id), dtype=object), **columns})
+                self._pending_rows[name] = self._pending_rows.get(name, 0) + rows
+                if self._pending_rows[name] >= self.chunk_rows:
+                    self._flush(name)
+
+    def _flush(self, name):
+        pending = self._pending.pop(name, None)
+        self._pending_rows.pop(name, None)
+        if not pending:
+            return
+        chunk = frame({column: np.concatenate([p[column] for p in pending]) for column in pending[0]})
+        if name not in self._files:
+            self._files[name] = open(os.path.join(self.directory, name + FORMATS[self.fmt]), "wb")
+        f = self._files[name]
+        if self.fmt == "parquet":
+            pa, pq = _parquet()
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if name not in self._parquet:
+                self._parquet[name] = pq.ParquetWriter(f, table.schema)
+            self._parquet[name].write_table(table.cast(self._parquet[name].schema))
+        else:
+            write_table(f, chunk, self.fmt, header=f.tell() == 0)
+
+    def close(self):
+        for name in list(self._pending):
+            self._flush(name)
+        for writer in self._parquet.values():
+            writer.close()
+        for f in self._files.values():
+            f.close()
+        return sorted(self._files)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def job_tables(job):
+    """``ResultTables`` of a job in the ``estimate_cli.py`` format; raises one of ``ESTIMATE_ERRORS``."""
+    job = complete_job(job)
+    result = estimate_job(
+        *(job.get(machine.entries_key, []) for machine in MACHINES), job.get("extra_entries", []),
+        job.get("material_cost", 0.0), job.get("labor_cost_per_hour", 0.0),
+    )
+    return result_tables({"job_material": "", **job, **asdict(result)})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write per-process result tables for many jobs.")
+    parser.add_argument("input", help="CSV or JSONL job file (see estimate_cli.py), '-' for stdin")
+    parser.add_argument("-o", "--output", required=True, help="directory for the table files")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    args = parser.parse_args(argv)
+
+    in_format = _file_format(args.input, args.input_format)
+    fin = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    start = time.perf_counter()
+    n = 0
+    failed = []
+    try:
+        with TableWriter(args.output, args.format) as writer:
+            jobs = read_csv_jobs(fin) if in_format == "csv" else read_jsonl_jobs(fin)
+            for index, job in enumerate(jobs):
+                job_id = job.job_id if isinstance(job, JobError) else job.get("job_id")
+                try:
+                    tables = job_tables(job)
+                except ESTIMATE_ERRORS as e:
+                    failed.append((index, job_id, str(e)))
+                    continue
+                writer.write(job_id, tables)
+                n += 1
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+    print(f"{n} jobs in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    for index, job_id, error in failed:
+        print(f"skipped job {job_id} (#{index + 1}): {error}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
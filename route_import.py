@@ -0,0 +1,182 @@
+"""Import a route sheet (CSV or Excel) into Machining page entries.
+
+One row per operation, in route order. ``machine`` is lathe, milling or
+other; ``type`` is the process. The other columns hold the process's inputs.
+A column may be named by the entry key (``depth of cut``), the input name
+(``depth_of_cut``) or the card label (``Depth of cut (mm/pass)``), in any
+case. Columns a process does not have are ignored, so one sheet can hold
+every process's columns. Empty cells take the card's default.
+
+Rows are read one at a time (``openpyxl`` in read-only mode for ``.xlsx``)
+and validated as they are read. A bad row is reported with its line
+number, and the remaining rows are still imported.
+
+This module does not import Streamlit.
+"""
+
+import csv
+import io
+import math
+import os
+from typing import NamedTuple
+
+from estimator import EXTRA_PROCESS_TYPES, MACHINES, processes_for
+from live_totals import EXTRA_LIST
+
+MACHINE_COLUMN = "machine"
+TYPE_COLUMN = "type"
+MACHINE_LISTS = {machine.name.lower(): machine.entries_key for machine in MACHINES}
+MACHINE_LISTS["other"] = EXTRA_LIST
+# Inputs that divide in the time formulas.
+POSITIVE_INPUTS = ("feed", "rpm", "depth_of_cut", "teeth", "cut_dia", "tool_width")
+EXTRA_INPUTS = {"time_min": "Time Taken (min)", "extra_tool_cost": "Extra Tool Cost (Rs.)"}
+
+
+class RowError(NamedTuple):
+    line: int
+    message: str
+
+
+class ImportResult(NamedTuple):
+    # entries_key (or "extra_entries") -> entries in route order, without ids.
+    entries: dict
+    errors: list
+    rows: int
+
+    @property
+    def operations(self):
+        return sum(len(entries) for entries in self.entries.values())
+
+
+def _normalize(name):
+    return " ".join(str(name).replace("_", " ").split()).lower()
+
+
+def _aliases(inputs):
+    """Normalized column name -> input name, for every way a column may be named."""
+    aliases = {}
+    for field in inputs:
+        for name in (field.name, field.label, field.widget_label):
+            aliases[_normalize(name)] = field.name
+    return aliases
+
+
+def _number(label, value, positive=False):
+    """``(number, None)`` for a valid cell, else ``(None, message)``."""
+    try:
+        number = float(value) if isinstance(value, (int, float)) else float(str(value).replace(",", "").strip())
+    except ValueError:
+        return None, f"{label}: {value!r} is not a number"
+    if not math.isfinite(number) or number < 0:
+        return None, f"{label}: must not be negative, got {value!r}"
+    if positive and number == 0:
+        return None, f"{label}: must be greater than 0"
+    return number, None
+
+
+def read_csv_rows(f):
+    """``(line, row)`` pairs from a CSV file object, headers normalized."""
+    reader = csv.reader(f)
+    header = [_normalize(h) for h in next(reader, [])]
+    for row in reader:
+        if any(cell.strip() for cell in row):
+            yield reader.line_num, dict(zip(header, row))
+
+
+def read_excel_rows(f, sheet=None):
+    """``(line, row)`` pairs from the first (or named) sheet of an ``.xlsx`` workbook."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Reading Excel route sheets needs openpyxl (pip install openpyxl)") from None
+    workbook = load_workbook(f, read_only=True, data_only=True)
+    try:
+        rows = (workbook[sheet] if sheet else workbook.worksheets[0]).iter_rows(values_only=True)
+        header = [_normalize(h) if h is not None else "" for h in next(rows, ())]
+        for line, row in enumerate(rows, start=2):
+            if any(cell not in (None, "") for cell in row):
+                yield line, dict(zip(header, ("" if cell is None else cell for cell in row)))
+    finally:
+        workbook.close()
+
+
+def read_rows(f, name):
+    """Rows of a binary file object, as CSV or Excel by ``name``'s extension."""
+    if os.path.splitext(name)[1].lower() in (".xlsx", ".xlsm"):
+        return read_excel_rows(f)
+    return read_csv_rows(io.TextIOWrapper(f, encoding="utf-8-sig", newline=""))
+
+
+def _machining_entry(cls, row, aliases):
+    entry, errors = {field.key: field.default for field in cls.inputs}, []
+    inputs = {field.name: field for field in cls.inputs}
+    for column, value in row.items():
+        name = aliases.get(column)
+        if name is None or value in ("", None):
+            continue
+        number, error = _number(inputs[name].label, value, name in POSITIVE_INPUTS)
+        if error:
+            errors.append(error)
+        else:
+            entry[inputs[name].key] = inputs[name].coerce(number)
+    return entry, errors
+
+
+def _extra_entry(ptype, row):
+    spec = EXTRA_PROCESS_TYPES[ptype]
+    entry = {"time_min": spec.default_time, "extra_tool_cost": spec.default_cost}
+    errors = []
+    for name, label in EXTRA_INPUTS.items():
+        value = row.get(name.replace("_", " "), row.get(_normalize(label), ""))
+        if value in ("", None):
+            continue
+        number, error = _number(label, value)
+        if error:
+            errors.append(error)
+        else:
+            entry[name] = number
+    custom_name = str(row.get("custom name", "") or "").strip()
+    if ptype == "Custom" and custom_name:
+        entry["custom_name"] = custom_name
+    return entry, errors
+
+
+def import_rows(rows):
+    """Validate ``(line, row)`` pairs into entries; every bad row becomes a ``RowError``."""
+    entries = {key: [] for key in MACHINE_LISTS.values()}
+    errors = []
+    processes = {machine.name.lower(): processes_for(machine.name) for machine in MACHINES}
+    aliases = {}
+    n = 0
+    for line, row in rows:
+        n += 1
+        machine = str(row.get(MACHINE_COLUMN, "")).strip().lower()
+        ptype = str(row.get(TYPE_COLUMN, "")).strip()
+        if machine not in MACHINE_LISTS:
+            errors.append(RowError(line, f"unknown machine {machine!r}; expected {', '.join(MACHINE_LISTS)}"))
+            continue
+        known = EXTRA_PROCESS_TYPES if machine == "other" else processes[machine]
+        # Process names are matched case-insensitively.
+        ptype = next((name for name in known if name.lower() == ptype.lower()), None) or ptype
+        if ptype not in known:
+            errors.append(RowError(line, f"unknown {machine} process {ptype!r}"))
+            continue
+
+        if machine == "other":
+            entry, problems = _extra_entry(ptype, row)
+        else:
+            cls = known[ptype]
+            if ptype not in aliases:
+                aliases[ptype] = _aliases(cls.inputs)
+            entry, problems = _machining_entry(cls, row, aliases[ptype])
+        if problems:
+            errors.extend(RowError(line, f"{ptype}: {problem}") for problem in problems)
+            continue
+        entry["type"] = ptype
+        entries[MACHINE_LISTS[machine]].append(entry)
+    return ImportResult(entries, errors, n)
+
+
+def import_route(f, name):
+    """Import a route sheet from a binary file object named ``name`` (``.csv`` or ``.xlsx``)."""
+    return import_rows(read_rows(f, name))
@@ -0,0 +1,119 @@
+"""Schedule page: shop load, makespan and a Gantt chart for many jobs.
+
+Jobs come from a CSV or JSONL file in the ``estimate_cli.py`` format. The
+current route can be added as one more job, so its lead time reflects
+the shop's load rather than its standalone machining minutes. Jobs that
+cannot be read or estimated are listed and left out of the schedule.
+"""
+
+import io
+
+import pandas as pd
+import streamlit as st
+
+from estimate_cli import read_csv_jobs, read_jsonl_jobs
+from estimator import MACHINES
+from scheduler import RULES, schedule_jobs
+from sensitivity_page import session_route
+
+CURRENT_JOB = "Current route"
+RULE_LABELS = {"mwkr": "Most work remaining", "spt": "Shortest operation", "fifo": "First come, first served"}
+
+
+def _uploaded_jobs(upload):
+    text = io.TextIOWrapper(upload, encoding="utf-8", newline="")
+    reader = read_csv_jobs if upload.name.lower().endswith(".csv") else read_jsonl_jobs
+    return list(reader(text))
+
+
+def _current_job(quantity):
+    (lathe, milling), _ = session_route()
+    job_inputs = st.session_state.get("job_inputs", {})
+    return {
+        "job_id": CURRENT_JOB, "quantity": quantity,
+        "material_cost": job_inputs.get("material_cost", 0.0),
+        "labor_cost_per_hour": job_inputs.get("labor_cost_per_hour", 0.0),
+        MACHINES[0].entries_key: lathe, MACHINES[1].entries_key: milling,
+        "extra_entries": st.session_state.get("extra_entries", []),
+    }
+
+
+def _gantt(schedule):
+    data = pd.DataFrame(
+        [op._asdict() for op in schedule.operations if op.machine is not None],
+        columns=["job_id", "operation", "machine", "start", "end"],
+    )
+    data["job_id"] = data["job_id"].astype(str)
+    st.vega_lite_chart(data, {
+        "mark": "bar",
+        "encoding": {
+            "y": {"field": "machine", "type": "nominal", "sort": schedule.machines, "title": None},
+            "x": {"field": "start", "type": "quantitative", "title": "Minutes"},
+            "x2": {"field": "end"},
+            "color": {"field": "job_id", "type": "nominal", "legend": None},
+            "tooltip": [
+                {"field": "job_id", "title": "Job"}, {"field": "operation"},
+                {"field": "start", "format": ".1f"}, {"field": "end", "format": ".1f"},
+            ],
+        },
+    })
+
+
+def schedule_page():
+    st.header("🗓️ Shop Schedule")
+    upload = st.file_uploader("Jobs (CSV or JSONL, as for estimate_cli.py)", type=["csv", "jsonl", "json"])
+    col1, col2, col3 = st.columns(3)
+    counts = {
+        MACHINES[0].name: col1.number_input("Lathes", min_value=0, value=2, step=1),
+        MACHINES[1].name: col2.number_input("Mills", min_value=0, value=1, step=1),
+    }
+    rule = col3.selectbox("Dispatch rule", RULES, format_func=RULE_LABELS.get)
+    col1, col2 = st.columns(2)
+    include_current = col1.checkbox("Include the current route", value=True)
+    quantity = col2.number_input("Current route quantity", min_value=1, value=1, step=1, disabled=not include_current)
+
+    jobs = []
+    if upload is not None:
+        try:
+            jobs = _uploaded_jobs(upload)
+        except (ValueError, KeyError) as e:
+            st.error(f"Could not read {upload.name}: {e}")
+            return
+    if include_current and any(session_route()[0]):
+        jobs.append(_current_job(quantity))
+    if not jobs:
+        st.info("Upload a job file or add operations on the **Machining** page.")
+        return
+
+    try:
+        schedule = schedule_jobs(jobs, counts, rule)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    if schedule.skipped:
+        with st.expander(f"⚠️ {len(schedule.skipped)} jobs could not be scheduled", expanded=True):
+            st.dataframe(
+                pd.DataFrame(
+                    [(index + 1, str(job_id), error) for index, job_id, error in schedule.skipped],
+                    columns=["#", "Job", "Error"],
+                ),
+                hide_index=True,
+            )
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Jobs", f"{len(schedule.job_ids):,}")
+    col2.metric("Makespan", f"{int(schedule.makespan // 60)} hr {schedule.makespan % 60:.0f} min")
+    lead_times = schedule.lead_times()
+    if CURRENT_JOB in lead_times:
+        lead = lead_times[CURRENT_JOB]
+        col3.metric("Current Route Lead Time", f"{int(lead // 60)} hr {lead % 60:.0f} min")
+
+    st.subheader("Machine Utilization")
+    st.bar_chart(pd.Series(schedule.utilization(), name="Utilization"), horizontal=True)
+    st.subheader("Gantt")
+    _gantt(schedule)
+    with st.expander("Job completion times"):
+        st.dataframe(
+            pd.DataFrame({"Job": [str(j) for j in lead_times], "Completes at (min)": list(lead_times.values())}),
+            hide_index=True,
+        )
@@ -0,0 +1,245 @@
+"""Shop schedule for many estimated jobs on a number of lathes and mills.
+
+Each job's operations run in route order: its lathe operations, then its
+milling operations, then its extra processes. An operation may only start
+once the previous one has finished. Extra processes are not tied to a
+machine (deburring, heat treatment, ...), so they only delay the job.
+Operation times come from ``batch_estimator.estimate_jobs``. A job with a
+``quantity`` runs each operation as one lot: setup once, then the cycle time
+``quantity`` times (see ``lotsize.py``).
+
+Scheduling uses priority dispatch. Operations wait in a per-machine-type
+queue. The next one is dispatched to whichever machine can start
+something earliest, choosing among the operations already ready at that
+moment by ``rule``:
+
+* ``mwkr``: most work remaining in the job first; good for makespan.
+* ``spt``: shortest operation first.
+* ``fifo``: first ready first.
+
+Heaps keep each dispatch ``O(log n)``, so thousands of operations schedule
+in milliseconds. Jobs are read and completed like ``estimate_cli.py`` reads
+them; a job that cannot be read or estimated is left out of the schedule and
+listed in ``Schedule.skipped``::
+
+    python scheduler.py jobs.jsonl --lathes 3 --mills 2 -o schedule.csv
+
+This module does not import Streamlit.
+"""
+
+import argparse
+import csv
+import heapq
+import sys
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+import numpy as np
+
+from batch_estimator import EXTRA_GROUP, estimate_jobs
+from estimate_cli import ESTIMATE_ERRORS, JobError, _file_format, complete_job, read_csv_jobs, read_jsonl_jobs
+from estimator import LATHE, MACHINES, MILLING
+
+RULES = ("mwkr", "spt", "fifo")
+SCHEDULE_FIELDS = ("job_id", "operation", "machine", "start", "end")
+
+
+class ScheduledOperation(NamedTuple):
+    job_id: object
+    operation: str
+    # e.g. "Lathe 2"; None for extra processes.
+    machine: str | None
+    start: float
+    end: float
+
+
+@dataclass
+class Schedule:
+    """Scheduled operations (in dispatch order) and the machines they ran on; times in minutes from 0."""
+
+    operations: list = field(default_factory=list)
+    machines: list = field(default_factory=list)
+    job_ids: list = field(default_factory=list)
+    job_end: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    # (index in the input, job id, error) of the jobs left out.
+    skipped: list = field(default_factory=list)
+
+    @property
+    def makespan(self):
+        return float(self.job_end.max()) if len(self.job_end) else 0.0
+
+    def utilization(self):
+        """Busy fraction of the makespan per machine, in ``machines`` order."""
+        busy = dict.fromkeys(self.machines, 0.0)
+        for op in self.operations:
+            if op.machine is not None:
+                busy[op.machine] += op.end - op.start
+        makespan = self.makespan or 1.0
+        return {machine: minutes / makespan for machine, minutes in busy.items()}
+
+    def lead_times(self):
+        """Completion time of every job, by job id."""
+        return dict(zip(self.job_ids, self.job_end.tolist()))
+
+
+def _durations(jobs, estimate):
+    """Minutes per operation row of ``estimate``, with each job's quantity run as one lot."""
+    setup = []
+    for job in jobs:
+        for machine in MACHINES:
+            setup += [e.get("job set time", 0.0) + e.get("tool set time", 0.0) for e in job.get(machine.entries_key, ())]
+        setup += [0.0] * len(job.get("extra_entries", ()))
+    setup = np.where(estimate.time > 0, np.array(setup, dtype=float), 0.0)
+    quantity = np.array([float(job.get("quantity") or 1) for job in jobs])[estimate.job]
+    return setup + (estimate.time - setup) * quantity
+
+
+def _estimate(jobs):
+    estimate = estimate_jobs(jobs)
+    return jobs, estimate, _durations(jobs, estimate)
+
+
+def _estimable_jobs(jobs, skipped):
+    """Completed jobs that can be estimated, their estimate and durations.
+
+    ``(index, job_id, error)`` of every other job is appended to ``skipped``.
+    """
+    valid = []
+    for k, job in enumerate(jobs):
+        try:
+            valid.append((k, complete_job(job)))
+        except ValueError as e:
+            job_id = job.job_id if isinstance(job, JobError) else job.get("job_id") if isinstance(job, dict) else None
+            skipped.append((k, job_id, str(e)))
+    try:
+        return _estimate([job for _, job in valid])
+    except ESTIMATE_ERRORS:
+        pass
+    # Estimate the jobs one at a time to find the ones that fail.
+    good = []
+    for k, job in valid:
+        try:
+            _estimate([job])
+        except ESTIMATE_ERRORS as e:
+            skipped.append((k, job.get("job_id"), str(e)))
+        else:
+            good.append(job)
+    skipped.sort(key=lambda item: item[0])
+    return _estimate(good)
+
+
+def schedule_jobs(jobs, machines, rule="mwkr"):
+    """Schedule ``jobs`` (as read by ``estimate_cli``) on ``machines`` (machine name -> count)."""
+    if rule not in RULES:
+        raise ValueError(f"Unknown rule {rule!r}; expected one of {', '.join(RULES)}")
+    skipped = []
+    jobs, estimate, duration = _estimable_jobs(list(jobs), skipped)
+    duration = duration.tolist()
+    job_of = estimate.job.tolist()
+    group = estimate.group.tolist()
+    labels = [f"{label} #{index}" for label, index in zip(estimate.label, estimate.index.tolist())]
+
+    # Rows are ordered job by job in route order, so a job's operations are a contiguous range.
+    first = np.searchsorted(estimate.job, np.arange(len(jobs))).tolist() + [len(job_of)]
+    remaining = np.zeros(len(job_of))
+    for k in range(len(jobs)):
+        remaining[first[k]:first[k + 1]] = np.cumsum(duration[first[k]:first[k + 1]][::-1])[::-1]
+    remaining = remaining.tolist()
+
+    names = [machine.name for machine in MACHINES]
+    for t in set(group) - {EXTRA_GROUP}:
+        if machines.get(names[t], 0) < 1:
+            raise ValueError(f"The jobs need a {names[t].lower()} machine but none are available")
+    free = [[(0.0, f"{name} {i + 1}") for i in range(machines.get(name, 0))] for name in names]
+    pending = [[] for _ in names]  # (ready, row) per machine type
+    ready_queue = [[] for _ in names]  # (priority, ready, row)
+    result = Schedule(
+        machines=[m for queue in free for _, m in queue], job_ids=[job.get("job_id") for job in jobs], skipped=skipped,
+    )
+    job_end = np.zeros(len(jobs))
+
+    def priority(row, ready):
+        if rule == "mwkr":
+            return -remaining[row]
+        if rule == "spt":
+            return duration[row]
+        return ready
+
+    def release(k, row, ready):
+        """Make job ``k``'s operation ``row`` ready at ``ready``, running extra processes straight away."""
+        while row < first[k + 1] and group[row] == EXTRA_GROUP:
+            end = ready + duration[row]
+            result.operations.append(ScheduledOperation(result.job_ids[k], labels[row], None, ready, end))
+            ready, row = end, row + 1
+        if row < first[k + 1]:
+            heapq.heappush(pending[group[row]], (ready, row))
+        else:
+            job_end[k] = ready
+
+    for k in range(len(jobs)):
+        release(k, first[k], 0.0)
+
+    while True:
+        best = None
+        for t in range(len(names)):
+            if not pending[t] and not ready_queue[t]:
+                continue
+            earliest = free[t][0][0]
+            if not ready_queue[t]:
+                earliest = max(earliest, pending[t][0][0])
+            if best is None or earliest < best[0]:
+                best = (earliest, t)
+        if best is None:
+            break
+        now, t = best
+        while pending[t] and pending[t][0][0] <= now:
+            ready, row = heapq.heappop(pending[t])
+            heapq.heappush(ready_queue[t], (priority(row, ready), ready, row))
+        _, ready, row = heapq.heappop(ready_queue[t])
+        machine_free, machine = heapq.heappop(free[t])
+        start = max(machine_free, ready)
+        end = start + duration[row]
+        heapq.heappush(free[t], (end, machine))
+        result.operations.append(ScheduledOperation(result.job_ids[job_of[row]], labels[row], machine, start, end))
+        release(job_of[row], row + 1, end)
+
+    result.job_end = job_end
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule many jobs on the shop's lathes and mills.")
+    parser.add_argument("input", help="CSV or JSONL job file (see estimate_cli.py), '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="schedule CSV (default: stdout)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--lathes", type=int, default=1)
+    parser.add_argument("--mills", type=int, default=1)
+    parser.add_argument("--rule", choices=RULES, default="mwkr")
+    args = parser.parse_args(argv)
+
+    in_format = _file_format(args.input, args.input_format)
+    fin = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    try:
+        jobs = list(read_csv_jobs(fin) if in_format == "csv" else read_jsonl_jobs(fin))
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+    schedule = schedule_jobs(jobs, {LATHE: args.lathes, MILLING: args.mills}, args.rule)
+
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        writer = csv.writer(fout)
+        writer.writerow(SCHEDULE_FIELDS)
+        writer.writerows(schedule.operations)
+    finally:
+        if fout is not sys.stdout:
+            fout.close()
+    for index, job_id, error in schedule.skipped:
+        print(f"skipped job {job_id} (#{index + 1}): {error}", file=sys.stderr)
+    print(f"{len(schedule.job_ids)} jobs, {len(schedule.operations)} operations: makespan {schedule.makespan:.1f} min", file=sys.stderr)
+    for machine, busy in schedule.utilization().items():
+        print(f"  {machine}: {busy:.0%} busy", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Sensitivity page: sweep cutting parameters of the current route.
+
+The heatmap shows route cost (or time) over a grid of two parameters for one
+operation, or for every operation at once as multipliers of their own
+values. The tornado chart shows which parameters move the route cost most
+for a ± change. Both are computed with ``sweep.RouteSweep``.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from estimator import MACHINES, PROCESSES
+from sweep import FIELD_LABELS, SWEEP_FIELDS, RouteSweep
+
+ALL_OPERATIONS = "All operations (× own value)"
+NO_AXIS = "—"
+
+
+def session_route():
+    """The Machining page's machining entries, with defaults for inputs a card has not rendered yet."""
+    lists, labels = [], []
+    for machine in MACHINES:
+        entries = []
+        for i, entry in enumerate(st.session_state.get(machine.entries_key, [])):
+            cls = PROCESSES[entry["type"]]
+            entries.append({**{field.key: field.default for field in cls.inputs}, **entry})
+            labels.append(f"{machine.name} · {entry['type']} #{i+1}")
+        lists.append(entries)
+    return lists, labels
+
+
+def _axis_range(field, target, entries):
+    """Number inputs for one axis; absolute values for a single operation, multipliers otherwise."""
+    if target is None:
+        low, high, step = 0.5, 1.5, 0.05
+    else:
+        current = float(entries[target][field.replace("_", " ")])
+        low, high, step = current * 0.5, current * 1.5, None
+    col1, col2 = st.columns(2)
+    key = f"sweep_{field}_{target}"
+    low = col1.number_input(f"{FIELD_LABELS[field]} from", value=low, step=step, key=f"{key}_low")
+    high = col2.number_input(f"{FIELD_LABELS[field]} to", value=high, step=step, key=f"{key}_high")
+    return low, high
+
+
+def _heatmap(grid, metric, x_label, y_label):
+    x, y = np.meshgrid(grid.values[0], grid.values[1], indexing="ij")
+    data = pd.DataFrame({x_label: x.ravel(), y_label: y.ravel(), metric: getattr(grid, _METRICS[metric]).ravel()})
+    st.vega_lite_chart(data, {
+        "mark": "rect",
+        "encoding": {
+            "x": {"field": x_label, "type": "ordinal", "axis": {"labelOverlap": True}},
+            "y": {"field": y_label, "type": "ordinal", "sort": "descending", "axis": {"labelOverlap": True}},
+            "color": {"field": metric, "type": "quantitative", "scale": {"scheme": "viridis"}},
+            "tooltip": [{"field": x_label}, {"field": y_label}, {"field": metric, "format": ".2f"}],
+        },
+    })
+
+
+_METRICS = {"Total Cost (Rs.)": "cost", "Total Time (min)": "time"}
+
+
+def _tornado(route, targets):
+    swing = st.slider("Change each parameter by ± (%)", 5, 50, 20, key="tornado_swing")
+    bars = route.tornado(low=1 - swing / 100, high=1 + swing / 100, targets=targets)
+    if not bars:
+        return
+    base = route.base.total_cost
+    data = pd.DataFrame([
+        {"parameter": FIELD_LABELS[field], f"-{swing}%": low, f"+{swing}%": high, "swing": abs(high - low)}
+        for field, low, high in bars
+    ])
+    st.vega_lite_chart(data, {
+        "layer": [
+            {
+                "mark": "bar",
+                "encoding": {
+                    "y": {"field": "parameter", "type": "nominal", "sort": {"field": "swing", "order": "descending"}},
+                    "x": {"field": f"-{swing}%", "type": "quantitative", "title": "Total Cost (Rs.)", "scale": {"zero": False}},
+                    "x2": {"field": f"+{swing}%"},
+                    "tooltip": [{"field": "parameter"}, {"field": f"-{swing}%", "format": ".2f"}, {"field": f"+{swing}%", "format": ".2f"}],
+                },
+            },
+            {"mark": {"type": "rule", "color": "red"}, "encoding": {"x": {"datum": base}}},
+        ],
+    })
+    st.caption(f"Red line: current total cost Rs. {base:.2f}")
+
+
+def sensitivity_page():
+    st.header("📈 Sensitivity")
+    (lathe, milling), labels = session_route()
+    entries = [*lathe, *milling]
+    if not entries:
+        st.info("Add machining operations on the **Machining** page first.")
+        return
+    job_inputs = st.session_state.get("job_inputs", {})
+    route = RouteSweep(
+        lathe, milling, st.session_state.get("extra_entries", []),
+        job_inputs.get("material_cost", 0.0), job_inputs.get("labor_cost_per_hour", 0.0),
+    )
+
+    choice = st.selectbox("Operation", [ALL_OPERATIONS, *labels])
+    target = None if choice == ALL_OPERATIONS else labels.index(choice)
+    targets = None if target is None else [target]
+    if target is None:
+        fields = list(SWEEP_FIELDS)
+    else:
+        names = {field.name for field in PROCESSES[entries[target]["type"]].inputs}
+        fields = [f for f in SWEEP_FIELDS if f in names]
+
+    col1, col2, col3 = st.columns(3)
+    metric = col1.radio("Show", list(_METRICS))
+    x_field = col2.selectbox("X parameter", fields, format_func=FIELD_LABELS.get)
+    y_options = [NO_AXIS, *[f for f in fields if f != x_field]]
+    y_field = col3.selectbox(
+        "Y parameter", y_options, index=min(1, len(y_options) - 1), format_func=lambda f: FIELD_LABELS.get(f, f),
+    )
+    steps = st.slider("Grid points per axis", 10, 200, 100)
+
+    axes = [(x_field, np.linspace(*_axis_range(x_field, target, entries), steps))]
+    if y_field != NO_AXIS:
+        axes.append((y_field, np.linspace(*_axis_range(y_field, target, entries), steps)))
+
+    start = time.perf_counter()
+    grid = route.grid(axes, targets)
+    elapsed = time.perf_counter() - start
+    st.caption(f"{grid.time.size:,} route variants in {elapsed * 1000:.1f} ms")
+
+    x_label = FIELD_LABELS[x_field] + ("" if target is not None else " ×")
+    if len(axes) == 1:
+        st.line_chart(pd.DataFrame({x_label: grid.values[0], metric: getattr(grid, _METRICS[metric])}).set_index(x_label))
+    else:
+        y_label = FIELD_LABELS[y_field] + ("" if target is not None else " ×")
+        _heatmap(grid, metric, x_label, y_label)
+
+    st.divider()
+    st.subheader("🌪️ What drives the cost")
+    _tornado(route, targets)
@@ -1,8 +1,21 @@
 import streamlit as st
-import math
-from fpdf import FPDF
-import tempfile
-import os
+from dataclasses import asdict
+from typing import NamedTuple
+
+from estimate_cache import EstimateCache, route_key
+from estimator import MACHINES, PROCESSES, compact_times, estimate_job, processes_for
+from live_totals import LiveTotals
+from lotsize import lot_split
+from lot_size_panel import lot_size_panel
+from operation_cards import add_operation_controls, extra_card, import_route_controls, operation_card
+from optimizer_page import optimizer_page
+import profiling
+from quotes_page import quotes_page, save_quote_form
+from report import SUBMITTED_ENTRIES, PdfCache, result_state, state_key, submitted_entries
+from result_tables import EXTRA_TABLE, FORMATS, TABLE_KEYS, export_zip, frame, pareto, result_tables, table_name
+from schedule_page import schedule_page
+from sensitivity_page import sensitivity_page
+from uncertainty_panel import route_uncertainty, uncertainty_controls, uncertainty_summary
 
 st.set_page_config(
     page_title="Cost Estimating App",
@@ -37,14 +50,18 @@ def Machining():
     #st.header("Machining")
 
     # Initialize session state
-    if "job_material" not in st.session_state:
-        st.session_state.job_material = None
-    if "machining1_entries" not in st.session_state:
-        st.session_state.machining1_entries = []
-    if "machining2_entries" not in st.session_state:
-        st.session_state.machining2_entries = []
-    if "extra_entries" not in st.session_state:
-        st.session_state.extra_entries = []
+    with profiling.phase("session_init"):
+        if "job_material" not in st.session_state:
+            st.session_state.job_material = None
+        for machine in MACHINES:
+            if machine.entries_key not in st.session_state:
+                st.session_state[machine.entries_key] = []
+        if "extra_entries" not in st.session_state:
+            st.session_state.extra_entries = []
+        if "live_totals" not in st.session_state:
+            st.session_state.live_totals = LiveTotals()
+        if "job_inputs" not in st.session_state:
+            st.session_state.job_inputs = {"job_material": "Select", "material_cost": 1000.00, "labor_cost_per_hour": 500.00}
 
     st.title("🛠️ Machining Processes")
 
@@ -52,822 +69,192 @@ def Machining():
     st.header("📦 Cost/Job Inputs")
 
     material_option = ["Select", "Aluminium", "Brass", "Copper", "Steel"]
-    job_material = st.selectbox("Job Material",material_option)
+    # The job inputs outlive their widgets (page switches, loaded quotes), so the widgets are seeded from them.
+    job_inputs = st.session_state.job_inputs
+    if job_inputs["job_material"] not in material_option:
+        material_option.append(job_inputs["job_material"])
+    for widget_key, name in (("job_material_input", "job_material"), ("material_cost_input", "material_cost"), ("labor_cost_per_hour_input", "labor_cost_per_hour")):
+        if widget_key not in st.session_state:
+            st.session_state[widget_key] = job_inputs[name]
+    job_material = st.selectbox("Job Material",material_option, key="job_material_input")
     st.session_state.job_material = job_material
 
-    material_cost = st.number_input("Material Cost (Rs.)", value=1000.00, step=100.00)
-    labor_cost_per_hour = st.number_input("Labor Cost per Hour (Rs.)", value=500.00, step=50.0)
+    material_cost = st.number_input("Material Cost (Rs.)", step=100.00, key="material_cost_input")
+    labor_cost_per_hour = st.number_input("Labor Cost per Hour (Rs.)", step=50.0, key="labor_cost_per_hour_input")
+    job_inputs.update(job_material=job_material, material_cost=material_cost, labor_cost_per_hour=labor_cost_per_hour)
+    st.session_state.live_totals.material_cost = material_cost
+    st.session_state.live_totals.labor_cost_per_hour = labor_cost_per_hour
 
 
-    # Step 1: Process selection + Add button
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.subheader("⚙️ Lathe Machine")
-        machining1_options = [ "Boring", "Drilling - Center", "Drilling - Pilot", "Drilling - Main", "Facing", "Grooving", "Knurling", "Reaming", "Threading", "Turning - Concave", "Turning - Convex", "Turning - Straight", "Turning - Taper"]
-        selected_machining1 = st.selectbox("Select a Process", machining1_options, key="machining1_select")
-        if st.button("Add lathe operation"):
-            st.session_state.machining1_entries.append({"type": selected_machining1})
-
-    with col2:
-        st.subheader("⚙️ Milling Machine")
-        machining2_options = ["Face Milling - Plain", "Face Milling - Outer Contour", "Side Milling", "Pocket Cutting", "Blanking"]
-        selected_machining2 = st.selectbox("Select a Process", machining2_options, key="machining2_select")
-        if st.button("Add milling operation"):
-            st.session_state.machining2_entries.append({"type": selected_machining2})
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        st.subheader("➕ Other Processes")
-        extra_options = [ "Custom", "Blanking", "Chamfering", "Parting", "Resharpening", "Tool Change"]
-        selected_extra = st.selectbox("Select Other Process", extra_options, key="extra_select")
-        if st.button("Add Other operation"):
-            st.session_state.extra_entries.append({"type": selected_extra})
+    add_operation_controls()
+    import_route_controls()
 
     # Step 2: Render input fields for each Machining process
-    st.divider()
-    st.header("🔩 Lathe Machine Inputs")
-    for i, entry in enumerate(st.session_state.machining1_entries):
-        ptype = entry["type"]
-        st.markdown(f"### 🔧 {ptype} #{i+1}")  
-
-        if entry ["type"] == "Boring":
-            col1, col2 = st.columns(2)
-            with col1:
-                di = st.number_input(f"Initial Diameter (mm)", key=f"bore_di_{i}", value=25.00)
-                df = st.number_input(f"Final Diameter (mm)", key=f"bore_df_{i}", value=28.00)
-                d = st.number_input(f"Boring Length (mm)", key=f"bore_d_{i}", value=12.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"bore_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"bore_n_{i}", value=170)
-                an = st.number_input(f"Drill Angle (degree)", key=f"bore_ann_{i}", value=118.00)
-            with col2:
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"bore_doc_{i}", value=0.10)
-                js = st.number_input(f"Job Setting Time (min)", key=f"bore_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"bore_ts_{i}", value=5.00)
-                a = st.number_input(f"Approach (mm)", key=f"bore_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"bore_o_{i}", value=0.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"bore_t_{i}", value=10.00)
-            entry.update({"initial diameter": di, "final diameter": df, "depth": d, "feed": f, "angle": an, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-        
-        elif entry ["type"] == "Drilling - Center":
-            col1, col2 = st.columns(2)
-            with col1:
-                l = st.number_input(f"Drilling Depth (mm)", key=f"drillc_l_{i}", value=5.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"drillc_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"drillc_n_{i}", value=170)
-                tu = st.number_input(f"Num of times drilled", key=f"drillc_tu_{i}", value=4)
-                d = st.number_input(f"Drill Diameter", key=f"drillc_d_{i}", value=6.00)
-            with col2: 
-                js = st.number_input(f"Job Setting Time (min)", key=f"drillc_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"drillc_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"drillc_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"drillc_o_{i}", value=0.00) 
-                t = st.number_input(f"Tool Cost (Rs)", key=f"drillc_t_{i}", value=10.00)
-            entry.update({"depth": l, "feed": f, "diameter":d, "rpm": n, "turn": tu, "job set time": js, "tool set time": ts,  "approach": a, "overrun": o, "tool cost": t})    
-        
-        elif entry ["type"] == "Drilling - Pilot":
-            col1, col2 = st.columns(2)
-            with col1:
-                l = st.number_input(f"Drilling Depth (mm)", key=f"drillp_l_{i}", value=12.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"drillp_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"drillp_n_{i}", value=170)
-                tu = st.number_input(f"Num of times drilled", key=f"drillp_tu_{i}", value=5)
-                d = st.number_input(f"Drill Diameter", key=f"drillp_d_{i}", value=15.00)
-            with col2: 
-                js = st.number_input(f"Job Setting Time (min)", key=f"drillp_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"drillp_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"drillp_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"drillp_o_{i}", value=0.00) 
-                t = st.number_input(f"Tool Cost (Rs)", key=f"drillp_t_{i}", value=10.00)
-            entry.update({"depth": l, "feed": f, "diameter":d, "rpm": n, "turn": tu, "job set time": js, "tool set time": ts,  "approach": a, "overrun": o, "tool cost": t})    
-        
-        elif entry ["type"] == "Drilling - Main":
-            col1, col2 = st.columns(2)
-            with col1:
-                l = st.number_input(f"Drilling Depth (mm)", key=f"drillm_l_{i}", value=12.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"drillm_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"drillm_n_{i}", value=170)
-                tu = st.number_input(f"Num of times drilled", key=f"drillm_tu_{i}", value=7)
-                d = st.number_input(f"Drill Diameter", key=f"drillm_d_{i}", value=25.00)
-            with col2: 
-                js = st.number_input(f"Job Setting Time (min)", key=f"drillm_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"drillm_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"drillm_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"drillm_o_{i}", value=0.00) 
-                t = st.number_input(f"Tool Cost (Rs)", key=f"drillm_t_{i}", value=10.00)
-            entry.update({"depth": l, "feed": f, "diameter":d, "rpm": n, "turn": tu, "job set time": js, "tool set time": ts,  "approach": a, "overrun": o, "tool cost": t})    
-        
-        elif entry ["type"] == "Facing":
-            col1, col2 = st.columns(2)
-            with col1:
-                d = st.number_input(f"Facing Diameter (mm)", key=f"face_d_{i}", value=50.00)
-                l = st.number_input(f"Facing Lenght (mm)", key=f"face_l_{i}", value=10.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"face_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"face_n_{i}", value=170)
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"face_doc_{i}", value=2.00)
-            with col2:    
-                js = st.number_input(f"Job Setting Time (min)", key=f"face_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"face_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"face_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"face_o_{i}", value=10.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"face_t_{i}", value=10.00)
-            entry.update({"diameter": d, "length": l, "feed": f, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts,  "approach": a, "overrun": o, "tool cost": t})
-
-        elif entry ["type"] == "Grooving":
-            col1, col2 = st.columns(2)
-            with col1:
-                di = st.number_input(f"Initial Diameter(mm)", key=f"groove_di_{i}", value=28.00)
-                df = st.number_input(f"Final Diameter(mm)", key=f"groove_df_{i}", value=28.50)
-                l = st.number_input(f"Groove Length", key=f"groove_l_{i}", value=2.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"groove_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"groove_pn_{i}", value=170)
-                w = st.number_input(f"Tool Width (mm)", key=f"groove_w_{i}", value=2.00)
-            with col2:          
-                doc = st.number_input(f"Depth of Cut (mm/pass)", key=f"groove_pdoc_{i}", value=0.10)  
-                js = st.number_input(f"Job Setting Time (min)", key=f"groove_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"groove_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"groove_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"groove_o_{i}", value=0.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"groove_t_{i}", value=10.00)
-            entry.update({"initial diameter": di, "final diameter": df, "length": l, "feed": f, "tool width": w, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts,  "approach": a, "overrun": o, "tool cost": t})
-        
-        elif entry ["type"] == "Knurling":
-            col1, col2 = st.columns(2)
-            with col1:
-                l = st.number_input(f"Knurling Lenght (mm)", key=f"knurl_l_{i}", value=18.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"knurl_f_{i}", value=0.20)
-                n = st.number_input(f"RPM", key=f"knurl_n_{i}", value=60)
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"knurl_doc_{i}", value=0.10)
-                js = st.number_input(f"Job Setting Time (min)", key=f"knurl_js_{i}", value=0.00)
-            with col2:
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"knurl_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"knurl_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"knurl_o_{i}", value=0.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"knurl_t_{i}", value=10.00)
-            entry.update({"length": l, "feed": f, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts,  "approach": a, "overrun": o, "tool cost": t})
-        
-        elif entry ["type"] == "Reaming":
-            col1, col2 = st.columns(2)
-            with col1:
-                l = st.number_input(f"Reaming Lenght (mm)", key=f"ream_l_{i}", value=20.00)
-                di = st.number_input(f"Initial Diameter (mm)", key=f"ream_di_{i}", value=28.00)
-                df = st.number_input(f"Final Diameter (mm)", key=f"ream_df_{i}", value=30.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"ream_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"ream_n_{i}", value=170)
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"ream_doc_{i}", value=0.10)
-            with col2:
-                js = st.number_input(f"Job Setting Time (min)", key=f"ream_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"ream_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"ream_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"ream_o_{i}", value=0.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"ream_t_{i}", value=10.00)
-            entry.update({"length": l, "initial diameter": di, "final diameter": df, "feed": f, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-        
-        elif entry ["type"] == "Threading":
-            col1, col2 = st.columns(2)
-            with col1:
-                p = st.number_input(f"Thread Pitch (TPI)", key=f"thread_p_{i}", value=2.00)
-                l = st.number_input(f"Thread Lenght (mm)", key=f"thread_l_{i}", value=12.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"thread_f_{i}", value=0.20)
-                n = st.number_input(f"RPM", key=f"thread_n_{i}", value=60)
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"thread_doc_{i}", value=0.10)
-            with col2:
-                js = st.number_input(f"Job Setting Time (min)", key=f"thread_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"thread_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"thread_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"thread_o_{i}", value=0.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"thread_t_{i}", value=10.00)
-            entry.update({"pitch": p, "length": l, "feed": f, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-        
-        elif entry ["type"] == "Turning - Concave":
-            col1, col2 = st.columns(2)
-            with col1:
-                d = st.number_input(f"Diameter (mm)", key=f"turn_cave_d_{i}", value=50.00)
-                an = st.number_input(f"Conacve Angle (Degree)", key=f"turn_cave_an_{i}", value=20.00)
-                l = st.number_input(f"Turning Lenght (mm)", key=f"turn_cave_l_{i}", value=25.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"turn_cave_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"tur_caven_n_{i}", value=170)
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"turn_cave_doc_{i}", value=1.00)
-            with col2:
-                js = st.number_input(f"Job Setting Time (min)", key=f"turn_cave_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"turn_cave_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"turn_cave_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"turn_cave_o_{i}", value=10.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"turn_cave_t_{i}", value=10.00)
-            entry.update({"diameter": d, "angle": an, "length": l, "feed": f, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-
-        elif entry ["type"] == "Turning - Convex":
-            col1, col2 = st.columns(2)
-            with col1:
-                d = st.number_input(f"Diameter (mm)", key=f"turn_vex_d_{i}", value=50.00)
-                an = st.number_input(f"Convex Angle (Degree)", key=f"turn_vex_an_{i}", value=20.00)
-                l = st.number_input(f"Turning Lenght (mm)", key=f"turn_vex_l_{i}", value=25.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"turn_vex_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"turn_vex_n_{i}", value=170)
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"turn_vex_doc_{i}", value=1.00)
-            with col2:
-                js = st.number_input(f"Job Setting Time (min)", key=f"turn_vex_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"turn_vex_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"turn_vex_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"turn_vex_o_{i}", value=10.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"turn_vex_t_{i}", value=10.00)
-            entry.update({"diameter": d, "angle": an, "length": l, "feed": f, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-        
-        elif entry ["type"] == "Turning - Straight":
-            col1, col2 = st.columns(2)
-            with col1:
-                di = st.number_input(f"Initial Diameter (mm)", key=f"turn_di_{i}", value=50.00)
-                df = st.number_input(f"Final Diameter (mm)", key=f"turn_df_{i}", value=38.00)
-                l = st.number_input(f"Turning Lenght (mm)", key=f"turn_l_{i}", value=25.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"turn_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"turn_n_{i}", value=170)
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"turn_doc_{i}", value=1.00)
-            with col2:
-                js = st.number_input(f"Job Setting Time (min)", key=f"turn_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"turn_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"turn_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"turn_o_{i}", value=0.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"turn_t_{i}", value=10.00)
-            entry.update({"initial diameter": di, "final diameter": df, "length": l, "feed": f, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-
-        elif entry ["type"] == "Turning - Taper":
-            col1, col2 = st.columns(2)
-            with col1:
-                dl = st.number_input(f"Larger Diameter (mm)", key=f"turn_taper_dl_{i}", value=50.00)
-                ds = st.number_input(f"Smaller Diameter (mm)", key=f"turn_taper_ds_{i}", value=38.00)
-                l = st.number_input(f"Turning Lenght (mm)", key=f"turn_taper_l_{i}", value=25.00)
-                f = st.number_input(f"Feed (mm/rev)", key=f"turn_taper_f_{i}", value=0.16)
-                n = st.number_input(f"RPM", key=f"turn_taper_n_{i}", value=170)
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"turn_taper_doc_{i}", value=1.00)
-            with col2:
-                js = st.number_input(f"Job Setting Time (min)", key=f"turn_taper_js_{i}", value=0.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"turn_taper_ts_{i}", value=5.00) 
-                a = st.number_input(f"Approach (mm)", key=f"turn_taper_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"turn_taper_o_{i}", value=0.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"turn_taper_t_{i}", value=10.00)
-            entry.update({"larger diameter": dl, "smaller diameter": ds, "length": l, "feed": f, "rpm": n, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})  
-
-        
-        if st.button(f"❌ Remove", key=f"lathe_remove_{i}"):
-            st.session_state.machining1_entries.pop(i)
-            st.rerun()  # Refresh the UI immediately
+    for machine in MACHINES:
+        st.divider()
+        st.header(f"🔩 {machine.name} Machine Inputs")
+        for i, entry in enumerate(st.session_state[machine.entries_key]):
+            operation_card(machine.entries_key, i, entry)
 
-    st.divider()
-    st.header("🔩 Milling Machine Inputs")
-    for i, entry in enumerate(st.session_state.machining2_entries):
-        ptype = entry["type"]
-        st.markdown(f"### 🔧 {ptype} #{i+1}")  
-
-        if entry ["type"] == "Blanking":
-            col1, col2 = st.columns(2)
-            with col1:
-                l = st.number_input(f"Length (mm)", key=f"blank_mil_l_{i}", value=296.00)
-                th = st.number_input(f"Thickness (mm)", key=f"blank_mil_th_{i}", value=8.00)
-                f = st.number_input(f"Feed (mm/teeth)", key=f"blank_mil_f_{i}", value=0.25)
-                n = st.number_input(f"RPM", key=f"blank_mil_n_{i}", value=740)
-                z = st.number_input(f"No. of teeth of cutter", key=f"blank_mil_z_{i}", value=4)
-                p = st.number_input(f"No. of repetition of operation", key=f"blank_mil_p_{i}", value=1.00)
-            with col2:
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"blank_mil_doc_{i}", value=0.20)
-                js = st.number_input(f"Job Setting Time (min)", key=f"blank_mil_js_{i}", value=5.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"blank_mil_ts_{i}", value=5.00)
-                a = st.number_input(f"Approach (mm)", key=f"blank_mil_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"blank_mil_o_{i}", value=10.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"blank_mil_t_{i}", value=10.00)
-            entry.update({"length": l, "thickness": th, "feed": f, "rpm": n, "teeth": z, "repeat":p, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-        
-        if entry ["type"] == "Face Milling - Plain":
-            col1, col2 = st.columns(2)
-            with col1:
-                l = st.number_input(f"Length (mm)", key=f"face_mil_l_{i}", value=296.00)
-                w = st.number_input(f"Width (mm)", key=f"face_mil_w_{i}", value=150.00)
-                thi = st.number_input(f"Initial Thickness (mm)", key=f"face_mil_thi_{i}", value=10.00)
-                thf = st.number_input(f"Final Thickness (mm)", key=f"face_mil_thf_{i}", value=8.00)
-                f = st.number_input(f"Feed (mm/teeth)", key=f"face_mil_f_{i}", value=0.25)
-                n = st.number_input(f"RPM", key=f"face_mil_n_{i}", value=740)
-                z = st.number_input(f"No. of teeth of cutter", key=f"face_mil_z_{i}", value=4)
-                d = st.number_input(f"Cutter Diameter (mm)", key=f"face_mil_d_{i}", value=12.50)
-            with col2:
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"face_mil_doc_{i}", value=0.20)
-                p = st.number_input(f"No. of repetition of operation", key=f"face_mil_p_{i}", value=1.00)
-                js = st.number_input(f"Job Setting Time (min)", key=f"face_mil_js_{i}", value=5.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"face_mil_ts_{i}", value=5.00)
-                a = st.number_input(f"Approach (mm)", key=f"face_mil_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"face_mil_o_{i}", value=10.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"face_mil_t_{i}", value=10.00)
-            entry.update({"length": l, "width":w, "initial thickness": thi, "final thickness": thf, "feed": f, "rpm": n, "teeth": z, "cut dia": d, "repeat":p, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-        
-        if entry ["type"] == "Face Milling - Outer Contour":
-            col1, col2 = st.columns(2)
-            with col1:
-                li = st.number_input(f"Length (mm)", key=f"faceo_mil_li_{i}", value=280.00)
-                lf = st.number_input(f"Final Length (mm)", key=f"faceo_mil_lf_{i}", value=173.00)
-                wi = st.number_input(f"Initial Width (mm)", key=f"faceo_mil_wi_{i}", value=230.00)
-                wf = st.number_input(f"Final Width (mm)", key=f"faceo_mil_wf_{i}", value=153.00)
-                thi = st.number_input(f"Initial Thickness (mm)", key=f"faceo_mil_thi_{i}", value=20.00)
-                thf = st.number_input(f"Final Thickness (mm)", key=f"faceo_mil_thf_{i}", value=5.00)
-                f = st.number_input(f"Feed (mm/teeth)", key=f"faceo_mil_f_{i}", value=0.25)
-                n = st.number_input(f"RPM", key=f"faceo_mil_n_{i}", value=740)
-                d = st.number_input(f"Cutter Diameter (mm)", key=f"faceo_mil_d_{i}", value=12.50)
-            with col2:
-                z = st.number_input(f"No. of teeth of cutter", key=f"faceo_mil_z_{i}", value=4)
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"faceo_mil_doc_{i}", value=0.20)
-                p = st.number_input(f"No. of repetition of operation", key=f"faceo_mil_p_{i}", value=1.00)
-                js = st.number_input(f"Job Setting Time (min)", key=f"faceo_mil_js_{i}", value=5.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"faceo_mil_ts_{i}", value=5.00)
-                a = st.number_input(f"Approach (mm)", key=f"faceo_mil_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"faceo_mil_o_{i}", value=10.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"faceo_mil_t_{i}", value=10.00)
-            entry.update({"initial length": li, "final length": lf, "initial width":wi, "final width":wf, "initial thickness": thi, "final thickness": thf, "feed": f, "rpm": n, "cut dia": d, "teeth": z, "repeat":p, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-        
-        if entry ["type"] == "Side Milling":
-            col1, col2 = st.columns(2)
-            with col1:
-                li = st.number_input(f"Initial Length (mm)", key=f"side_mil_li_{i}", value=306.00)
-                lf = st.number_input(f"Final Length (mm)", key=f"side_mil_lf_{i}", value=296.00)
-                w = st.number_input(f"Width (mm)", key=f"side_mil_w_{i}", value=160.00)
-                th = st.number_input(f"Thickness (mm)", key=f"side_mil_th_{i}", value=10.00)
-                f = st.number_input(f"Feed (mm/teeth)", key=f"side_mil_f_{i}", value=0.25)
-                n = st.number_input(f"RPM", key=f"side_mil_n_{i}", value=740)
-                z = st.number_input(f"No. of teeth of cutter", key=f"side_mil_z_{i}", value=4)
-                d = st.number_input(f"Cutter Diameter (mm)", key=f"side_mil_d_{i}", value=5.00)
-            with col2:
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"side_mil_doc_{i}", value=0.20)
-                p = st.number_input(f"No. of repetition of operation", key=f"side_mil_p_{i}", value=1.00)
-                js = st.number_input(f"Job Setting Time (min)", key=f"side_mil_js_{i}", value=5.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"side_mil_ts_{i}", value=5.00)
-                a = st.number_input(f"Approach (mm)", key=f"side_mil_a_{i}", value=10.00)
-                o = st.number_input(f"Overrun (mm)", key=f"side_mil_o_{i}", value=10.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"side_mil_t_{i}", value=10.00)
-            entry.update({"initial length": li, "final length": lf, "width":w, "thickness": th, "feed": f, "rpm": n, "teeth": z, "cut dia": d, "repeat":p, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-        
-        if entry ["type"] == "Pocket Cutting":
-            col1, col2 = st.columns(2)
-            with col1:
-                l = st.number_input(f"Length (mm)", key=f"pocket_mil_l_{i}", value=40.00)
-                w = st.number_input(f"Width (mm)", key=f"pocket_mil_w_{i}", value=40.00)
-                ith = st.number_input(f"Initial Thickness (mm)", key=f"pocket_mil_ith_{i}", value=8.00)
-                fth = st.number_input(f"Finalal Thickness (mm)", key=f"pocket_mil_fth_{i}", value=0.00)
-                f = st.number_input(f"Feed (mm/teeth)", key=f"pocket_mil_f_{i}", value=0.25)
-                n = st.number_input(f"RPM", key=f"pocket_mil_n_{i}", value=740)
-                z = st.number_input(f"No. of teeth of cutter", key=f"pocket_mil_z_{i}", value=4)
-                d = st.number_input(f"Cutter Diameter (mm)", key=f"pocket_mil_d_{i}", value=12.50)
-            with col2:
-                doc = st.number_input(f"Depth of cut (mm/pass)", key=f"pocket_mil_doc_{i}", value=0.20)
-                p = st.number_input(f"No. of repetition of operation", key=f"pocket_mil_p_{i}", value=1.00)
-                js = st.number_input(f"Job Setting Time (min)", key=f"pocket_mil_js_{i}", value=5.00)
-                ts = st.number_input(f"Tool Setting Time (min)", key=f"pocket_mil_ts_{i}", value=5.00)
-                a = st.number_input(f"Approach (mm)", key=f"pocket_mil_a_{i}", value=0.00)
-                o = st.number_input(f"Overrun (mm)", key=f"pocket_mil_o_{i}", value=0.00)
-                t = st.number_input(f"Tool Cost (Rs)", key=f"pocket_mil_t_{i}", value=10.00)
-            entry.update({"length": l, "width":w, "initial thickness": ith, "final thickness": fth, "feed": f, "rpm": n, "teeth": z, "cut dia": d, "repeat":p, "depth of cut": doc, "job set time": js, "tool set time": ts, "approach": a, "overrun": o, "tool cost": t})
-        
-        if st.button(f"❌ Remove", key=f"milling_remove_{i}"):
-            st.session_state.machining2_entries.pop(i)
-            st.rerun()  # Refresh the UI immediately
-    
-    
     # Step 3: Render input fields for each Other process
     st.divider()
     st.header("📦 Extra Process Inputs")
     for i, entry in enumerate(st.session_state.extra_entries):
-        ptype = entry["type"]
-        st.markdown(f"### {ptype} #{i+1}")
-    
-        if ptype == "Custom":
-            col1, col2 = st.columns(2)
-            with col1:
-                custom_name = st.text_input(f"Enter Custom Process Name", key=f"custom_name_{i}", value=f"Custom #{i+1}")
-            with col2:
-                time = st.number_input(f"Time Taken (min)", key=f"custom_time_{i}", value=5.00)
-                cost_hr = st.number_input(f"Extra Tool Cost (Rs.)", key=f"custom_cost_{i}", value=100.00)
-                entry.update({"custom_name": custom_name, "time_min": time, "extra_tool_cost": cost_hr})
-        
-        elif  ptype == "Blanking":
-            col1, col2 = st.columns(2)
-            with col1:
-                time = st.number_input(f"Time Taken (min)", key=f"blank_time_{i}", value=15.00)
-            with col2:    
-                cost_hr = st.number_input(f"Extra Tool Cost (Rs.)", key=f"blank_cost_{i}", value=50.00)
-            entry.update({"time_min": time, "extra_tool_cost": cost_hr})
-        
-        elif  ptype == "Chamfering":
-            col1, col2 = st.columns(2)
-            with col1:
-                time = st.number_input(f"Time Taken (min)", key=f"chamfer_time_{i}", value=5.00)
-            with col2:    
-                cost_hr = st.number_input(f"Extra Tool Cost (Rs.)", key=f"chamfer_cost_{i}", value=10.00)
-            entry.update({"time_min": time, "extra_tool_cost": cost_hr})
-        
-        elif  ptype == "Parting":
-            col1, col2 = st.columns(2)
-            with col1:
-                time = st.number_input(f"Time Taken (min)", key=f"part_time_{i}", value=20.00)
-            with col2:    
-                cost_hr = st.number_input(f"Extra Tool Cost (Rs.)", key=f"part_cost_{i}", value=50.00)
-            entry.update({"time_min": time, "extra_tool_cost": cost_hr})
-        
-        elif  ptype == "Resharpening":
-            col1, col2 = st.columns(2)
-            with col1:
-                time = st.number_input(f"Time Taken (min)", key=f"resharp_time_{i}", value=35.00)
-            with col2:    
-                cost_hr = st.number_input(f"Extra Tool Cost (Rs.)", key=f"resharp_cost_{i}", value=50.00)
-            entry.update({"time_min": time, "extra_tool_cost": cost_hr})
-
-        elif  ptype == "Tool Change":
-            col1, col2 = st.columns(2)
-            with col1:
-                time = st.number_input(f"Time Taken (min)", key=f"tool_change_time_{i}", value=35.00)
-            with col2:    
-                cost_hr = st.number_input(f"Extra Tool Cost (Rs.)", key=f"tool_change_cost_{i}", value=50.00)
-            entry.update({"time_min": time, "extra_tool_cost": cost_hr})
-
-        if st.button(f"❌ Remove!", key=f"remove!_{i}"):
-            st.session_state.extra_entries.pop(i)
-            st.rerun()
+        extra_card(i, entry)
 
     # Step 4: Submit all
     st.divider()
+    spreads = uncertainty_controls()
     if st.button("✅ Submit All"):
-        
-        total_time_min = 0.0
-        total_extra_cost = 0.0
-        total_tool_cost = 0.0
-
-        machining1_times =[]
-        for i, entry in enumerate(st.session_state.machining1_entries):
-            process_type = entry["type"]
-            time = 0.0
-
-            if process_type == "Boring":
-                try:
-                    a = math.radians((180 - entry["angle"]) / 2)
-                    extra_length = (entry["initial diameter"] / 2) * (math.tan(a))
-                    turn = (entry["final diameter"] - entry["initial diameter"]) / ((entry["depth of cut"]) * 2)
-                    time = (((entry["approach"] + entry["overrun"] + (entry["depth"])) / (entry["rpm"] * entry["feed"]) * (turn * 2)) + (((10 + extra_length) / (entry["feed"] * entry["rpm"])) * (turn * 2))) + (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-            
-            elif process_type == "Drilling - Center":
-                try:
-                    drill_length = ((entry["diameter"] / 2) * (math.tan(math.radians((180 - 118) / 2)))) + entry["depth"]
-                    time = ((entry["approach"] + entry["overrun"] + drill_length) / (entry["rpm"] * entry["feed"]) * (entry["turn"])) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-
-            elif process_type == "Drilling - Pilot":
-                try:
-                    drill_length = ((entry["diameter"] / 2) * (math.tan(math.radians((180 - 118) / 2)))) + entry["depth"]
-                    time = ((entry["approach"] + entry["overrun"] + drill_length) / (entry["rpm"] * entry["feed"]) * (entry["turn"])) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-
-            elif process_type == "Drilling - Main":
-                try:
-                    drill_length = ((entry["diameter"] / 2) * (math.tan(math.radians((180 - 118) / 2)))) + entry["depth"]
-                    time = ((entry["approach"] + entry["overrun"] + drill_length) / (entry["rpm"] * entry["feed"]) * (entry["turn"])) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-            
-            elif process_type == "Facing":
-                try:
-                    turn = (entry["length"]/entry["depth of cut"]) 
-                    time = ((((entry["approach"] + entry["overrun"] + (entry["diameter"] / 2)) / (entry["feed"] * entry["rpm"])) * turn)) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-        
-            elif process_type == "Grooving":
-                try:
-                    turn = (entry["length"]) / (entry["tool width"])
-                    time = ((((entry["approach"] + entry["overrun"] + ((entry["final diameter"] - entry["initial diameter"]) / 2)) / (entry["feed"] * entry["rpm"])) * turn)) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-            
-            elif process_type == "Knurling":
-                try:
-                    time = ((((entry["approach"] + entry["overrun"] + (entry["length"])) / (entry["feed"] * entry["rpm"])) * 2)) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-            
-            elif process_type == "Reaming":
-                try:
-                    turn = (entry["final diameter"] - entry["initial diameter"]) / (2 * entry["depth of cut"])
-                    time = ((((entry["approach"] + entry["overrun"] + (entry["length"])) / (entry["feed"] * entry["rpm"])) * turn)) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-            
-            elif process_type == "Threading":
-                try:
-                    turn = (0.6134 * entry["pitch"]) / (entry["depth of cut"])
-                    time = (((entry["approach"] + entry["overrun"] + (entry["length"])) / (entry["rpm"] * entry["feed"]) * (turn))) +  (entry["job set time"] + entry["tool set time"]) 
-                except ZeroDivisionError:
-                    time = 0
-            
-            elif process_type == "Turning - Concave":
-                try:
-                    concave_length = entry["length"] * (math.radians(entry["angle"]))
-                    turn = (entry["diameter"]) / (entry["depth of cut"] * 4) 
-                    time = ((((entry["approach"] + entry["overrun"] + concave_length) / (entry["feed"] * entry["rpm"])) * turn)) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-
-            elif process_type == "Turning - Convex":
-                try:
-                    convex_length = entry["length"] * (math.radians(entry["angle"]))
-                    turn = (entry["diameter"]) / (entry["depth of cut"] * 4) 
-                    time = ((((entry["approach"] + entry["overrun"] + convex_length) / (entry["feed"] * entry["rpm"])) * turn)) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-            
-            elif process_type == "Turning - Straight":
-                try:
-                    turn = ((entry["initial diameter"]) - (entry["final diameter"])) / ((entry["depth of cut"]) * 2) 
-                    time = ((((entry["approach"] + entry["overrun"] + (entry["length"])) / (entry["feed"] * entry["rpm"])) * turn)) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-
-            elif process_type == "Turning - Taper":
-                try:
-                    h_length = math.sqrt(((entry["length"]) ** 2) + (((entry["larger diameter"] - entry["smaller diameter"]) / 2) ** 2))
-                    turn = (((entry["larger diameter"]) - (entry["smaller diameter"])) / ((entry["depth of cut"]) * 2)) 
-                    time = ((((entry["approach"] + entry["overrun"] + h_length) / (entry["feed"] * entry["rpm"])) * turn)) +  (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-            
-        
-            total_time_min += time
-            total_tool_cost += entry.get("tool cost", 0)
-            mid_cost = (time * (labor_cost_per_hour / 60))
-            machining1_times.append({
-                "process": process_type, 
-                "index": i+1, 
-                "time": time,
-                "cost": mid_cost
-            })
-
-        machining2_times =[]
-        for i, entry in enumerate(st.session_state.machining2_entries):
-            process_type = entry["type"]
-            time = 0.0
-
-            if process_type == "Blanking":
-                try:
-                    turn = (entry["thickness"]) / (entry["depth of cut"])
-                    time = (entry["approach"] + entry["overrun"] + (entry["length"])) / (entry["rpm"] * entry["feed"] * entry["teeth"]) * (turn * (entry["repeat"])) + (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0 
-            
-            if process_type == "Face Milling - Plain":
-                try:
-                    turn1 = ((entry["initial thickness"]) - (entry["final thickness"])) / (entry["depth of cut"])
-                    turn2 = (entry["width"]) / (entry["cut dia"])
-                    time = (entry["approach"] + entry["overrun"] + (entry["length"])) / (entry["rpm"] * entry["feed"] * entry["teeth"]) * (turn1 * turn2 * (entry["repeat"])) + (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-
-            if process_type == "Face Milling - Outer Contour":
-                try:
-                    turn1 = ((entry["initial length"]) - (entry["final length"])) / (entry["cut dia"])
-                    turn2 = ((entry["initial width"]) - (entry["final width"])) / (entry["cut dia"])
-                    turn3 = ((entry["initial thickness"]) - (entry["final thickness"])) / (entry["depth of cut"])
-
-                    t1 = (entry["approach"] + entry["overrun"] + (entry["initial length"])) / (entry["rpm"] * entry["feed"] * entry["teeth"]) * (turn2 * turn3)
-                    t2 = (entry["approach"] + entry["overrun"] + ((entry["initial width"] + entry["final width"]) / 2)) / (entry["rpm"] * entry["feed"] * entry["teeth"]) * (turn1 * turn3)
-                    t3 = (entry["approach"] + entry["overrun"] + ((entry["initial length"] + entry["final length"]) / 2)) / (entry["rpm"] * entry["feed"] * entry["teeth"]) * (turn2 * turn3)
-                    t4 = (entry["approach"] + entry["overrun"] + (entry["final width"])) / (entry["rpm"] * entry["feed"] * entry["teeth"]) * (turn1 * turn3)
-
-                    time =((t1 + t2 + t3 + t4)* (entry["repeat"])) + (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-
-
-            if process_type == "Side Milling":
-                try:
-                    turn1 = (entry["thickness"]) / (entry["depth of cut"])
-                    turn2 = ((entry["initial length"]) - (entry["final length"])) / (entry["cut dia"])
-                    time = (entry["approach"] + entry["overrun"] + (entry["width"])) / (entry["rpm"] * entry["feed"] * entry["teeth"]) * (turn1 * turn2 * (entry["repeat"])) + (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0 
-
-            if process_type == "Pocket Cutting":
-                try:
-                    turn1 = ((entry["initial thickness"]) - (entry["final thickness"])) / (entry["depth of cut"])
-                    turn2 = (entry["width"]) / (entry["cut dia"])
-                    time = (entry["approach"] + entry["overrun"] + (entry["length"])) / (entry["rpm"] * entry["feed"] * entry["teeth"]) * (turn1 * turn2 * (entry["repeat"])) + (entry["job set time"] + entry["tool set time"])
-                except ZeroDivisionError:
-                    time = 0
-
-            total_time_min += time
-            total_tool_cost += entry.get("tool cost", 0)
-            mid_cost = (time * (labor_cost_per_hour / 60))
-            machining2_times.append({
-                "process": process_type, 
-                "index": i+1, 
-                "time": time,
-                "cost": mid_cost 
-            })
-
-        extra_times = []
-        for i, entry in enumerate(st.session_state.extra_entries):
-            ptype = entry["type"]
-            minutes = entry.get("time_min", 0.0)
-            cost_hr = entry.get("extra_tool_cost", 0.0)
-
-            minutes_with_overhead = minutes + 5
-            total_time_min += minutes_with_overhead
-            total_extra_cost += cost_hr
-
-            # Handle label
-            if ptype == "Custom":
-                label = entry.get("custom_name", f"Custom #{i+1}")
-            else:
-                label = ptype
-
-            extra_times.append({
-                "ptype": label,
-                "index": i + 1,
-                "time": minutes_with_overhead,
-                "cost": cost_hr
-            })
-
-
-        st.session_state.total_time_min = total_time_min
-        st.session_state.total_extra_cost = total_extra_cost
-        st.session_state.material_cost = material_cost
-        st.session_state.tool_cost = total_tool_cost
-        st.session_state.labor_cost = (total_time_min / 60) * labor_cost_per_hour
-        st.session_state.total_cost = material_cost + st.session_state.labor_cost + total_extra_cost + total_tool_cost
+        route = (
+            st.session_state.machining1_entries,
+            st.session_state.machining2_entries,
+            st.session_state.extra_entries,
+            material_cost,
+            labor_cost_per_hour,
+        )
+        cache_key = route_key(*route, spreads)
+        cached = estimate_cache().get(cache_key)
+        if cached is None:
+            timings = {} if profiling.active() else None
+            with profiling.phase("submit_all"):
+                result = compact_times(asdict(estimate_job(*route, timings)))
+            for ptype, seconds in (timings or {}).items():
+                profiling.record("submit_all", seconds, process=ptype)
+            with profiling.phase("uncertainty"):
+                uncertainty = route_uncertainty(spreads, *route)
+            estimate_cache().put(cache_key, (result, uncertainty))
+        else:
+            result, uncertainty = cached
+        st.session_state.uncertainty = uncertainty
+        st.session_state[SUBMITTED_ENTRIES] = submitted_entries(st.session_state)
+        for key, value in result.items():
+            st.session_state[key] = value
+        st.session_state.labor_cost_per_hour = labor_cost_per_hour
         st.session_state.result_ready = True
-        st.session_state.machining1_times = machining1_times
-        st.session_state.machining2_times = machining2_times
-        st.session_state.extra_times = extra_times
         st.session_state.page = "Result"
         st.rerun()
 
 
-from fpdf import FPDF
-import streamlit as st
-import tempfile
-import os
-
-class PDF(FPDF):
-    def header(self):
-        self.set_font('Helvetica', 'B', 14)
-        self.cell(0, 10, 'Machining Time & Cost Estimate', ln=True, align='C')
-        self.ln(5)
-
-    def footer(self):
-        self.set_y(-15)
-        self.set_font("Helvetica", "I", 8)
-        self.cell(0, 10, f'Page {self.page_no()}', align='C')
-
-    def table(self, title, data_list):
-        if not data_list:
-            return
-
-        self.add_page()
-        self.set_font("Helvetica", 'B', 12)
-        self.cell(0, 10, title, ln=True)
-        self.set_font("Helvetica", '', 10)
-        self.ln(2)
-
-        keys = list(data_list[0].keys())
-        epw = self.w - 2 * self.l_margin
-        col_width = max(30, epw / min(len(keys), 6))  # reasonable width per column
-        columns_per_page = int(epw // col_width)
-        total_pages = math.ceil(len(keys) / columns_per_page)
-
-        for page in range(total_pages):
-            start_col = page * columns_per_page
-            end_col = start_col + columns_per_page
-            current_keys = keys[start_col:end_col]
-
-            if page > 0:
-                self.add_page()
-                self.set_font("Helvetica", 'B', 12)
-                self.cell(0, 10, f"{title} (continued)", ln=True)
-                self.set_font("Helvetica", '', 10)
-                self.ln(2)
-
-            # Table header
-            self.set_font("Helvetica", 'B', 9)
-            for k in current_keys:
-                self.cell(col_width, 8, k[:15], border=1)
-            self.ln()
-
-            # Table rows
-            self.set_font("Helvetica", '', 9)
-            for row in data_list:
-                for k in current_keys:
-                    val = str(row.get(k, ""))
-                    self.cell(col_width, 8, val[:20], border=1)
-                self.ln()
-                # Page break if needed
-                if self.get_y() > 270:
-                    self.add_page()
-                    # Reprint header on new page
-                    self.set_font("Helvetica", 'B', 9)
-                    for k in current_keys:
-                        self.cell(col_width, 8, k[:15], border=1)
-                    self.ln()
-                    self.set_font("Helvetica", '', 9)
-
-def generate_pdf():
-    pdf = PDF()
-    pdf.set_auto_page_break(auto=True, margin=15)
-    pdf.add_page()
-    pdf.set_font("Helvetica", size=10)
-
-    # --- Summary Table ---
-    pdf.set_font("Helvetica", 'B', 12)
-    pdf.cell(0, 10, 'Summary', ln=True)
-    pdf.set_font("Helvetica", '', 10)
-
-    summary_data = [
-        ["Total Time (hr:min)", f"{int(st.session_state.total_time_min//60)}:{int(st.session_state.total_time_min%60)}"],
-        ["Labor Cost (Rs.)", f"{st.session_state.labor_cost:.2f}"],
-        ["Job Material", f"{st.session_state.job_material}"],
-        ["Material Cost (Rs.)", f"{st.session_state.material_cost:.2f}"],
-        ["Tool Cost (Rs.)", f"{st.session_state.tool_cost:.2f}"],
-        ["Extra Process Cost (Rs.)", f"{st.session_state.total_extra_cost:.2f}"],
-        ["Total Estimated Cost (Rs.)", f"{st.session_state.total_cost:.2f}"]
-    ]
-    for row in summary_data:
-        pdf.cell(60, 8, row[0], border=1)
-        pdf.cell(80, 8, row[1], border=1)
-        pdf.ln()
-
-    pdf.ln(5)
-
-    # --- Process Time Tables ---
-    if st.session_state.machining1_times:
-        pdf.set_font("Helvetica", 'B', 12)
-        pdf.cell(0, 10, 'Lathe Machining Time', ln=True)
-        pdf.set_font("Helvetica", 'B', 10)
-        pdf.cell(50, 8, "Process", border=1)
-        pdf.cell(40, 8, "Time (min)", border=1)
-        pdf.cell(40, 8, "Cost (Rs.)", border=1)
-        pdf.ln()
-        pdf.set_font("Helvetica", '', 10)
-        for t in st.session_state.machining1_times:
-            pdf.cell(50, 8, f"{t['process']} #{t['index']}", border=1)
-            pdf.cell(40, 8, f"{t['time']:.2f}", border=1)
-            pdf.cell(40, 8, f"{t['cost']:.2f}", border=1)
-            pdf.ln()
-        pdf.ln(5)
-
-    if st.session_state.machining2_times:
-        pdf.set_font("Helvetica", 'B', 12)
-        pdf.cell(0, 10, 'Milling Machine Time', ln=True)
-        pdf.set_font("Helvetica", 'B', 10)
-        pdf.cell(50, 8, "Process", border=1)
-        pdf.cell(40, 8, "Time (min)", border=1)
-        pdf.cell(40, 8, "Cost (Rs.)", border=1)
-        pdf.ln()
-        pdf.set_font("Helvetica", '', 10)
-        for t in st.session_state.machining2_times:
-            pdf.cell(50, 8, f"{t['process']} #{t['index']}", border=1)
-            pdf.cell(40, 8, f"{t['time']:.2f}", border=1)
-            pdf.cell(40, 8, f"{t['cost']:.2f}", border=1)
-            pdf.ln()
-        pdf.ln(5)
-
-    if st.session_state.extra_times:
-        pdf.set_font("Helvetica", 'B', 12)
-        pdf.cell(0, 10, 'Extra Processes', ln=True)
-        pdf.set_font("Helvetica", 'B', 10)
-        pdf.cell(50, 8, "Process", border=1)
-        pdf.cell(40, 8, "Time (min)", border=1)
-        pdf.cell(40, 8, "Cost (Rs.)", border=1)
-        pdf.ln()
-        pdf.set_font("Helvetica", '', 10)
-        for t in st.session_state.extra_times:
-            pdf.cell(50, 8, f"{t['ptype']} #{t['index']}", border=1)
-            pdf.cell(40, 8, f"{t['time']:.2f}", border=1)
-            pdf.cell(40, 8, f"{t['cost']:.2f}", border=1)
-            pdf.ln()
-        pdf.ln(5)
-
-    # --- Full DataFrames ---
-    #pdf.table("Machining Entries", st.session_state.machining1_entries)
-    #pdf.table("Extra Process Entries", st.session_state.extra_entries)
-
-    # Save and offer download
-    from io import BytesIO
-
-    # Generate PDF content as string, then encode to bytes
-    pdf_data = pdf.output(dest='S').encode('latin-1')
-
-
-    # Write to in-memory buffer
-    pdf_buffer = BytesIO()
-    pdf_buffer.write(pdf_data)
-    pdf_buffer.seek(0)
-
-    # Streamlit download button
-    st.download_button( label="⬇️ Download Full PDF", data=pdf_buffer, file_name="machining_full_result.pdf", mime="application/pdf" )
+@st.cache_resource
+def estimate_cache():
+    # Shared by all sessions, so a route priced before is not computed again.
+    return EstimateCache()
+
+
+@st.cache_resource
+def pdf_cache():
+    # Shared by all sessions, so re-exporting an estimate is served from memory.
+    return PdfCache()
+
+
+def generate_pdf(detail=False):
+    # Built on the cache's worker threads; pdf_download() shows it once it is ready.
+    with profiling.phase("pdf_submit", detail=detail):
+        st.session_state.pdf_job = pdf_cache().submit(result_state(st.session_state), detail)
+
+
+# Only drawn while a build is running, so the session only polls until the PDF is ready.
+@st.fragment(run_every=0.5)
+def pdf_progress(job):
+    if job.done():
+        st.rerun()
+    st.progress(job.progress, text="Building PDF…")
+
+
+def pdf_download():
+    job = st.session_state.get("pdf_job")
+    if job is None:
+        return
+    if not job.done():
+        pdf_progress(job)
+    elif job.future.exception() is not None:
+        st.error(f"The PDF could not be built: {job.future.exception()}")
+    else:
+        # Streamlit download button
+        st.download_button( label="⬇️ Download Full PDF", data=job.result(), file_name="machining_full_result.pdf", mime="application/pdf" )
+
+
+TABLE_LABELS = {"machine": "Machine", "index": "#", "time_min": "Time (min)", "cost": "Cost (Rs.)"}
+ROUTE_LABELS = {
+    **TABLE_LABELS, "step": "Step", "process": "Process", "cumulative_time_min": "Cumulative Time (min)",
+}
+PARETO_BY = {"Time": "time_min", "Cost": "cost"}
+PARETO_LABELS = {**TABLE_LABELS, "process": "Process", "operations": "Operations", "cumulative_share": "Cumulative Share"}
+
+
+class ResultView(NamedTuple):
+    key: str
+    tables: object  # result_tables.ResultTables
+    frames: dict  # table name -> display frame of the per-process parameters
+    route: object  # route sheet display frame
+    pareto: dict  # "time_min" / "cost" -> Pareto display frame
+    split: object  # lotsize.LotSplit
+
+
+def current_result():
+    """Everything the Result page shows of the submitted result, rebuilt only when the result changes."""
+    # The submitted entries, not the live cards, so each operation's parameters match its time.
+    snapshot = result_state(st.session_state)
+    state = {key: snapshot.get(key, []) for key in TABLE_KEYS}
+    key = state_key(state)
+    cached = st.session_state.get("_result_view")
+    if cached is None or cached.key != key:
+        # A PDF of the previous result is not offered for this one.
+        st.session_state.pop("pdf_job", None)
+        tables = result_tables(state)
+        frames = {}
+        for ptype, cls in PROCESSES.items():
+            if table_name(ptype) in tables.processes:
+                labels = {**TABLE_LABELS, **{i.name: i.widget_label for i in cls.inputs}}
+                frames[table_name(ptype)] = frame(tables.processes[table_name(ptype)]).rename(columns=labels)
+        frames[EXTRA_TABLE] = frame(tables.extra).rename(columns={**TABLE_LABELS, "type": "Type", "label": "Process"})
+        cached = st.session_state["_result_view"] = ResultView(
+            key, tables, frames,
+            route=frame(tables.route).rename(columns=ROUTE_LABELS),
+            pareto={by: frame(pareto(tables.route, by)).rename(columns=PARETO_LABELS) for by in PARETO_BY.values()},
+            split=lot_split(state),
+        )
+    return cached
+
+
+def pareto_chart(data, by):
+    """Bars of time or cost per process, largest first, under the line of their cumulative share."""
+    value = PARETO_LABELS[by]
+    x = {"field": "Process", "type": "nominal", "sort": None}
+    st.vega_lite_chart(data, {
+        "layer": [
+            {
+                "mark": "bar",
+                "encoding": {
+                    "x": x, "y": {"field": value, "type": "quantitative"},
+                    "tooltip": [
+                        {"field": "Process"}, {"field": "Operations"},
+                        {"field": "Time (min)", "format": ".2f"}, {"field": "Cost (Rs.)", "format": ".2f"},
+                    ],
+                },
+            },
+            {
+                "mark": {"type": "line", "point": True, "color": "#d62728"},
+                "encoding": {
+                    "x": x,
+                    "y": {
+                        "field": "Cumulative Share", "type": "quantitative",
+                        "scale": {"domain": [0, 1]}, "axis": {"format": "%"},
+                    },
+                    "tooltip": [{"field": "Process"}, {"field": "Cumulative Share", "format": ".1%"}],
+                },
+            },
+        ],
+        "resolve": {"scale": {"y": "independent"}},
+    })
+
+
+def generate_tables(tables, fmt):
+    st.download_button(
+        label=f"⬇️ Download {fmt.upper()} Tables", data=export_zip(tables, fmt),
+        file_name=f"machining_result_{fmt}.zip", mime="application/zip",
+    )
 
 
 def Result():
@@ -879,47 +266,67 @@ def Result():
     
     if "extra_times" not in st.session_state:
         st.session_state.extra_times = []
+    view = current_result()
 
     st.subheader("✅ Summary")
-    st.success(f"⏱️ Total Time: {st.session_state.total_time_min//60:.2f} hr {st.session_state.total_time_min%60:.2f} min")
-    st.success(f"👷 Labor Cost: Rs. {st.session_state.labor_cost:.2f}")
-    st.success(f"📦 Job Material : {st.session_state.job_material}")
-    st.success(f"📦 Material Cost: Rs. {st.session_state.material_cost:.2f}")
-    st.success(f"🧰 Tool Cost: Rs. {st.session_state.tool_cost:.2f}")
-    st.success(f"➕ Extra Process Tool Cost: Rs. {st.session_state.total_extra_cost:.2f}")
+    st.success("  \n".join([
+        f"⏱️ Total Time: {st.session_state.total_time_min//60:.2f} hr {st.session_state.total_time_min%60:.2f} min",
+        f"👷 Labor Cost: Rs. {st.session_state.labor_cost:.2f}",
+        f"📦 Job Material : {st.session_state.job_material}",
+        f"📦 Material Cost: Rs. {st.session_state.material_cost:.2f}",
+        f"🧰 Tool Cost: Rs. {st.session_state.tool_cost:.2f}",
+        f"➕ Extra Process Tool Cost: Rs. {st.session_state.total_extra_cost:.2f}",
+    ]))
     st.header(f"💰 Total Estimated Cost: Rs. {st.session_state.total_cost:.2f}")
+    uncertainty_summary()
 
-    st.markdown("---")
-    st.subheader("⚙️ Lathe Machining Time")
-    for t in st.session_state.machining1_times:
-        if 'cost' not in t:
-            st.write("Missing 'cost' in:", t)
-        st.write(f"{t['process']} #{t['index']} → {t['time']:.2f} min → Rs. {t['cost']:.2f}")
+    st.divider()
+    st.subheader("🧾 Route Sheet")
+    st.dataframe(view.route, hide_index=True, column_config={
+        label: st.column_config.NumberColumn(format="%.2f")
+        for label in ("Time (min)", "Cost (Rs.)", "Cumulative Time (min)")
+    })
 
-    st.subheader("📋 Lathe Machine Entries")
-    st.dataframe(st.session_state.machining1_entries)
+    st.subheader("📊 Pareto")
+    by = st.radio("Rank processes by", list(PARETO_BY), horizontal=True, key="pareto_by")
+    pareto_chart(view.pareto[PARETO_BY[by]], PARETO_BY[by])
 
     st.divider()
-    st.subheader("⚙️ Milling Machining Time")
-    for t in st.session_state.machining2_times:
-        if 'cost' not in t:
-            st.write("Missing 'cost' in:", t)
-        st.write(f"{t['process']} #{t['index']} → {t['time']:.2f} min → Rs. {t['cost']:.2f}")
-
-    st.subheader("📋 Milling Machine Entries")
-    st.dataframe(st.session_state.machining2_entries)
+    lot_size_panel(view.split)
 
     st.divider()
-    st.subheader("➕ Other Processes")
-    for t in st.session_state.extra_times:
-        st.write(f"{t['ptype']} #{t['index']} → {t['time']:.2f} min → Rs. {t['cost']:.2f}")
-    
-    st.subheader("📋 All Other Entries")
-    st.dataframe(st.session_state.extra_entries)
+    with st.expander("📋 Operation Parameters"):
+        for machine in MACHINES:
+            for ptype in processes_for(machine.name):
+                if table_name(ptype) in view.frames:
+                    st.caption(f"{machine.name} · {ptype}")
+                    st.dataframe(view.frames[table_name(ptype)], hide_index=True)
+        if len(view.frames[EXTRA_TABLE]):
+            st.caption("Other Processes")
+            st.dataframe(view.frames[EXTRA_TABLE], hide_index=True)
 
     st.markdown("---")
+    detail = st.checkbox("Include operation parameters (full detail)", key="pdf_detail")
     if st.button("Export as PDF"):
-        generate_pdf()
+        generate_pdf(detail)
+    pdf_download()
+    col1, col2 = st.columns([1, 3])
+    fmt = col1.selectbox("Table format", list(FORMATS), format_func=str.upper, key="table_format")
+    if col2.button("Export tables (one file per process type)"):
+        generate_tables(view.tables, fmt)
+
+    st.markdown("---")
+    save_quote_form()
+
+
+# Card edits only rerun their own fragment, so the sidebar polls the running totals.
+# It is only drawn (and so only polls) while the Machining page is open.
+@st.fragment(run_every=1)
+def live_totals_panel():
+    totals = st.session_state.live_totals
+    st.markdown("### 📈 Live Totals")
+    st.metric("⏱️ Total Time", f"{int(totals.total_time_min//60)} hr {totals.total_time_min%60:.2f} min")
+    st.metric("💰 Total Cost", f"Rs. {totals.total_cost:.2f}")
 
 
 # --- Sidebar Navigation with Buttons ---
@@ -934,6 +341,14 @@ if st.sidebar.button("🛠️ Machining"):
     st.session_state.page = "Machining"
 if st.sidebar.button("📄 Result"):
     st.session_state.page = "Result"
+if st.sidebar.button("🗂️ Quotes"):
+    st.session_state.page = "Quotes"
+if st.sidebar.button("📈 Sensitivity"):
+    st.session_state.page = "Sensitivity"
+if st.sidebar.button("🎯 Optimize"):
+    st.session_state.page = "Optimize"
+if st.sidebar.button("🗓️ Schedule"):
+    st.session_state.page = "Schedule"
 
 # 🔄 Add Reset Button
 st.sidebar.markdown("---")
@@ -946,10 +361,22 @@ if st.sidebar.button("🔄 Reset All Data"):
 pages = {
     "Home": Home,
     "Machining": Machining,
-    "Result": Result
+    "Result": Result,
+    "Quotes": quotes_page,
+    "Sensitivity": sensitivity_page,
+    "Optimize": optimizer_page,
+    "Schedule": schedule_page,
 }
 
 # --- Load Selected Page ---
-pages[st.session_state.page]()
+with profiling.rerun(st.session_state.page):
+    pages[st.session_state.page]()
+
+with st.sidebar:
+    if st.session_state.page == "Machining" and "live_totals" in st.session_state:
+        live_totals_panel()
+    profiling.profiling_panel(
+        {"Estimates": estimate_cache().stats()}, [machine.entries_key for machine in MACHINES] + ["extra_entries"],
+    )
 
 
@@ -0,0 +1,102 @@
+"""Parameter sweeps and sensitivity of a route's time and cost.
+
+A sweep evaluates the route for every combination of values along one or
+more axes (feed, rpm, depth of cut, ...) in one broadcast pass per process
+type. It reuses the kernels in ``batch_estimator.py``: for two axes the
+columns of the n targeted operations have shape ``(n, 1, 1)``, a column swept
+along the first axis ``(n, g1, 1)`` and one along the second ``(n, 1, g2)``.
+The kernels then produce the whole ``(n, g1, g2)`` time surface, which is
+summed over the operations.
+
+Axis values are absolute when a single operation is swept. Across several
+operations they are multipliers of each operation's own value, since
+e.g. a lathe feed (mm/rev) and a milling feed (mm/tooth) are not comparable.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from batch_estimator import KERNELS, estimate_route, operation_times, process_columns, process_times
+from estimator import PROCESSES
+
+SWEEP_FIELDS = ("feed", "rpm", "depth_of_cut", "teeth", "cut_dia")
+FIELD_LABELS = {"feed": "Feed", "rpm": "RPM", "depth_of_cut": "Depth of cut", "teeth": "No. of teeth", "cut_dia": "Cutter dia"}
+
+
+@dataclass
+class SweepGrid:
+    """Route totals over a grid; ``time`` and ``cost`` have one dimension per axis."""
+
+    fields: tuple
+    values: tuple
+    time: np.ndarray
+    cost: np.ndarray
+
+
+class RouteSweep:
+    def __init__(self, lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour):
+        self.entries = [*lathe_entries, *milling_entries]
+        self.labor_cost_per_hour = labor_cost_per_hour
+        base = estimate_route(lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour)
+        self.base = base
+        self.op_times = operation_times(self.entries)
+        # Costs that no cutting parameter changes.
+        self.fixed_cost = base.material_cost + base.tool_cost + base.total_extra_cost
+        self.extra_time = sum(t["time"] for t in base.extra_times)
+
+    def _cost(self, time):
+        return self.fixed_cost + (time / 60) * self.labor_cost_per_hour
+
+    def grid(self, axes, targets=None, scale=None):
+        """Route time and cost for every combination of ``axes`` (``[(field, values), ...]``).
+
+        ``targets`` are indexes into the route (lathe then milling entries); all
+        operations by default. ``scale`` defaults to True unless exactly one
+        operation is targeted. Operations without a field ignore that axis.
+        """
+        targets = range(len(self.entries)) if targets is None else targets
+        targets = [i for i in targets if self.entries[i]["type"] in KERNELS]
+        if scale is None:
+            scale = len(targets) != 1
+        fields = tuple(field for field, _ in axes)
+        values = tuple(np.asarray(v, dtype=float) for _, v in axes)
+        shape = tuple(len(v) for v in values)
+        ndim = len(axes)
+
+        untouched = np.ones(len(self.entries), dtype=bool)
+        untouched[targets] = False
+        total = np.full(shape, self.extra_time + self.op_times[untouched].sum())
+
+        groups = {}
+        for i in targets:
+            groups.setdefault(self.entries[i]["type"], []).append(self.entries[i])
+        for ptype, rows in groups.items():
+            columns = {name: col.reshape((len(rows),) + (1,) * ndim) for name, col in process_columns(ptype, rows).items()}
+            for k, (field, v) in enumerate(zip(fields, values)):
+                if field not in columns:
+                    continue
+                axis = [1] * ndim
+                axis[k] = len(v)
+                v = v.reshape([1] + axis)
+                columns[field] = columns[field] * v if scale else np.broadcast_to(v, (len(rows), *axis))
+            total = total + process_times(ptype, columns).sum(axis=0)
+        return SweepGrid(fields, values, total, self._cost(total))
+
+    def tornado(self, fields=SWEEP_FIELDS, low=0.8, high=1.2, targets=None):
+        """Route cost with each field scaled to ``low`` and ``high`` in turn, widest swing first.
+
+        Returns ``(field, cost at low, cost at high)`` for the fields present in the targeted operations.
+        """
+        present = {i.name for e in self._targeted(targets) for i in PROCESSES[e["type"]].inputs}
+        bars = []
+        for field in fields:
+            if field not in present:
+                continue
+            cost = self.grid([(field, [low, high])], targets, scale=True).cost
+            bars.append((field, float(cost[0]), float(cost[1])))
+        return sorted(bars, key=lambda bar: abs(bar[2] - bar[1]), reverse=True)
+
+    def _targeted(self, targets):
+        entries = self.entries if targets is None else [self.entries[i] for i in targets]
+        return [e for e in entries if e["type"] in KERNELS]
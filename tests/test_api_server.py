@@ -0,0 +1,34 @@
+"""Request parsing of the estimation API."""
+
+import asyncio
+
+import pytest
+
+from api_server import MAX_BODY, HttpError, read_request
+
+
+def _read(raw):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await read_request(reader)
+    return asyncio.run(read())
+
+
+def test_body_is_read_by_content_length():
+    request = _read(b'POST /estimate?x=1 HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}')
+    assert (request.method, request.path, request.keep_alive, request.body) == ("POST", "/estimate", True, b"{}")
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-1", b"1.5"])
+def test_bad_content_length_is_a_400(length):
+    with pytest.raises(HttpError) as e:
+        _read(b"POST /estimate HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n{}")
+    assert e.value.status == 400
+
+
+def test_oversized_body_is_a_413():
+    with pytest.raises(HttpError) as e:
+        _read(b"POST /estimate HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (MAX_BODY + 1))
+    assert e.value.status == 413
@@ -0,0 +1,90 @@
+"""The vectorized estimates equal the scalar ones, value for value."""
+
+import random
+from dataclasses import asdict
+
+import pytest
+
+from batch_estimator import estimate_jobs, estimate_route
+from estimator import EXTRA_PROCESS_TYPES, LATHE, MILLING, PROCESSES, estimate_job, processes_for
+
+
+def _value(rng):
+    r = rng.random()
+    if r < 0.1:
+        return 0
+    if r < 0.2:
+        return rng.uniform(-5, 0)
+    if r < 0.3:
+        return rng.randint(1, 10)
+    return rng.uniform(0, 300)
+
+
+def _entry(rng, ptype):
+    return {"type": ptype, **{field.key: _value(rng) for field in PROCESSES[ptype].inputs}}
+
+
+def _extra(rng):
+    ptype = rng.choice(list(EXTRA_PROCESS_TYPES))
+    entry = {"type": ptype, "time_min": _value(rng), "extra_tool_cost": _value(rng)}
+    if ptype == "Custom" and rng.random() < 0.5:
+        entry["custom_name"] = rng.choice(["", "Deburr"])
+    return entry
+
+
+def _route(rng, machine, max_ops):
+    ptypes = list(processes_for(machine))
+    return [_entry(rng, rng.choice(ptypes)) for _ in range(rng.randint(0, max_ops))]
+
+
+def random_job(rng, max_ops=15):
+    return {
+        "material_cost": rng.uniform(0, 2000),
+        "labor_cost_per_hour": rng.uniform(0, 900),
+        "machining1_entries": _route(rng, LATHE, max_ops),
+        "machining2_entries": _route(rng, MILLING, max_ops),
+        "extra_entries": [_extra(rng) for _ in range(rng.randint(0, 4))],
+    }
+
+
+def _scalar(job):
+    return estimate_job(
+        job["machining1_entries"], job["machining2_entries"], job["extra_entries"],
+        job["material_cost"], job["labor_cost_per_hour"],
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_estimate_jobs_matches_estimate_job(seed):
+    rng = random.Random(seed)
+    jobs = [random_job(rng) for _ in range(60)]
+    batch = estimate_jobs(jobs)
+    for k, job in enumerate(jobs):
+        assert asdict(batch.job_estimate(k)) == asdict(_scalar(job))
+
+
+@pytest.mark.parametrize("ptype", list(PROCESSES))
+@pytest.mark.parametrize("value", [0, -1.5])
+def test_zero_and_negative_inputs_match(ptype, value):
+    # Every input set in turn to a zero or negative value, including the divisors.
+    for field in PROCESSES[ptype].inputs:
+        entry = {"type": ptype, **{f.key: f.default for f in PROCESSES[ptype].inputs}, field.key: value}
+        job = {
+            "material_cost": 100.0, "labor_cost_per_hour": 500.0,
+            "machining1_entries": [], "machining2_entries": [], "extra_entries": [],
+        }
+        job["machining1_entries" if PROCESSES[ptype].machine == LATHE else "machining2_entries"] = [entry]
+        assert asdict(estimate_jobs([job]).job_estimate(0)) == asdict(_scalar(job)), field.name
+
+
+def test_estimate_route_matches_estimate_job():
+    job = random_job(random.Random(42))
+    routed = estimate_route(
+        job["machining1_entries"], job["machining2_entries"], job["extra_entries"],
+        job["material_cost"], job["labor_cost_per_hour"],
+    )
+    assert asdict(routed) == asdict(_scalar(job))
+
+
+def test_empty_portfolio():
+    assert len(estimate_jobs([])) == 0
@@ -0,0 +1,60 @@
+"""Per-job errors and input defaults of the batch CLI."""
+
+import io
+
+from conftest import EXTRA_ENTRIES, default_entry, route
+from estimate_cli import JobError, estimate_chunk, read_csv_jobs, read_jsonl_jobs
+
+
+def _job(job_id, **entries):
+    lathe, milling = route(6)
+    return {
+        "job_id": job_id, "job_material": "Steel", "material_cost": 1000.0, "labor_cost_per_hour": 500.0,
+        "machining1_entries": lathe, "machining2_entries": milling, "extra_entries": EXTRA_ENTRIES, **entries,
+    }
+
+
+def test_a_bad_job_gets_an_error_record_and_the_rest_are_estimated():
+    jobs = [_job(k) for k in range(10)]
+    jobs[3] = _job(3, machining1_entries=[{"type": "Bogus"}])
+    jobs[7] = _job(7, machining2_entries=[{**route(2)[1][0], "feed": "x"}])
+    records = estimate_chunk(jobs)
+    assert [record["job_id"] for record in records] == list(range(10))
+    assert [k for k, record in enumerate(records) if "error" in record] == [3, 7]
+    assert "unknown lathe process" in records[3]["error"]
+    good = [record for record in records if "error" not in record]
+    assert all(record == good[0] | {"job_id": record["job_id"]} for record in good)
+
+
+def test_missing_inputs_take_the_card_defaults():
+    partial = _job("p", machining1_entries=[{"type": "Facing"}], machining2_entries=[])
+    full = _job("p", machining1_entries=[default_entry("Facing")], machining2_entries=[])
+    assert estimate_chunk([partial]) == estimate_chunk([full])
+
+
+def test_a_job_that_is_not_an_object_is_an_error():
+    assert "error" in estimate_chunk(["not a job"])[0]
+
+
+def test_csv_jobs_with_a_bad_cell_or_machine_become_errors():
+    jobs = list(read_csv_jobs(io.StringIO(
+        "job_id,machine,type,feed\n"
+        "1,lathe,Facing,0.2\n"
+        "2,lathe,Facing,abc\n"
+        "2,lathe,Facing,0.1\n"
+        "3,drill press,Facing,\n"
+        "4,lathe,Facing,0.3\n"
+    )))
+    assert [job.job_id if isinstance(job, JobError) else None for job in jobs] == [None, "2", "3", None]
+    assert jobs[1].error == "line 3: feed: 'abc' is not a number"
+    assert "unknown machine 'drill press'" in jobs[2].error
+    records = estimate_chunk(jobs)
+    assert ["error" in record for record in records] == [False, True, True, False]
+
+
+def test_jsonl_lines_that_are_not_job_objects_become_errors():
+    jobs = list(read_jsonl_jobs(io.StringIO('{"job_id": "a"}\n{oops\n\n[1, 2]\n{}\n')))
+    assert jobs[0]["job_id"] == "a" and jobs[3] == {"job_id": 5}
+    assert jobs[1] == JobError(2, jobs[1].error) and "not valid JSON" in jobs[1].error
+    assert jobs[2] == JobError(4, "line 4: a job must be a JSON object")
+    assert [record["job_id"] for record in estimate_chunk(jobs) if "error" in record] == [2, 4]
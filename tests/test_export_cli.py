@@ -0,0 +1,50 @@
+"""Snapshots of the bulk route sheet export."""
+
+from conftest import default_entry
+from estimate_cli import JobError
+from export_cli import job_state, render_job
+from lotsize import lot_split
+from report import detail_tables
+
+
+def _entry(ptype, **values):
+    return {**default_entry(ptype), **values}
+
+
+def test_job_state_keeps_the_entries_for_detail_tables_and_setup():
+    job = {
+        "job_id": "A-1", "material_cost": 100.0, "labor_cost_per_hour": 600.0,
+        "machining1_entries": [
+            _entry("Facing", **{"job set time": 4.0, "tool set time": 2.0}),
+            _entry("Facing", **{"job set time": 0.0, "tool set time": 1.5}),
+        ],
+        "machining2_entries": [_entry("Side Milling", **{"job set time": 3.0, "tool set time": 0.5})],
+        "extra_entries": [{"type": "Chamfering", "time_min": 5.0, "extra_tool_cost": 10.0}],
+    }
+    state = job_state(job)
+
+    tables = {title: (rows, n) for title, _, rows, n in detail_tables(state)}
+    assert {title: n for title, (_, n) in tables.items()} == {
+        "Lathe Entries: Facing": 2, "Milling Entries: Side Milling": 1, "Extra Process Entries": 1,
+    }
+    first_row = next(iter(tables["Lathe Entries: Facing"][0]()))[0]
+    assert first_row[0] == 1 and 4.0 in first_row
+
+    split = lot_split(state)
+    assert split.setup_min == 11.0
+    assert split.setup_min + split.cycle_min == state["total_time_min"]
+
+
+def test_partial_entries_take_the_card_defaults():
+    partial = job_state({"job_id": 1, "machining1_entries": [{"type": "Facing"}]})
+    full = job_state({"job_id": 1, "machining1_entries": [_entry("Facing")]})
+    assert partial == full
+
+
+def test_a_job_that_cannot_be_rendered_is_reported_not_raised():
+    bad = {"job_id": "B", "machining1_entries": [{"type": "Bogus"}]}
+    assert render_job(4, bad, False)[:3] == (4, "B", None)
+    assert "unknown lathe process" in render_job(4, bad, False)[3]
+    assert render_job(5, JobError(6, "line 6: a job must be a JSON object"), False) == (
+        5, 6, None, "line 6: a job must be a JSON object",
+    )
@@ -0,0 +1,17 @@
+"""Setup and cycle split of a submitted result."""
+
+from conftest import submitted_state
+from lotsize import lot_split
+from report import result_state
+
+
+def test_split_uses_the_submitted_entries_not_the_live_cards():
+    state = submitted_state(4)
+    split = lot_split(result_state(state))
+    assert split.setup_min > 0
+    assert split.setup_min + split.cycle_min == state["total_time_min"]
+
+    # Cards edited after "Submit All" do not change the submitted result.
+    state["machining1_entries"] = []
+    state["machining2_entries"][0]["job set time"] = 99.0
+    assert lot_split(result_state(state)) == split
@@ -0,0 +1,28 @@
+"""Spreads of the Monte Carlo bands, including the edges the panel allows."""
+
+import numpy as np
+import pytest
+
+from conftest import default_entry
+from montecarlo import DEFAULT_SPREADS, SPREAD_KINDS, Spread, simulate_route
+
+
+@pytest.mark.parametrize("low, high", [(1.1, 1.5), (0.5, 0.9)])
+def test_triangular_range_without_1_peaks_at_the_nearer_end(low, high):
+    samples = Spread("triangular", low, high).sample(np.random.default_rng(0), 10_000)
+    assert samples.min() >= low and samples.max() <= high
+    # A triangle peaking at an end has its mean a third of the way from that end.
+    nearer, farther = (low, high) if low > 1 else (high, low)
+    assert samples.mean() == pytest.approx(nearer + (farther - nearer) / 3, rel=1e-2)
+
+
+@pytest.mark.parametrize("kind", SPREAD_KINDS)
+def test_equal_low_and_high_is_a_constant_factor(kind):
+    assert (Spread(kind, 1.0, 1.0).sample(np.random.default_rng(0), (3, 4)) == 1.0).all()
+
+
+def test_edge_spreads_simulate_a_route():
+    entry = default_entry("Facing")
+    spreads = {**DEFAULT_SPREADS, "job_set_time": Spread("triangular", 1.1, 1.3), "rpm": Spread("uniform", 1.0, 1.0)}
+    bands = simulate_route([entry], [], [], 100.0, 500.0, spreads, samples=1_000)
+    assert len(bands.time) == 1_000 and np.isfinite(bands.time).all()
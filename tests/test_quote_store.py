@@ -0,0 +1,55 @@
+"""Keyset paging and filters of the quote store."""
+
+import pytest
+
+from quote_store import QuoteStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = QuoteStore(str(tmp_path / "quotes.sqlite"), pool_size=1)
+    for i in range(23):
+        # Two quotes per second, so pages must break ties on id.
+        created = f"2024-01-{1 + i // 10:02d} 10:00:{i // 2:02d}"
+        payload = {"job_material": "Steel" if i % 3 else "Brass", "total_time_min": i, "total_cost": 100.0 * i}
+        store.save(f"Customer {i % 4}", f"P-{i:03d}", payload, created=created)
+    return store
+
+
+def _all_pages(store, **filters):
+    pages, after = [], None
+    while True:
+        rows, after = store.search(limit=5, after=after, **filters)
+        pages.append(rows)
+        if after is None:
+            return pages
+
+
+def test_pages_cover_every_quote_once_newest_first(store):
+    pages = _all_pages(store)
+    rows = [row for page in pages for row in page]
+    assert [len(page) for page in pages] == [5, 5, 5, 5, 3]
+    assert len({row.id for row in rows}) == 23
+    assert [(row.created, row.id) for row in rows] == sorted(((r.created, r.id) for r in rows), reverse=True)
+
+
+def test_exact_multiple_of_the_page_size_ends_with_no_cursor(store):
+    rows, after = store.search(limit=23)
+    assert len(rows) == 23 and after is None
+
+
+def test_filters_apply_across_pages(store):
+    rows = [row for page in _all_pages(store, customer="customer 1", material="Steel") for row in page]
+    assert rows and all(row.customer == "Customer 1" and row.material == "Steel" for row in rows)
+    assert {row.part_number for row in rows} == {f"P-{i:03d}" for i in range(23) if i % 4 == 1 and i % 3}
+
+
+def test_date_range_is_inclusive(store):
+    rows, _ = store.search(date_from="2024-01-02", date_to="2024-01-02", limit=100)
+    assert len(rows) == 10
+
+
+def test_get_round_trips_the_payload(store):
+    rows, _ = store.search(part_number="p-007")
+    quote = store.get(rows[0].id)
+    assert quote.summary.part_number == "P-007" and quote.payload["total_cost"] == 700.0
@@ -0,0 +1,62 @@
+"""Result tables hold the values each operation was estimated with."""
+
+import io
+import json
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from conftest import default_entry, submitted_state
+from report import result_state
+from result_tables import export_zip, frame, job_tables, main, result_tables, table_name
+
+
+def test_fractional_integer_inputs_are_exported_as_used():
+    entry = {**default_entry("Facing"), "rpm": 170.7}
+    job = {"job_id": 1, "machining1_entries": [entry], "labor_cost_per_hour": 500.0}
+    columns = job_tables(job).processes[table_name("Facing")]
+    assert columns["rpm"].dtype == np.float64 and columns["rpm"][0] == 170.7
+
+
+def test_process_tables_come_from_the_submitted_entries():
+    state = submitted_state(6)
+    tables = result_tables(result_state(state))
+    state["machining1_entries"] = []
+    assert result_tables(result_state(state)).processes.keys() == tables.processes.keys()
+
+
+def test_route_sheet_adds_up_to_the_total_time():
+    state = submitted_state(10)
+    route = result_tables(result_state(state)).route
+    assert list(route["step"]) == list(range(1, 12))
+    assert route["cumulative_time_min"][-1] == state["total_time_min"]
+
+
+def test_csv_export_round_trips():
+    tables = result_tables(result_state(submitted_state(4)))
+    archive = export_zip(tables, "csv")
+    with zipfile.ZipFile(io.BytesIO(archive)) as z:
+        summary = pd.read_csv(z.open("summary.csv"))
+    pd.testing.assert_frame_equal(summary, frame(tables.summary), check_dtype=False)
+
+
+def test_partial_entries_take_the_card_defaults():
+    partial = job_tables({"job_id": 1, "machining1_entries": [{"type": "Facing", "rpm": 200.0}]})
+    full = job_tables({"job_id": 1, "machining1_entries": [{**default_entry("Facing"), "rpm": 200.0}]})
+    for name, column in full.processes[table_name("Facing")].items():
+        assert list(partial.processes[table_name("Facing")][name]) == list(column), name
+
+
+def test_main_skips_jobs_that_cannot_be_estimated(tmp_path, capsys):
+    jobs = tmp_path / "jobs.jsonl"
+    jobs.write_text("\n".join([
+        json.dumps({"job_id": "A", "machining1_entries": [default_entry("Facing")]}),
+        "not json",
+        json.dumps({"job_id": "B", "machining1_entries": [{"type": "Knurling"}], "material_cost": "a lot"}),
+        json.dumps({"job_id": "C", "machining2_entries": [default_entry("Facing")]}),
+    ]) + "\n")
+    main([str(jobs), "-o", str(tmp_path / "tables"), "--format", "csv"])
+    assert list(pd.read_csv(tmp_path / "tables" / "summary.csv")["job_id"]) == ["A"]
+    err = capsys.readouterr().err
+    assert "skipped job 2 (#2)" in err and "skipped job B (#3)" in err and "skipped job C (#4)" in err
@@ -0,0 +1,51 @@
+"""Row validation of route sheet imports."""
+
+import io
+
+from route_import import import_route, import_rows, read_csv_rows
+
+
+def _import_csv(text):
+    return import_rows(read_csv_rows(io.StringIO(text)))
+
+
+def test_valid_rows_take_card_defaults_and_keep_route_order():
+    result = _import_csv(
+        "machine,type,Feed (mm/rev),rpm\n"
+        "Lathe,facing,0.2,\n"
+        "milling,Side Milling,,\n"
+        "other,Custom,,\n"
+    )
+    assert result.errors == [] and result.rows == 3 and result.operations == 3
+    facing = result.entries["machining1_entries"][0]
+    assert facing["type"] == "Facing" and facing["feed"] == 0.2 and isinstance(facing["rpm"], int)
+    assert result.entries["machining2_entries"][0]["type"] == "Side Milling"
+    assert result.entries["extra_entries"][0]["type"] == "Custom"
+
+
+def test_bad_rows_are_reported_by_line_and_skipped():
+    result = _import_csv(
+        "machine,type,feed,depth of cut\n"
+        "lathe,Facing,0.2,1\n"
+        "drill press,Drilling,,\n"
+        "lathe,Side Milling,,\n"
+        "lathe,Facing,abc,1\n"
+        "lathe,Facing,0,1\n"
+        "lathe,Facing,0.2,-1\n"
+        "\n"
+        "lathe,Facing,0.1,0.5\n"
+    )
+    assert [error.line for error in result.errors] == [3, 4, 5, 6, 7]
+    assert "unknown machine" in result.errors[0].message
+    assert "unknown lathe process" in result.errors[1].message
+    assert "not a number" in result.errors[2].message
+    assert "greater than 0" in result.errors[3].message
+    assert "negative" in result.errors[4].message
+    assert result.rows == 7
+    assert [entry["feed"] for entry in result.entries["machining1_entries"]] == [0.2, 0.1]
+
+
+def test_import_route_reads_csv_bytes():
+    data = io.BytesIO("\ufeffMachine,Type,Time Taken (min)\nother,Chamfering,7\n".encode("utf-8"))
+    result = import_route(data, "route.csv")
+    assert result.errors == [] and result.entries["extra_entries"][0]["time_min"] == 7.0
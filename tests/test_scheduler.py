@@ -0,0 +1,89 @@
+"""Route order, machine overlaps and dispatch rules of the shop scheduler."""
+
+import pytest
+
+from conftest import route
+from estimate_cli import JobError
+from estimator import MACHINES
+from scheduler import RULES, schedule_jobs
+
+MACHINE_COUNTS = {machine.name: 2 for machine in MACHINES}
+
+
+def _jobs(n=12):
+    jobs = []
+    for k in range(n):
+        lathe, milling = route(1 + k % 5)
+        extra = [{"type": "Chamfering", "time_min": 5.0, "extra_tool_cost": 10.0}] if k % 3 == 0 else []
+        jobs.append({
+            "job_id": f"J{k}", "material_cost": 100.0, "labor_cost_per_hour": 500.0, "quantity": 1 + k % 4,
+            "machining1_entries": lathe, "machining2_entries": milling, "extra_entries": extra,
+        })
+    return jobs
+
+
+@pytest.mark.parametrize("rule", RULES)
+def test_operations_run_in_route_order(rule):
+    schedule = schedule_jobs(_jobs(), MACHINE_COUNTS, rule)
+    by_job = {}
+    for op in schedule.operations:
+        by_job.setdefault(op.job_id, []).append(op)
+    for job_id, ops in by_job.items():
+        ops.sort(key=lambda op: op.start)
+        for before, after in zip(ops, ops[1:]):
+            assert after.start >= before.end - 1e-9, job_id
+        assert schedule.lead_times()[job_id] == pytest.approx(ops[-1].end)
+
+
+@pytest.mark.parametrize("rule", RULES)
+def test_machines_never_run_two_operations_at_once(rule):
+    schedule = schedule_jobs(_jobs(), MACHINE_COUNTS, rule)
+    per_machine = {}
+    for op in schedule.operations:
+        if op.machine is not None:
+            per_machine.setdefault(op.machine, []).append((op.start, op.end))
+    assert set(per_machine) <= set(schedule.machines)
+    for machine, spans in per_machine.items():
+        spans.sort()
+        for (_, end), (start, _) in zip(spans, spans[1:]):
+            assert start >= end - 1e-9, machine
+
+
+def test_every_operation_is_scheduled_once():
+    jobs = _jobs()
+    schedule = schedule_jobs(jobs, MACHINE_COUNTS)
+    n_ops = sum(len(job[key]) for job in jobs for key in ("machining1_entries", "machining2_entries", "extra_entries"))
+    assert len(schedule.operations) == n_ops
+    assert schedule.makespan == pytest.approx(max(op.end for op in schedule.operations))
+
+
+def test_spt_dispatches_the_shortest_ready_operation_first():
+    short, long_ = route(1)[0], route(1)[0]
+    long_[0]["depth"] *= 10
+    jobs = [
+        {"job_id": "long", "machining1_entries": long_, "machining2_entries": [], "extra_entries": []},
+        {"job_id": "short", "machining1_entries": short, "machining2_entries": [], "extra_entries": []},
+    ]
+    schedule = schedule_jobs(jobs, {MACHINES[0].name: 1}, "spt")
+    assert [op.job_id for op in schedule.operations] == ["short", "long"]
+
+
+def test_missing_machine_type_is_an_error():
+    with pytest.raises(ValueError):
+        schedule_jobs(_jobs(), {MACHINES[0].name: 1})
+
+
+def test_unknown_rule_is_an_error():
+    with pytest.raises(ValueError):
+        schedule_jobs(_jobs(), MACHINE_COUNTS, "edd")
+
+
+def test_jobs_that_cannot_be_scheduled_are_skipped():
+    jobs = _jobs(3)
+    jobs[0]["quantity"] = "lots"
+    partial = {"job_id": "partial", "machining1_entries": [{"type": "Facing"}]}
+    unreadable = JobError(5, "line 5: not valid JSON")
+    schedule = schedule_jobs([jobs[0], partial, unreadable, *jobs[1:]], MACHINE_COUNTS)
+    assert [(index, job_id) for index, job_id, _ in schedule.skipped] == [(0, "J0"), (2, 5)]
+    assert schedule.job_ids == ["partial", "J1", "J2"]
+    assert {op.job_id for op in schedule.operations} == {"partial", "J1", "J2"}
@@ -0,0 +1,49 @@
+"""Uncertainty (Monte Carlo) controls on the Machining page and bands on the Result page.
+
+The bands are computed on Submit All with ``montecarlo.simulate_route`` and
+stored in ``st.session_state.uncertainty`` as the plain summary dict. That
+way they are part of the ``report.result_state`` snapshot, so they are
+printed in the PDF and saved with quotes.
+"""
+
+import streamlit as st
+
+from montecarlo import DEFAULT_SPREADS, SPREAD_KINDS, SPREAD_LABELS, Spread, simulate_route
+
+
+def uncertainty_controls():
+    """Checkbox (on by default) and per-input spreads; returns the spreads, or None when off."""
+    st.session_state.setdefault("uncertainty_enabled", True)
+    enabled = st.checkbox("🎲 Uncertainty bands (Monte Carlo P50/P90)", key="uncertainty_enabled")
+    spreads = {}
+    with st.expander("Distributions (factor on the entered value)"):
+        for name, default in DEFAULT_SPREADS.items():
+            col1, col2, col3 = st.columns(3)
+            kind = col1.selectbox(
+                SPREAD_LABELS[name], SPREAD_KINDS, index=SPREAD_KINDS.index(default.kind), key=f"spread_kind_{name}",
+            )
+            low = col2.number_input("Low ×", value=default.low, min_value=0.0, step=0.05, key=f"spread_low_{name}")
+            high = col3.number_input("High ×", value=default.high, min_value=0.0, step=0.05, key=f"spread_high_{name}")
+            spreads[name] = Spread(kind, min(low, high), max(low, high))
+    return spreads if enabled else None
+
+
+def route_uncertainty(spreads, lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour):
+    """Summary dict for ``st.session_state.uncertainty``, or None when the controls are off."""
+    if spreads is None:
+        return None
+    bands = simulate_route(lathe_entries, milling_entries, extra_entries, material_cost, labor_cost_per_hour, spreads)
+    return bands.summary()
+
+
+def uncertainty_summary():
+    bands = st.session_state.get("uncertainty")
+    if not bands:
+        return
+    st.subheader(f"🎲 Uncertainty ({bands['samples']:,} samples)")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Time P50 (min)", f"{bands['time_p50']:.2f}")
+    col2.metric("Time P90 (min)", f"{bands['time_p90']:.2f}")
+    col3.metric("Cost P50 (Rs.)", f"{bands['cost_p50']:.2f}")
+    col4.metric("Cost P90 (Rs.)", f"{bands['cost_p90']:.2f}")
+    st.caption("For a fixed-price quote, price from the P90 cost: 9 in 10 runs of this job should cost less.")